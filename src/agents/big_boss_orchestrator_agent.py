@@ -10,6 +10,12 @@ from src.tools.big_boss_orchestrator_tools import (
 from src.tools.sleep_tracking_tools import (
     add_sleep_data,
     get_sleep_data,
+    get_sleep_quality_distribution,
+    get_sleep_streaks,
+    get_sleep_summaries,
+    get_sleep_trend,
+    get_sleep_weekday_pattern,
+    import_sleep_data,
     update_weekly_summary,
 )
 from src.utils.prompts import BIG_BOSS_ORCHESTRATOR_AGENT_PROMPT
@@ -55,7 +61,13 @@ class BigBossOrchestratorAgent(AgentAbstract):
             task_agent_query,
             home_agent_query,
             add_sleep_data,
+            import_sleep_data,
             get_sleep_data,
+            get_sleep_summaries,
+            get_sleep_trend,
+            get_sleep_weekday_pattern,
+            get_sleep_quality_distribution,
+            get_sleep_streaks,
             update_weekly_summary,
             journal,
         ]
@@ -4,8 +4,11 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from src.tools.books_tools import (
     add_book_to_reading_list,
+    find_similar_books,
     get_book_lists,
+    get_book_stats,
     mark_book_read,
+    query_books,
     search_book,
 )
 from src.agents.agent import AgentAbstract
@@ -34,8 +37,11 @@ class BookAgent(AgentAbstract):
         """Return the list of tools available for this agent."""
         return [
             add_book_to_reading_list,
+            find_similar_books,
             get_book_lists,
+            get_book_stats,
             mark_book_read,
+            query_books,
             search_book,
         ]
 
@@ -2,11 +2,16 @@ import sys
 from pathlib import Path
 
 from dotenv import load_dotenv
-from strands_tools import file_read
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from src.tools.file_search_tools import find_folder_from_name
+from src.tools.file_read_tools import ReadBudget, make_read_file
+from src.tools.file_search_tools import (
+    find_folder_from_name,
+    find_symbol,
+    save_file_summary,
+    who_imports,
+)
 from src.agents.agent import AgentAbstract
 from src.utils.prompts import FILE_AGENT_PROMPT
 from src.utils.callback_hanlder_subagents import file_agent_callback
@@ -17,6 +22,11 @@ load_dotenv()
 class FileSearchAgent(AgentAbstract):
     """File Search Agent that can search for files and folders based on user queries."""
 
+    def __init__(self, config=None):
+        # Created before the tools, which are bound to it.
+        self.read_budget = ReadBudget()
+        super().__init__(config)
+
     def get_agent_config(self):
         """Return the specific configuration section for this agent."""
         return self.config.files_agent
@@ -29,10 +39,18 @@ class FileSearchAgent(AgentAbstract):
         """Return the list of tools available for this agent."""
 
         return [
-            file_read,
+            make_read_file(self.read_budget),
             find_folder_from_name,
+            save_file_summary,
+            find_symbol,
+            who_imports,
         ]
 
+    def query(self, question: str):
+        """Run a query with a fresh read_file budget."""
+        self.read_budget.reset()
+        return super().query(question)
+
     def pass_callback_handler(self):
         """Pass a callback handler to the agent's model.
 
@@ -4,8 +4,11 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from src.tools.movies_tools import (
     add_movie_or_show_to_watchlist,
+    find_similar_movies_and_shows,
     get_movies_and_show_list,
+    get_movie_stats,
     mark_movie_or_show_watched,
+    query_movies_and_shows,
     search_omdb_movie_or_show,
 )
 from src.agents.agent import AgentAbstract
@@ -34,8 +37,11 @@ class MoviesAgent(AgentAbstract):
         """Return the list of tools available for this agent."""
         return [
             add_movie_or_show_to_watchlist,
+            find_similar_movies_and_shows,
             get_movies_and_show_list,
+            get_movie_stats,
             mark_movie_or_show_watched,
+            query_movies_and_shows,
             search_omdb_movie_or_show,
         ]
 
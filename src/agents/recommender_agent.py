@@ -9,6 +9,7 @@ from src.tools.recommender_agent_tools import (
     get_recent_youtube_videos,
     get_all_monitored_youtube_channels,
     add_youtube_channel_to_monitor,
+    get_digest_of_all_sources,
 )
 from src.agents.agent import AgentAbstract
 from dotenv import load_dotenv
@@ -41,6 +42,7 @@ class RecommenderAgent(AgentAbstract):
             get_recent_youtube_videos,
             get_all_monitored_youtube_channels,
             add_youtube_channel_to_monitor,
+            get_digest_of_all_sources,
         ]
 
     def pass_callback_handler(self):
@@ -38,6 +38,11 @@ from src.schemas.config_schema import (
     BigBossOrchestratorAgentConfig,
 )
 from src.utils.elevenlabs_stt_processors import ElevenLabsSTTProcessor
+from src.utils.config_loader import load_config
+from src.utils.folder_watcher import FolderWatcher
+from src.utils.feed_prefetcher import FeedPrefetcher
+from src.utils.json_log_store import JsonLogStore
+from src.utils.sleep_import import format_import_result, import_sleep_export
 
 from strands.session.file_session_manager import FileSessionManager
 import json
@@ -363,12 +368,29 @@ def chat(
         False, "--minimal", "-m", help="Start with minimal UI"
     ),
     audio: bool = typer.Option(True, "--audio/--no-audio", help="Enable/disable audio"),
+    watch_folders: bool = typer.Option(
+        True,
+        "--watch-folders/--no-watch-folders",
+        help="Keep the file agent's folder index live in the background",
+    ),
+    prefetch_feeds: bool = typer.Option(
+        True,
+        "--prefetch-feeds/--no-prefetch-feeds",
+        help="Keep monitored YouTube channels and newsletters cached in the background",
+    ),
 ):
     """Start interactive chat with Charon"""
 
     cli = CharonCLI()
     cli.user_preferences["audio"] = audio
 
+    if watch_folders and FolderWatcher.is_supported():
+        root_directory = Path(load_config().files_agent.root_directory)
+        FolderWatcher(root_directory).start()
+
+    if prefetch_feeds:
+        FeedPrefetcher(load_config().recommender_agent).start()
+
     try:
         # Minimal startup
         if not minimal:
@@ -390,6 +412,30 @@ def chat(
     # Graceful exit
 
 
+@app.command("import-sleep")
+def import_sleep(
+    export_file: Path = typer.Argument(
+        ..., exists=True, dir_okay=False, help="CSV, JSON or JSON Lines sleep export"
+    ),
+    replace: bool = typer.Option(
+        False, "--replace", help="Overwrite nights that are already logged"
+    ),
+):
+    """Import a bulk sleep export, e.g. a year of wearable data"""
+    store = JsonLogStore.for_path(
+        load_config().big_boss_orchestrator_agent.sleep_tracking_file, indent=4
+    )
+    try:
+        with console.status(f"Importing {export_file}..."):
+            result = import_sleep_export(store, export_file, replace=replace)
+    except Exception as e:
+        console.print(f"[red]❌ Import failed: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+    style = "yellow" if result.invalid else "green"
+    console.print(format_import_result(result), style=style, markup=False)
+
+
 @app.command()
 def setup():
     """Interactive setup wizard"""
@@ -20,3 +20,24 @@ SKIP_DIRS = {
     "media",
     "data",
 }
+
+# How long a refreshed folder index is trusted before its folders are stat-ed again.
+FOLDER_INDEX_MAX_AGE_SECONDS = 30
+
+# Threads used to list directories in parallel when walking a project, 0 walks sequentially.
+# Parallel listing only pays off when listings wait on I/O (network mounts, cold caches);
+# on a warm local disk the sequential walk is faster.
+DIRECTORY_WALKER_THREADS = 0
+
+# Budgets for the project tree handed to the file agent.
+TREE_MAX_DEPTH = 6
+TREE_MAX_ENTRIES = 400
+TREE_MAX_BYTES = 16_000
+TREE_MAX_FILES_PER_DIR = 25
+
+# File extensions the file agent treats as project source files.
+SOURCE_FILE_EXTENSIONS = (".py",)
+
+# Byte budgets for the file agent's read_file tool, per call and per agent query.
+FILE_READ_MAX_BYTES_PER_CALL = 24_000
+FILE_READ_MAX_BYTES_PER_TURN = 160_000
@@ -0,0 +1,85 @@
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.directory_scanning import DirectoryScanner
+from rich import print as rprint
+from rich.table import Table
+import argparse
+import tempfile
+import time
+
+
+def build_synthetic_tree(root: Path, directories: int, fan_out: int = 10) -> int:
+    """
+    Create a tree of roughly `directories` folders, each holding a couple of files.
+
+    Folders are created breadth first with `fan_out` children each, and every tenth
+    folder gets a SKIP_DIRS entry so pruning is part of the measurement.
+    """
+    created = 0
+    frontier = [root]
+    while created < directories:
+        next_frontier = []
+        for parent in frontier:
+            for i in range(fan_out):
+                if created >= directories:
+                    break
+                folder = parent / ("__pycache__" if created % 10 == 9 else f"dir_{i}")
+                folder.mkdir()
+                (folder / "module.py").touch()
+                (folder / "README.md").touch()
+                next_frontier.append(folder)
+                created += 1
+        frontier = next_frontier
+    return created
+
+
+def time_walk(root: Path, walker_threads: int) -> tuple:
+    """Run fast_scandir and find_files over root, returning elapsed seconds and counts."""
+    start = time.perf_counter()
+    scanner = DirectoryScanner(root, use_index=False, walker_threads=walker_threads)
+    files = scanner.find_files(root)
+    elapsed = time.perf_counter() - start
+    return elapsed, len(scanner.subfolders), len(files)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the sequential and parallel directory walkers. "
+        "A freshly built tree sits in the page cache, so use --root on a network "
+        "mount or after dropping caches to see the cold-cache difference."
+    )
+    parser.add_argument("--directories", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=None,
+        help="Walk an existing tree instead of building a synthetic one",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.root
+        if root is None:
+            root = Path(tmp)
+            rprint(f"Building synthetic tree with {args.directories} folders...")
+            build_synthetic_tree(root, args.directories)
+
+        table = Table(title=f"Walking {root}")
+        table.add_column("Walker", style="cyan")
+        table.add_column("Seconds", justify="right")
+        table.add_column("Folders", justify="right")
+        table.add_column("Python files", justify="right")
+
+        for walker_threads in [0, *args.threads]:
+            elapsed, folders, files = time_walk(root, walker_threads)
+            name = "os.walk" if walker_threads == 0 else f"{walker_threads} threads"
+            table.add_row(name, f"{elapsed:.3f}", str(folders), str(files))
+
+        rprint(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,10 @@ class BooksAgentConfig(BaseModel):
         ...,
         description="Path to the book list file (e.g., 'data/book_list.json')",
     )
+    storage_backend: str = Field(
+        "json",
+        description="Where the book list is stored: 'json' (the book list file) or 'sqlite' (a .sqlite database next to it, imported once from the JSON file, which is not updated afterwards)",
+    )
 
 
 class MoviesAgentConfig(BaseModel):
@@ -51,6 +55,10 @@ class MoviesAgentConfig(BaseModel):
     movie_list_file: str = Field(
         ..., description="Path to the movie and show list file"
     )
+    storage_backend: str = Field(
+        "json",
+        description="Where the movie and show list is stored: 'json' (the movie list file) or 'sqlite' (a .sqlite database next to it, imported once from the JSON file, which is not updated afterwards)",
+    )
 
 
 class TaskAgentConfig(BaseModel):
@@ -89,6 +97,35 @@ class RecommenderAgentConfig(BaseModel):
         ...,
         description="Directory where YouTube channels are stored",
     )
+    digest_max_workers: int = Field(
+        32,
+        description="Maximum number of sources fetched at once for the digest of all sources",
+    )
+    digest_source_timeout: float = Field(
+        20.0,
+        description="Seconds each source may take in the digest before it is reported as unavailable",
+    )
+    feed_cache_ttl_minutes: float = Field(
+        60.0,
+        description="Minutes a source's cached videos or posts are used before it is checked for new ones",
+    )
+    prefetch_interval_minutes: float = Field(
+        30.0,
+        description="Minutes between background refreshes of the feed cache while Charon is running",
+    )
+    prefetch_max_workers: int = Field(
+        8, description="Maximum number of sources refreshed at once in the background"
+    )
+    prefetch_items_per_source: int = Field(
+        5, description="Number of recent videos or posts prefetched per source"
+    )
+    prefetch_backoff_base: float = Field(
+        60.0,
+        description="Seconds before retrying a source whose prefetch failed, doubled after each further failure",
+    )
+    prefetch_backoff_max: float = Field(
+        3600.0, description="Maximum seconds between retries of a failing source"
+    )
 
 
 class HomeAgentConfig(BaseModel):
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -19,4 +19,16 @@ class FolderSearchResponse(BaseModel):
     tree_structure: str = Field(
         ..., description="Tree representation of the project structure"
     )
+    other_matches: List[str] = Field(
+        default_factory=list,
+        description="Other folders that matched the name, best match first",
+    )
+    cached_summaries: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Saved summaries of unchanged files, keyed by file path",
+    )
+    changed_files: List[str] = Field(
+        default_factory=list,
+        description="Files that are new or changed since they were last summarized",
+    )
     message: str = Field(..., description="Status message describing the result")
@@ -6,7 +6,7 @@ from strands import tool
 sys.path.append(str(Path(__file__).parent.parent))
 import json
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 import requests
 from dotenv import load_dotenv
@@ -14,7 +14,13 @@ from pathlib import Path
 import sys
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from src.utils.config_loader import load_config
+from src.utils.media_stats import format_stats
+from src.utils.similarity_index import format_matches
+from src.utils.media_store import (
+    QueryFilter,
+    format_query_page,
+    open_book_store,
+)
 from src.utils.callback_hanlder_subagents import log_to_session
 
 load_dotenv()
@@ -29,11 +35,8 @@ def get_book_lists() -> str:
     Returns:
         str: JSON string containing full book data
     """
-    config = load_config()
-    book_paths = config.books_agent.book_list_file
     try:
-        with open(book_paths) as f:
-            books = json.load(f)
+        books = open_book_store().load()
 
         total_to_read = len(books.get("to_read", []))
         total_read = len(books.get("read", []))
@@ -47,6 +50,110 @@ def get_book_lists() -> str:
         return f"Error reading book data: {str(e)}"
 
 
+@tool
+def get_book_stats(top: int = 10) -> str:
+    """
+    Get precomputed reading stats: counts per status, mean rating, the most common genres and
+    authors with their mean ratings, and books added and read per month.
+    Use this to understand the user's taste before querying individual books.
+
+    Args:
+        top: Number of genres and authors to list
+
+    Returns:
+        str: Compact stats summary
+    """
+    try:
+        store = open_book_store()
+        return format_stats(store.stats.read(store), top=top)
+    except Exception as e:
+        log_to_session(f"Error reading book stats: {str(e)}")
+        return f"Error reading book stats: {str(e)}"
+
+
+@tool
+def find_similar_books(
+    query: str, status: Optional[str] = "to_read", top_k: int = 5
+) -> str:
+    """
+    Find the books most similar to a book on the user's lists, or to a description,
+    by title, author, genre and notes. Highly rated ones rank slightly higher.
+    Use this for "what should I read next" or "something like X".
+
+    Args:
+        query: The title of a book on the user's lists, or a free-text description like
+            "slow-burn space opera"
+        status: "to_read" or "read" to only suggest from that list, or None for both
+        top_k: Number of books to return
+
+    Returns:
+        str: A summary line, then one compact JSON line per match with its similarity score
+    """
+    try:
+        store = open_book_store()
+        matches = store.similarity.search(store, query, status=status, top_k=top_k)
+        log_to_session(f"Found {len(matches)} books similar to '{query}'")
+        return format_matches(
+            matches, query, ["title", "author", "genre", "rating", "status", "score"]
+        )
+    except Exception as e:
+        log_to_session(f"Error finding similar books: {str(e)}")
+        return f"Error finding similar books: {str(e)}"
+
+
+@tool
+def query_books(
+    status: Optional[str] = None,
+    genre: Optional[str] = None,
+    min_rating: Optional[float] = None,
+    max_rating: Optional[float] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    sort_by: str = "date",
+    descending: bool = True,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> str:
+    """
+    Query the reading list and reading history, returning only the matching books.
+    Prefer this over get_book_lists, and only ask for the slice and fields you need.
+
+    Args:
+        status: "to_read" or "read", or None for both
+        genre: Only books whose genre contains this text (case-insensitive)
+        min_rating: Only books rated at least this (out of 10)
+        max_rating: Only books rated at most this (out of 10)
+        date_from: Only books added (to_read) or read (read) on or after this YYYY-MM-DD date
+        date_to: Only books added (to_read) or read (read) on or before this YYYY-MM-DD date
+        fields: Fields to return, e.g. ["title", "author", "rating"]. "status" and "date" are
+            also available. Defaults to title, author, genre, rating, status and date
+        sort_by: Field to sort by, e.g. "rating", "title" or "date"
+        descending: Sort from highest to lowest
+        limit: Maximum number of books to return
+        cursor: The next_cursor from a previous call, to get the next page
+
+    Returns:
+        str: A summary line with the match count and next_cursor, then one compact JSON line per book
+    """
+    try:
+        page = open_book_store().query(
+            QueryFilter(status, genre, min_rating, max_rating, date_from, date_to),
+            sort_by=sort_by,
+            descending=descending,
+            limit=limit,
+            cursor=cursor,
+        )
+        log_to_session(f"Book query matched {page.total} books")
+        return format_query_page(
+            page,
+            fields or ["title", "author", "genre", "rating", "status", "date"],
+        )
+    except Exception as e:
+        log_to_session(f"Error querying books: {str(e)}")
+        return f"Error querying books: {str(e)}"
+
+
 @tool
 def add_book_to_reading_list(
     title: str,
@@ -68,25 +175,7 @@ def add_book_to_reading_list(
     Returns:
         str: Confirmation message
     """
-    config = load_config()
-    book_paths = config.books_agent.book_list_file
     try:
-        with open(book_paths) as f:
-            books = json.load(f)
-
-        # Check if book already exists
-        existing = next(
-            (
-                b
-                for b in books["to_read"]
-                if b["title"].lower() == title.lower()
-                and b["author"].lower() == author.lower()
-            ),
-            None,
-        )
-        if existing:
-            return f"'{title}' by {author} is already in your reading list!"
-
         new_book = {
             "title": title,
             "author": author,
@@ -96,10 +185,8 @@ def add_book_to_reading_list(
             "added_date": datetime.now().isoformat()[:10],
         }
 
-        books["to_read"].append(new_book)
-
-        with open(book_paths, "w") as f:
-            json.dump(books, f, indent=2)
+        if not open_book_store().add("to_read", new_book):
+            return f"'{title}' by {author} is already in your reading list!"
 
         log_to_session(f"Added '{title}' by {author} to your reading list!")
 
@@ -112,52 +199,49 @@ def add_book_to_reading_list(
 
 @tool
 def mark_book_read(
-    title: str, author: str, rating: Optional[float] = None, notes: Optional[str] = None
+    title: str,
+    author: str = "",
+    rating: Optional[float] = None,
+    notes: Optional[str] = None,
 ) -> str:
     """
     Mark a book as read and move it to the read list.
+    The title may be approximate: it is matched ignoring case, accents, punctuation and
+    small typos. If several books could match, they are listed and nothing is changed.
 
     Args:
-        title: Book title (must match existing title)
-        author: Book author (must match existing author)
+        title: Book title as the user wrote it
+        author: Book author, if known, to pick between similar titles
         rating: Your rating out of 10
         notes: Your thoughts about the book
 
     Returns:
         str: Confirmation message
     """
-    config = load_config()
-    book_paths = config.books_agent.book_list_file
     try:
-        with open(book_paths) as f:
-            books = json.load(f)
-
-        # Find book in to_read list
-        book_index = None
-        for i, book in enumerate(books["to_read"]):
-            if (
-                book["title"].lower() == title.lower()
-                and book["author"].lower() == author.lower()
-            ):
-                book_index = i
-                break
-
-        if book_index is None:
-            return f"'{title}' by {author} not found in your reading list. Make sure both title and author match exactly."
-
-        # Move book to read list
-        read_book = books["to_read"].pop(book_index)
-        read_book["read_date"] = datetime.now().isoformat()[:10]
-
+        updates = {"read_date": datetime.now().isoformat()[:10]}
         if rating is not None:
-            read_book["rating"] = rating
+            updates["rating"] = rating
         if notes:
-            read_book["notes"] = notes
-
-        books["read"].append(read_book)
+            updates["notes"] = notes
+
+        store = open_book_store()
+        match, candidates = store.title_index.resolve(store, "to_read", title, author)
+        if match is None:
+            if not candidates:
+                return f"'{title}' not found in your reading list."
+            options = "; ".join(
+                f"'{book['title']}' by {book.get('author')} (score {score})"
+                for score, book in candidates
+            )
+            return f"'{title}' is ambiguous. Did you mean one of: {options}? Call again with the exact title and author."
 
-        with open(book_paths, "w") as f:
-            json.dump(books, f, indent=2)
+        title, author = match["title"], match.get("author")
+        read_book = store.move(
+            {"title": title, "author": author}, "to_read", "read", updates
+        )
+        if read_book is None:
+            return f"'{title}' by {author} not found in your reading list."
 
         log_to_session(
             f"Marked '{title}' by {author} as read! {f'Rated {rating}/10. ' if rating else ''}Nice work!"
@@ -0,0 +1,210 @@
+import mmap
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+from strands import tool
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from constants.directories import (
+    FILE_READ_MAX_BYTES_PER_CALL,
+    FILE_READ_MAX_BYTES_PER_TURN,
+)
+from utils.callback_hanlder_subagents import log_to_session
+
+
+class ReadBudget:
+    """
+    Bytes a file agent may still read during the current query.
+
+    Each agent owns one budget, shared by the read_file calls of its tool from
+    make_read_file and reset by the agent at the start of each query, so a handful of
+    large files cannot stall a turn and concurrent agents do not drain each other's.
+    """
+
+    def __init__(self, max_bytes: int = FILE_READ_MAX_BYTES_PER_TURN):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def reset(self):
+        """Start a new query with the full budget."""
+        with self.lock:
+            self.used = 0
+
+    def remaining(self) -> int:
+        """Return the number of bytes that can still be read."""
+        with self.lock:
+            return max(self.max_bytes - self.used, 0)
+
+    def spend(self, size: int):
+        """Record size bytes as read."""
+        with self.lock:
+            self.used += size
+
+
+def _skip_lines(view: mmap.mmap, offset: int, count: int) -> int:
+    """Return the offset count lines after offset, or the file size if there are fewer lines."""
+    for _ in range(count):
+        offset = view.find(b"\n", offset)
+        if offset == -1:
+            return len(view)
+        offset += 1
+    return offset
+
+
+def make_read_file(read_budget: ReadBudget):
+    """
+    Create a read_file tool that draws on one agent's read budget.
+
+    Args:
+        read_budget (ReadBudget): The budget of the agent the tool is for.
+
+    Returns:
+        The read_file tool.
+    """
+
+    @tool
+    def read_file(
+        file_path: str,
+        start_line: int = 1,
+        end_line: Optional[int] = None,
+        byte_offset: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> str:
+        """
+        Read part of a file. Reads are bounded: each call returns at most a fixed number of bytes,
+        and all calls together share a budget per question. When a read is cut short, the result says
+        so and tells you where to continue, so large files can be paged through.
+
+        Args:
+            file_path (str): The full path of the file to read.
+            start_line (int): The first line to read, starting at 1.
+            end_line (Optional[int]): The last line to read. Reads as far as the budget allows if omitted.
+            byte_offset (Optional[int]): Read from this byte offset instead of a line range.
+            max_bytes (Optional[int]): Read at most this many bytes, capped by the per-call budget.
+
+        Returns:
+            str: A header with the range that was read and the file size, the numbered lines
+                (or raw text for byte reads), and a truncation note if the range was cut short.
+        """
+        return _read_file(
+            read_budget, file_path, start_line, end_line, byte_offset, max_bytes
+        )
+
+    return read_file
+
+
+def _read_file(
+    read_budget: ReadBudget,
+    file_path: str,
+    start_line: int,
+    end_line: Optional[int],
+    byte_offset: Optional[int],
+    max_bytes: Optional[int],
+) -> str:
+    remaining = read_budget.remaining()
+    if remaining <= 0:
+        log_to_session(f"Read budget exhausted, not reading {file_path}")
+        return (
+            "Read budget for this question is exhausted. Answer with what you have read "
+            "so far and the cached summaries."
+        )
+    limit = min(
+        max_bytes or FILE_READ_MAX_BYTES_PER_CALL,
+        FILE_READ_MAX_BYTES_PER_CALL,
+        remaining,
+    )
+
+    try:
+        with open(file_path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                return f"{file_path} is empty."
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if b"\x00" in view[:8192]:
+                    return f"{file_path} looks like a binary file and was not read."
+                if byte_offset is not None:
+                    result, read = _read_bytes(
+                        view, file_path, size, byte_offset, limit
+                    )
+                else:
+                    result, read = _read_lines(
+                        view, file_path, size, start_line, end_line, limit
+                    )
+    except OSError as error:
+        log_to_session(f"Could not read {file_path}: {error}")
+        return f"Could not read {file_path}: {error}"
+
+    read_budget.spend(read)
+    log_to_session(f"Read {read} bytes of {file_path}")
+    return result
+
+
+def _read_bytes(
+    view: mmap.mmap, file_path: str, size: int, byte_offset: int, limit: int
+) -> tuple:
+    """Read a byte range within limit bytes, returning the text and the bytes read."""
+    start = min(max(byte_offset, 0), size)
+    end = min(start + limit, size)
+    text = view[start:end].decode("utf-8", errors="replace")
+
+    header = f"{file_path} bytes {start}-{end} of {size}"
+    if end < size:
+        return (
+            f"{header}\n{text}\n[truncated: continue with byte_offset={end}]",
+            end - start,
+        )
+    return f"{header}\n{text}", end - start
+
+
+def _read_lines(
+    view: mmap.mmap,
+    file_path: str,
+    size: int,
+    start_line: int,
+    end_line: Optional[int],
+    limit: int,
+) -> tuple:
+    """Read a line range within limit bytes, returning the text and the bytes read."""
+    start_line = max(start_line, 1)
+    start = _skip_lines(view, 0, start_line - 1)
+    if start >= size:
+        return f"{file_path} has fewer than {start_line} lines ({size} bytes).", 0
+
+    if end_line is None:
+        wanted_end = size
+    else:
+        wanted_end = _skip_lines(view, start, max(end_line - start_line + 1, 1))
+    end = min(wanted_end, start + limit)
+    truncated = end < wanted_end
+
+    # Cut at the last complete line so pages never split a line, unless one line
+    # alone is larger than the budget.
+    if truncated:
+        last_newline = view.rfind(b"\n", start, end)
+        if last_newline != -1:
+            end = last_newline + 1
+
+    lines = view[start:end].decode("utf-8", errors="replace").split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    last_line = start_line + len(lines) - 1
+    numbered = "\n".join(
+        f"{number:>6}  {line}" for number, line in enumerate(lines, start_line)
+    )
+
+    header = (
+        f"{file_path} lines {start_line}-{last_line} (bytes {start}-{end} of {size})"
+    )
+    if truncated:
+        note = (
+            f"[truncated at the read budget: continue with start_line={last_line + 1}]"
+            if view[end - 1 : end] == b"\n"
+            else f"[truncated inside line {last_line}: continue with byte_offset={end}]"
+        )
+        return f"{header}\n{numbered}\n{note}", end - start
+    return f"{header}\n{numbered}", end - start
@@ -1,13 +1,17 @@
 import sys
 from pathlib import Path
+from typing import Optional
 
 from strands import tool
 
 sys.path.append(str(Path(__file__).parent.parent))
 
+from constants.directories import DIRECTORY_WALKER_THREADS, SOURCE_FILE_EXTENSIONS
 from schemas.file_search_returns_schemas import FolderSearchResponse
 from utils.config_loader import load_config
 from utils.directory_scanning import DirectoryScanner
+from utils.file_summary_cache import FileSummaryCache
+from utils.symbol_index import SymbolIndex
 from utils.callback_hanlder_subagents import log_to_session
 
 
@@ -27,6 +31,9 @@ def find_folder_from_name(folder_name: str) -> FolderSearchResponse:
             - folder_path: The full path to the found folder
             - files: List of all Python file paths in the project
             - tree_structure: Tree representation of the project structure
+            - other_matches: Other folders that matched the name, best first
+            - cached_summaries: Saved summaries of files that have not changed since they were summarized
+            - changed_files: Files without a saved summary, which need to be read
             - success: Boolean indicating if the folder was found
     """
 
@@ -36,10 +43,13 @@ def find_folder_from_name(folder_name: str) -> FolderSearchResponse:
         f"Searching for folder: {folder_name} in {config.files_agent.root_directory}"
     )
 
-    scanner = DirectoryScanner(root_dir=Path(config.files_agent.root_directory))
-    found_folder = scanner.find_folder(folder_name)
+    scanner = DirectoryScanner(
+        root_dir=Path(config.files_agent.root_directory),
+        walker_threads=DIRECTORY_WALKER_THREADS,
+    )
+    matches = scanner.find_folders(folder_name)
 
-    if not found_folder:
+    if not matches:
         log_to_session(
             f'Folder "{folder_name}" not found in {config.files_agent.root_directory}'
         )
@@ -52,21 +62,144 @@ def find_folder_from_name(folder_name: str) -> FolderSearchResponse:
             tree_structure=f'Folder "{folder_name}" not found in {config.files_agent.root_directory}',
             message=f'No folder named "{folder_name}" was found.',
         )
+    found_folder = matches[0][0]
     folder_path = Path(found_folder)
     project_name = folder_path.name
-    found_files = scanner.find_files(folder_path)
+    project = scanner.scan_project(folder_path, extensions=SOURCE_FILE_EXTENSIONS)
 
     log_to_session(f"Found folder {found_folder} with folder path: {folder_path}")
 
-    file_paths = [
-        str(file_path) for file_path in found_files if str(file_path).endswith(".py")
-    ]
-    tree_structure = scanner.generate_tree_structure(folder_path)
+    file_paths = project.files
+    tree_structure = project.tree_structure
+    cached_summaries, changed_files = FileSummaryCache.for_path().lookup(file_paths)
+
+    log_to_session(
+        f"{len(cached_summaries)} files have cached summaries, {len(changed_files)} are new or changed"
+    )
+
     return FolderSearchResponse(
         success=True,
         project_name=project_name,
         folder_path=str(folder_path),
         files=file_paths,
         tree_structure=tree_structure,
+        other_matches=[folder for folder, _ in matches[1:]],
+        cached_summaries=cached_summaries,
+        changed_files=changed_files,
         message=f'Found project "{project_name}" with {len(file_paths)} Python files.',
     )
+
+
+@tool
+def save_file_summary(file_path: str, summary: str) -> str:
+    """
+    Save a short summary of a file after reading it, so later questions about the same project
+    can use the summary instead of reading the file again. The summary is kept until the file changes.
+
+    Args:
+        file_path (str): The full path of the file that was read.
+        summary (str): A few sentences on what the file does, its main classes and functions,
+            and anything useful for estimating changes to it.
+
+    Returns:
+        str: Confirmation message.
+    """
+    if FileSummaryCache.for_path().store(file_path, summary):
+        log_to_session(f"Saved summary for {file_path}")
+        return f"Saved summary for {file_path}"
+
+    log_to_session(f"Could not save summary, {file_path} is not readable")
+    return f"Could not save summary, {file_path} is not readable."
+
+
+def _project_folder_error(project_folder: str) -> Optional[str]:
+    """Return why a project folder cannot be indexed, or None if it can."""
+    root_directory = Path(load_config().files_agent.root_directory).resolve()
+    folder = Path(project_folder).resolve()
+    if not folder.is_relative_to(root_directory):
+        return f"{project_folder} is outside the root directory {root_directory}."
+    if not folder.is_dir():
+        return f"{project_folder} is not a folder."
+    return None
+
+
+def _indexed_project(project_folder: str) -> SymbolIndex:
+    """Bring the symbol index of a project folder up to date and return it."""
+    scanner = DirectoryScanner(root_dir=Path(project_folder), use_index=False)
+    files = scanner.find_files(Path(project_folder), extensions=(".py",))
+    index = SymbolIndex.for_path()
+    parsed = index.update(project_folder, files)
+    log_to_session(
+        f"Symbol index of {project_folder}: {parsed} of {len(files)} files re-parsed"
+    )
+    return index
+
+
+@tool
+def find_symbol(project_folder: str, symbol_name: str) -> str:
+    """
+    Find where a function, method or class is defined in a project, without reading any files.
+    Use it to jump straight to the right file and line range before calling `read_file`.
+
+    Args:
+        project_folder (str): The full path of the project folder, as returned by `find_folder_from_name`.
+        symbol_name (str): A plain name like "load_config" or a qualified one like "AgentAbstract.query".
+
+    Returns:
+        str: One line per definition with its file, line range, kind and qualified name,
+            followed by the places that call it.
+    """
+    log_to_session(f"Looking up symbol {symbol_name} in {project_folder}")
+    error = _project_folder_error(project_folder)
+    if error:
+        log_to_session(error)
+        return error
+    index = _indexed_project(project_folder)
+
+    definitions = index.find_symbol(project_folder, symbol_name)
+    if not definitions:
+        return f'No definition of "{symbol_name}" found in {project_folder}.'
+
+    lines = [
+        f"{path}:{start}-{end} {kind} {qualname}"
+        for path, qualname, kind, start, end in definitions
+    ]
+    callers = index.find_callers(project_folder, symbol_name.split(".")[-1])
+    if callers:
+        lines.append("Called from:")
+        lines.extend(
+            f"{path}:{line} in {caller}" for path, _, caller, line in callers[:50]
+        )
+        if len(callers) > 50:
+            lines.append(f"… {len(callers) - 50} more call sites")
+    return "\n".join(lines)
+
+
+@tool
+def who_imports(project_folder: str, module_name: str) -> str:
+    """
+    Find the files in a project that import a module, or a name from a module, without reading them.
+    Use it to see which files are affected when a module changes.
+
+    Args:
+        project_folder (str): The full path of the project folder, as returned by `find_folder_from_name`.
+        module_name (str): A module like "utils.config_loader" or an imported name like "load_config".
+
+    Returns:
+        str: One line per import with its file, line and the imported module and name.
+    """
+    log_to_session(f"Looking up imports of {module_name} in {project_folder}")
+    error = _project_folder_error(project_folder)
+    if error:
+        log_to_session(error)
+        return error
+    imports = _indexed_project(project_folder).who_imports(project_folder, module_name)
+    if not imports:
+        return f'No file in {project_folder} imports "{module_name}".'
+
+    return "\n".join(
+        f"{path}:{line} from {module} import {name}"
+        if name
+        else f"{path}:{line} import {module}"
+        for path, module, name, line in imports
+    )
@@ -4,11 +4,17 @@ from pathlib import Path
 from strands import tool
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from src.utils.config_loader import load_config
+from src.utils.media_stats import format_stats
+from src.utils.similarity_index import format_matches
+from src.utils.media_store import (
+    QueryFilter,
+    format_query_page,
+    open_movie_store,
+)
 import json
 import os
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 import requests
 from dotenv import load_dotenv
@@ -27,12 +33,8 @@ def get_movies_and_show_list() -> str:
     Returns:
         str: JSON string containing full movie/show data
     """
-    config = load_config()
-    list_path = config.movies_agent.movie_list_file
-
     try:
-        with open(list_path) as f:
-            movies = json.load(f)
+        movies = open_movie_store().load()
 
         total_to_watch = len(movies.get("to_watch", []))
         total_watched = len(movies.get("watched", []))
@@ -46,6 +48,111 @@ def get_movies_and_show_list() -> str:
         return f"Error reading movie data: {str(e)}"
 
 
+@tool
+def get_movie_stats(top: int = 10) -> str:
+    """
+    Get precomputed watching stats: counts per status, mean rating, the most common genres and
+    directors with their mean ratings, and movies and shows added and watched per month.
+    Use this to understand the user's taste before querying individual entries.
+
+    Args:
+        top: Number of genres and directors to list
+
+    Returns:
+        str: Compact stats summary
+    """
+    try:
+        store = open_movie_store()
+        return format_stats(store.stats.read(store), top=top)
+    except Exception as e:
+        log_to_session(f"Error reading movie stats: {str(e)}")
+        return f"Error reading movie stats: {str(e)}"
+
+
+@tool
+def find_similar_movies_and_shows(
+    query: str, status: Optional[str] = "to_watch", top_k: int = 5
+) -> str:
+    """
+    Find the movies and shows most similar to a movie or show on the user's lists, or to a
+    description, by title, director, genre and notes. Highly rated ones rank slightly higher.
+    Use this for "what should I watch next" or "something like X".
+
+    Args:
+        query: The title of a movie or show on the user's lists, or a free-text description like
+            "slow-burn space opera"
+        status: "to_watch" or "watched" to only suggest from that list, or None for both
+        top_k: Number of movies and shows to return
+
+    Returns:
+        str: A summary line, then one compact JSON line per match with its similarity score
+    """
+    try:
+        store = open_movie_store()
+        matches = store.similarity.search(store, query, status=status, top_k=top_k)
+        log_to_session(f"Found {len(matches)} movies and shows similar to '{query}'")
+        return format_matches(
+            matches, query, ["title", "director", "genre", "rating", "status", "score"]
+        )
+    except Exception as e:
+        log_to_session(f"Error finding similar movies and shows: {str(e)}")
+        return f"Error finding similar movies and shows: {str(e)}"
+
+
+@tool
+def query_movies_and_shows(
+    status: Optional[str] = None,
+    genre: Optional[str] = None,
+    min_rating: Optional[float] = None,
+    max_rating: Optional[float] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    sort_by: str = "date",
+    descending: bool = True,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> str:
+    """
+    Query the watchlist and watch history, returning only the matching movies and shows.
+    Prefer this over get_movies_and_show_list, and only ask for the slice and fields you need.
+
+    Args:
+        status: "to_watch" or "watched", or None for both
+        genre: Only entries whose genre contains this text (case-insensitive)
+        min_rating: Only entries rated at least this (out of 10)
+        max_rating: Only entries rated at most this (out of 10)
+        date_from: Only entries added (to_watch) or watched (watched) on or after this YYYY-MM-DD date
+        date_to: Only entries added (to_watch) or watched (watched) on or before this YYYY-MM-DD date
+        fields: Fields to return, e.g. ["title", "director", "rating"]. "status" and "date" are
+            also available. Defaults to title, year, genre, director, rating, status and date
+        sort_by: Field to sort by, e.g. "rating", "year", "title" or "date"
+        descending: Sort from highest to lowest
+        limit: Maximum number of entries to return
+        cursor: The next_cursor from a previous call, to get the next page
+
+    Returns:
+        str: A summary line with the match count and next_cursor, then one compact JSON line per entry
+    """
+    try:
+        page = open_movie_store().query(
+            QueryFilter(status, genre, min_rating, max_rating, date_from, date_to),
+            sort_by=sort_by,
+            descending=descending,
+            limit=limit,
+            cursor=cursor,
+        )
+        log_to_session(f"Movie query matched {page.total} movies and shows")
+        return format_query_page(
+            page,
+            fields
+            or ["title", "year", "genre", "director", "rating", "status", "date"],
+        )
+    except Exception as e:
+        log_to_session(f"Error querying movies: {str(e)}")
+        return f"Error querying movies: {str(e)}"
+
+
 @tool
 def add_movie_or_show_to_watchlist(
     title: str,
@@ -67,19 +174,7 @@ def add_movie_or_show_to_watchlist(
     Returns:
         str: Confirmation message
     """
-    config = load_config()
-    list_path = config.movies_agent.movie_list_file
     try:
-        with open(list_path) as f:
-            movies = json.load(f)
-
-        # Check if movie already exists
-        existing = next(
-            (m for m in movies["to_watch"] if m["title"].lower() == title.lower()), None
-        )
-        if existing:
-            return f"'{title}' is already in your watchlist!"
-
         new_movie = {
             "title": title,
             "year": year,
@@ -89,10 +184,8 @@ def add_movie_or_show_to_watchlist(
             "added_date": datetime.now().isoformat()[:10],
         }
 
-        movies["to_watch"].append(new_movie)
-
-        with open(list_path, "w") as f:
-            json.dump(movies, f, indent=2)
+        if not open_movie_store().add("to_watch", new_movie):
+            return f"'{title}' is already in your watchlist!"
 
         return f"Added '{title}' to your watchlist!"
     except Exception as e:
@@ -105,44 +198,38 @@ def mark_movie_or_show_watched(
 ) -> str:
     """
     Mark a movie as watched and move it to the watched list.
+    The title may be approximate: it is matched ignoring case, accents, punctuation and
+    small typos. If several entries could match, they are listed and nothing is changed.
 
     Args:
-        title: Movie/show title (must match existing title in watchlist)
+        title: Movie/show title as the user wrote it
         rating: Your rating out of 10
         notes: Your thoughts about the movie
 
     Returns:
         str: Confirmation message
     """
-    config = load_config()
-    list_path = config.movies_agent.movie_list_file
     try:
-        with open(list_path) as f:
-            movies = json.load(f)
-
-        # Find movie in to_watch list
-        movie_index = None
-        for i, movie in enumerate(movies["to_watch"]):
-            if movie["title"].lower() == title.lower():
-                movie_index = i
-                break
-
-        if movie_index is None:
-            return f"'{title}' not found in your watchlist. Make sure the title matches exactly."
-
-        # Move movie to watched list
-        watched_movie = movies["to_watch"].pop(movie_index)
-        watched_movie["watched_date"] = datetime.now().isoformat()[:10]
-
+        updates = {"watched_date": datetime.now().isoformat()[:10]}
         if rating is not None:
-            watched_movie["rating"] = rating
+            updates["rating"] = rating
         if notes:
-            watched_movie["notes"] = notes
-
-        movies["watched"].append(watched_movie)
-
-        with open(list_path, "w") as f:
-            json.dump(movies, f, indent=2)
+            updates["notes"] = notes
+
+        store = open_movie_store()
+        match, candidates = store.title_index.resolve(store, "to_watch", title)
+        if match is None:
+            if not candidates:
+                return f"'{title}' not found in your watchlist."
+            options = "; ".join(
+                f"'{movie['title']}' (score {score})" for score, movie in candidates
+            )
+            return f"'{title}' is ambiguous. Did you mean one of: {options}? Call again with the exact title."
+
+        title = match["title"]
+        watched_movie = store.move({"title": title}, "to_watch", "watched", updates)
+        if watched_movie is None:
+            return f"'{title}' not found in your watchlist."
 
         return f"Marked '{title}' as watched! {f'Rated {rating}/10. ' if rating else ''}Great job!"
     except Exception as e:
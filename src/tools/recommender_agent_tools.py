@@ -7,10 +7,17 @@ from src.utils.substack_api_utils import (
     get_post_metadata,
 )
 from src.utils.youtube_api_utils import YouTubeMonitor
+from src.utils.fan_out import fan_out
+from src.utils.feed_cache import FeedCache
+from src.utils.feed_sources import (
+    monitored_sources,
+    sync_newsletter,
+    sync_youtube_channels,
+)
 from strands import tool
-import json
 from src.utils.config_loader import load_config
 from src.utils.callback_hanlder_subagents import log_to_session
+from src.utils.json_store import JsonStore
 
 
 @tool
@@ -34,23 +41,14 @@ def add_substack_newsletter_to_monitor(
         )
         return "Substack newsletters file is not configured in the project config."
     path_url = config.recommender_agent.substack_newsletters_file
-    try:
-        with open(path_url) as file:
-            newsletters = json.load(file)
-    except FileNotFoundError:
-        log_to_session(f"File {path_url} not found")
-        newsletters = []
-
-    if newsletter_url in newsletters:
-        log_to_session(
-            f"Newsletter {newsletter_url} is already in the monitoring list."
-        )
-        return f"Newsletter {newsletter_url} is already in the monitoring list."
-
-    newsletters.append({newsletter_url: note_about_newsletter})
-
-    with open(path_url, "w") as file:
-        json.dump(newsletters, file)
+    with JsonStore.for_path(path_url, default=[]).update() as newsletters:
+        if any(newsletter_url in entry for entry in newsletters):
+            log_to_session(
+                f"Newsletter {newsletter_url} is already in the monitoring list."
+            )
+            return f"Newsletter {newsletter_url} is already in the monitoring list."
+
+        newsletters.append({newsletter_url: note_about_newsletter})
     log_to_session(
         f"Newsletter {newsletter_url} has been added to the monitoring list."
     )
@@ -76,16 +74,14 @@ def get_all_newsletters() -> list:
         ]
     path_url = config.recommender_agent.substack_newsletters_file
 
-    try:
-        with open(path_url) as file:
-            newsletters = json.load(file)
-        log_to_session(
-            f"Retrieved {len(newsletters)} newsletters from the monitoring list."
-        )
-        return newsletters
-    except FileNotFoundError:
+    if not Path(path_url).exists():
         log_to_session(f"File {path_url} not found")
         return []
+    newsletters = JsonStore.for_path(path_url, default=[]).read()
+    log_to_session(
+        f"Retrieved {len(newsletters)} newsletters from the monitoring list."
+    )
+    return newsletters
 
 
 @tool
@@ -149,14 +145,12 @@ def get_all_monitored_youtube_channels() -> list:
         return ["YouTube channels file is not configured in the project config."]
     path_url = config.recommender_agent.youtube_channels_file
 
-    try:
-        with open(path_url) as file:
-            channels = json.load(file)
-        log_to_session(f"Retrieved {len(channels)} monitored YouTube channels.")
-        return channels
-    except FileNotFoundError:
+    if not Path(path_url).exists():
         log_to_session(f"File {path_url} not found")
         return []
+    channels = JsonStore.for_path(path_url, default=[]).read()
+    log_to_session(f"Retrieved {len(channels)} monitored YouTube channels.")
+    return channels
 
 
 @tool
@@ -180,21 +174,115 @@ def add_youtube_channel_to_monitor(channel_url: str, note_about_channel: str) ->
 
     path_url = config.recommender_agent.youtube_channels_file
 
-    try:
-        with open(path_url) as file:
-            channels = json.load(file)
-    except FileNotFoundError:
-        log_to_session(f"File {path_url} not found")
-        channels = []
-
-    if channel_url in channels:
-        log_to_session(f"Channel {channel_url} is already in the monitoring list.")
-        return f"Channel {channel_url} is already in the monitoring list."
+    with JsonStore.for_path(path_url, default=[]).update() as channels:
+        if any(channel_url in entry for entry in channels):
+            log_to_session(f"Channel {channel_url} is already in the monitoring list.")
+            return f"Channel {channel_url} is already in the monitoring list."
 
-    channels.append({channel_url: note_about_channel})
-
-    with open(path_url, "w") as file:
-        json.dump(channels, file)
+        channels.append({channel_url: note_about_channel})
     log_to_session(f"Channel {channel_url} has been added to the monitoring list.")
 
     return f"Channel {channel_url} has been added to your monitoring list."
+
+
+@tool
+def get_digest_of_all_sources(
+    videos_per_channel: int = 3,
+    posts_per_newsletter: int = 3,
+    include_seen: bool = False,
+) -> str:
+    """
+    Get the latest videos of every monitored YouTube channel and the latest posts of every
+    monitored Substack newsletter in one call. All sources are fetched concurrently; a
+    source that fails or is too slow is listed as unavailable instead of failing the digest.
+    Prefer this over calling get_recent_youtube_videos and get_recent_posts_from_newsletter
+    for each source.
+
+    Sources are cached on disk and refetched only after the feed cache TTL, and then only
+    their new items are looked up. By default only items not offered by an earlier digest
+    are listed, so sources without new items show "nothing new".
+
+    Args:
+        videos_per_channel (int): Number of recent videos per YouTube channel.
+        posts_per_newsletter (int): Number of recent posts per newsletter.
+        include_seen (bool): Also list recent items offered by earlier digests, e.g. when
+            the user asks to see everything again.
+
+    Returns:
+        str: One section per source with one line per video or post, then the unavailable sources.
+    """
+    config = load_config().recommender_agent
+    timeout = config.digest_source_timeout
+    ttl = config.feed_cache_ttl_minutes * 60
+    cache = FeedCache()
+    channels = monitored_sources(config.youtube_channels_file)
+    newsletters = monitored_sources(config.substack_newsletters_file)
+    if not channels and not newsletters:
+        log_to_session("No YouTube channels or newsletters are monitored.")
+        return "No YouTube channels or newsletters are monitored."
+
+    # All channels are fetched together in batched API calls, so they are one source
+    # here. It bounds its own steps, each handle lookup and batch round trip getting
+    # the timeout, and reports failures per channel.
+    sources = {}
+    if channels:
+        sources["youtube"] = lambda: sync_youtube_channels(
+            [url for url, _ in channels],
+            videos_per_channel,
+            timeout,
+            cache,
+            ttl,
+            config.digest_max_workers,
+        )
+    for url, _ in newsletters:
+        sources[url] = lambda url=url: sync_newsletter(
+            url, posts_per_newsletter, cache, ttl
+        )
+    results = fan_out(
+        sources,
+        max_workers=config.digest_max_workers,
+        timeout=timeout,
+        timeouts={"youtube": None},
+    )
+
+    outcomes = []
+    youtube = results.get("youtube")
+    for url, note in channels:
+        name = f"YouTube: {note} ({url})"
+        if youtube.error is not None:
+            outcomes.append((name, None, videos_per_channel, youtube.error))
+        elif isinstance(youtube.value[url], Exception):
+            outcomes.append((name, None, videos_per_channel, str(youtube.value[url])))
+        else:
+            outcomes.append((name, youtube.value[url], videos_per_channel, None))
+    for url, note in newsletters:
+        outcomes.append(
+            (
+                f"Substack: {note} ({url})",
+                results[url].value,
+                posts_per_newsletter,
+                results[url].error,
+            )
+        )
+
+    sections, unavailable = [], []
+    for name, cached, limit, error in outcomes:
+        if error is not None:
+            unavailable.append(f"- {name}: {error}")
+            continue
+        key, items = cached
+        if include_seen:
+            items = items[:limit]
+        else:
+            items = cache.take_unseen(key, items[:limit])
+        watermark = cache.watermark(key)
+        lines = [item["line"] for item in items] or [
+            f"- nothing new since {watermark[:10]}" if watermark else "- nothing new"
+        ]
+        sections.append("\n".join([f"## {name}"] + lines))
+    if unavailable:
+        sections.append("\n".join(["## Unavailable sources"] + unavailable))
+    log_to_session(
+        f"Digest fetched {len(outcomes) - len(unavailable)} of {len(outcomes)} sources."
+    )
+    return "\n\n".join(sections)
@@ -1,12 +1,35 @@
 from strands import tool
+from datetime import date as Date
 from pathlib import Path
 import sys
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from src.utils.config_loader import load_config
 import json
-from datetime import datetime
 from src.utils.callback_hanlder_subagents import log_to_session
+from src.utils.json_log_store import JsonLogStore
+from src.utils.sleep_import import format_import_result, import_sleep_export
+from src.utils.sleep_rollups import (
+    ROLLUP_KEYS,
+    bucket_of,
+    format_rollups,
+    rollup_ops,
+)
+from src.utils.sleep_analytics import (
+    SleepColumnStore,
+    format_quality_distribution,
+    format_rolling_averages,
+    format_streaks,
+    format_weekday_pattern,
+)
+
+
+def _sleep_store() -> JsonLogStore:
+    """Return the store for the configured sleep tracking file."""
+    config = load_config()
+    return JsonLogStore.for_path(
+        config.big_boss_orchestrator_agent.sleep_tracking_file, indent=4
+    )
 
 
 @tool
@@ -23,12 +46,15 @@ def add_sleep_data(
     Returns:
         str: Confirmation message indicating the sleep data has been added.
     """
-    config = load_config()
-
-    sleep_dir = config.big_boss_orchestrator_agent.sleep_tracking_file
+    try:
+        # Stored dates must be real calendar dates; the columnar store and the rollups
+        # cannot place anything else, e.g. "" or "today".
+        date = Date.fromisoformat(date.strip()).isoformat()
+    except ValueError:
+        log_to_session(f"Rejected sleep entry with invalid date {date!r}")
+        return f"Error adding sleep data. Invalid date {date!r}, expected YYYY-MM-DD."
 
-    with open(sleep_dir) as file:
-        data = json.load(file)
+    store = _sleep_store()
 
     new_sleep_entry = {
         "date": date,
@@ -39,25 +65,49 @@ def add_sleep_data(
 
     log_to_session(f"Adding new sleep entry: {new_sleep_entry}")
 
-    data["sleep_sessions"].append(new_sleep_entry)
-
     try:
-        with open(sleep_dir, "w") as file:
-            json.dump(data, file, indent=4)
+        week = bucket_of(date, "week")
+        with store.locked():
+            store.apply(
+                [{"op": "append", "path": ["sleep_sessions"], "value": new_sleep_entry}]
+            )
+            log_to_session(f"Sleep data written to {store.path}")
+            ops = rollup_ops(_sleep_columns(), store.read(), [date])
+            if ops:
+                store.apply(ops)
+                log_to_session(f"Updated {len(ops)} weekly and monthly sleep rollups")
 
-        log_to_session(f"Sleep data written to {sleep_dir}")
-        last_week_end_str = data["weekly_summary"][-1]["week_end"]
-        last_week_end = datetime.strptime(last_week_end_str, "%Y-%m-%d")
-        if (datetime.now() - last_week_end).days >= 7:
-            log_to_session("Weekly summary needs to be updated.")
-            return f"Sleep data added {new_sleep_entry}. But weekly summary is not updated. Please run the weekly summary tool to update it."
-
-        return f"Sleep data added: {new_sleep_entry}"
+        week_summary = store.read()[ROLLUP_KEYS["week"]].get(week)
+        return (
+            f"Sleep data added: {new_sleep_entry}. Summary of that week: {week_summary}"
+        )
     except Exception as e:
         log_to_session(f"Error writing to sleep tracking file: {e}")
         return f"Error adding sleep data. {e}"
 
 
+@tool
+def import_sleep_data(file_path: str, replace_existing: bool = False) -> str:
+    """
+    Import many nights at once from a CSV, JSON or JSON Lines export, e.g. from a wearable.
+    Use this instead of calling add_sleep_data once per night.
+    Args:
+        file_path (str): Path to the export file.
+        replace_existing (bool): Overwrite nights that are already logged instead of keeping them.
+    Returns:
+        str: How many nights were added, replaced and skipped, with the reasons for invalid rows.
+    """
+    try:
+        result = import_sleep_export(
+            _sleep_store(), file_path, replace=replace_existing
+        )
+        log_to_session(f"Imported sleep data from {file_path}: {result[:4]}")
+        return format_import_result(result)
+    except Exception as e:
+        log_to_session(f"Error importing sleep data from {file_path}: {e}")
+        return f"Error importing sleep data. {e}"
+
+
 @tool
 def get_sleep_data() -> str:
     """
@@ -65,21 +115,120 @@ def get_sleep_data() -> str:
     Returns:
         str: JSON string containing the sleep data.
     """
-    config = load_config()
-    sleep_dir = config.big_boss_orchestrator_agent.sleep_tracking_file
+    store = _sleep_store()
 
     try:
-        with open(sleep_dir) as file:
-            data = json.load(file)
+        data = store.read()
+        if data is None:
+            raise FileNotFoundError(store.path)
         return json.dumps(data, indent=4)
     except FileNotFoundError:
-        log_to_session(f"Sleep tracking file not found at {sleep_dir}")
+        log_to_session(f"Sleep tracking file not found at {store.path}")
         return "Sleep tracking file not found."
     except json.JSONDecodeError:
         log_to_session("Error decoding JSON from sleep tracking file.")
         return "Error decoding sleep tracking data."
 
 
+def _sleep_columns():
+    """Return the sleep sessions of the configured file as columns, one entry per night."""
+    return SleepColumnStore.for_store(_sleep_store()).columns()
+
+
+@tool
+def get_sleep_trend(window: int = 7, days: int = 14) -> str:
+    """
+    Get trailing averages of sleep duration and quality, computed from all sleep data.
+    Prefer this over get_sleep_data to see how sleep is trending.
+    Args:
+        window (int): Number of days each average covers, e.g. 7 for weekly or 30 for monthly.
+        days (int): Number of most recent days to return an average for.
+    Returns:
+        str: One line per day with the average duration in hours and quality from 1 (poor) to 4 (excellent).
+    """
+    try:
+        return format_rolling_averages(_sleep_columns(), window=window, days=days)
+    except Exception as e:
+        log_to_session(f"Error computing sleep trend: {e}")
+        return f"Error computing sleep trend. {e}"
+
+
+@tool
+def get_sleep_weekday_pattern(days: int = 0) -> str:
+    """
+    Get the average sleep duration and quality for each day of the week.
+    Args:
+        days (int): Only use the most recent days of data, or 0 for all of it.
+    Returns:
+        str: One line per weekday with the number of nights, average duration and quality.
+    """
+    try:
+        return format_weekday_pattern(_sleep_columns().last_days(days))
+    except Exception as e:
+        log_to_session(f"Error computing sleep weekday pattern: {e}")
+        return f"Error computing sleep weekday pattern. {e}"
+
+
+@tool
+def get_sleep_quality_distribution(days: int = 0) -> str:
+    """
+    Get how many nights were rated poor, fair, good or excellent, with their average duration.
+    Args:
+        days (int): Only use the most recent days of data, or 0 for all of it.
+    Returns:
+        str: One line per quality level.
+    """
+    try:
+        return format_quality_distribution(_sleep_columns().last_days(days))
+    except Exception as e:
+        log_to_session(f"Error computing sleep quality distribution: {e}")
+        return f"Error computing sleep quality distribution. {e}"
+
+
+@tool
+def get_sleep_streaks(target_minutes: int = 420) -> str:
+    """
+    Get the current and longest streaks of consecutive nights that were logged, that met a
+    sleep duration target and that were rated good or better.
+    Args:
+        target_minutes (int): Minimum sleep duration in minutes for a night to meet the target.
+    Returns:
+        str: One line per kind of streak.
+    """
+    try:
+        return format_streaks(_sleep_columns(), target_minutes=target_minutes)
+    except Exception as e:
+        log_to_session(f"Error computing sleep streaks: {e}")
+        return f"Error computing sleep streaks. {e}"
+
+
+@tool
+def get_sleep_summaries(period: str = "week", count: int = 8) -> str:
+    """
+    Get the weekly (Monday to Sunday) or monthly sleep summaries, which are computed
+    automatically whenever sleep data is added.
+    Args:
+        period (str): "week" or "month".
+        count (int): Number of most recent summaries to return.
+    Returns:
+        str: One line per week or month with the number of nights, average, min and max
+            duration and average quality.
+    """
+    try:
+        store = _sleep_store()
+        with store.locked():
+            ops = rollup_ops(_sleep_columns(), store.read())
+            if ops:
+                store.apply(ops)
+                log_to_session(
+                    f"Backfilled {len(ops)} weekly and monthly sleep rollups"
+                )
+        return format_rollups(store.read(), period=period, count=count)
+    except Exception as e:
+        log_to_session(f"Error reading sleep summaries: {e}")
+        return f"Error reading sleep summaries. {e}"
+
+
 # "week_start": "2025-07-31",
 #             "average_duration": 450,
 #             "average_quality": "good",
@@ -95,7 +244,9 @@ def update_weekly_summary(
     notes: str,
 ) -> str:
     """
-    Update the weekly summary in the sleep tracking file.
+    Add a written weekly summary to the sleep tracking file. The weekly and monthly
+    averages are already computed automatically (see get_sleep_summaries); use this
+    only to record observations about a week.
     Args:
         week_start (str): Start date of the week in YYYY-MM-DD format.
         weel_end (str): End date of the week in YYYY-MM-DD format.
@@ -105,12 +256,8 @@ def update_weekly_summary(
     Returns:
         str: Confirmation message indicating the weekly summary has been updated.
     """
-    config = load_config()
-    sleep_dir = config.big_boss_orchestrator_agent.sleep_tracking_file
+    store = _sleep_store()
     try:
-        with open(sleep_dir) as file:
-            data = json.load(file)
-
         new_weekly_summary = {
             "week_start": week_start,
             "average_duration": average_duration,
@@ -118,10 +265,10 @@ def update_weekly_summary(
             "notes": notes,
         }
         log_to_session(f"Updating weekly summary: {new_weekly_summary}")
-        data["weekly_summary"].append(new_weekly_summary)
+        store.apply(
+            [{"op": "append", "path": ["weekly_summary"], "value": new_weekly_summary}]
+        )
 
-        with open(sleep_dir, "w") as file:
-            json.dump(data, file, indent=4)
         log_to_session(f"Weekly summary updated: {new_weekly_summary}")
 
         return f"Weekly summary updated: {new_weekly_summary}"
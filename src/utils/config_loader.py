@@ -63,6 +63,7 @@ def load_config(config_path: str = "") -> Config:
     movie_agent_config = MoviesAgentConfig(
         model=movie_model_config,
         movie_list_file=raw_config["movies_agent"]["movie_list_file"],
+        storage_backend=raw_config["movies_agent"].get("storage_backend", "json"),
     )
 
     book_model_config = ModelConfig(
@@ -72,6 +73,7 @@ def load_config(config_path: str = "") -> Config:
     book_agent_config = BooksAgentConfig(
         model=book_model_config,
         book_list_file=raw_config["books_agent"]["book_list_file"],
+        storage_backend=raw_config["books_agent"].get("storage_backend", "json"),
     )
     task_model_config = ModelConfig(
         model_id=raw_config["task_agent"]["model"]["model_id"],
@@ -95,6 +97,30 @@ def load_config(config_path: str = "") -> Config:
         substack_newsletters_file=raw_config["recommender_agent"][
             "substack_newsletters_file"
         ],
+        digest_max_workers=raw_config["recommender_agent"].get(
+            "digest_max_workers", 32
+        ),
+        digest_source_timeout=raw_config["recommender_agent"].get(
+            "digest_source_timeout", 20.0
+        ),
+        feed_cache_ttl_minutes=raw_config["recommender_agent"].get(
+            "feed_cache_ttl_minutes", 60.0
+        ),
+        prefetch_interval_minutes=raw_config["recommender_agent"].get(
+            "prefetch_interval_minutes", 30.0
+        ),
+        prefetch_max_workers=raw_config["recommender_agent"].get(
+            "prefetch_max_workers", 8
+        ),
+        prefetch_items_per_source=raw_config["recommender_agent"].get(
+            "prefetch_items_per_source", 5
+        ),
+        prefetch_backoff_base=raw_config["recommender_agent"].get(
+            "prefetch_backoff_base", 60.0
+        ),
+        prefetch_backoff_max=raw_config["recommender_agent"].get(
+            "prefetch_backoff_max", 3600.0
+        ),
     )
 
     home_model_config = ModelConfig(
@@ -1,11 +1,47 @@
-import fnmatch
+import heapq
+import math
 import os
-import subprocess
 import sys
+import time
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Iterator, NamedTuple
 
 sys.path.append(str(Path(__file__).parent.parent))
-from constants.directories import SKIP_DIRS
+from constants.directories import (
+    FOLDER_INDEX_MAX_AGE_SECONDS,
+    SOURCE_FILE_EXTENSIONS,
+    TREE_MAX_BYTES,
+    TREE_MAX_DEPTH,
+    TREE_MAX_ENTRIES,
+    TREE_MAX_FILES_PER_DIR,
+)
+from utils.folder_index import FolderIndex
+from utils.fuzzy_matching import (
+    TrigramIndex,
+    similarity,
+    tokenize,
+    trigrams,
+)
+from utils.parallel_walker import parallel_walk
+from utils.skip_rules import SkipRules
+from utils.tree_renderer import render_tree
+
+
+class ScanEntry(NamedTuple):
+    """A folder or file produced by DirectoryScanner.scan."""
+
+    kind: str
+    path: str
+    parent: str
+    depth: int
+
+
+class ProjectScan(NamedTuple):
+    """The source files and rendered tree of a project."""
+
+    files: list
+    tree_structure: str
 
 
 class DirectoryScanner:
@@ -13,105 +49,322 @@ class DirectoryScanner:
     A class to scan directories and find folders based on a given name.
     """
 
-    def __init__(self, root_dir: Path):
+    def __init__(
+        self,
+        root_dir: Path,
+        use_index: bool = True,
+        index_max_age: float = FOLDER_INDEX_MAX_AGE_SECONDS,
+        walker_threads: int = 0,
+        use_gitignore: bool = True,
+    ):
+        """
+        Args:
+            root_dir (Path): The root directory to scan.
+            use_index (bool): Whether to use the persistent folder index instead of a full walk.
+            index_max_age (float): Seconds for which a previous index refresh is trusted as is.
+            walker_threads (int): Threads listing directories in parallel, 0 walks sequentially.
+            use_gitignore (bool): Whether project walks skip entries ignored by .gitignore files.
+        """
         self.root_dir = root_dir
-        self.subfolders = self.fast_scandir(root_dir)
+        self.walker_threads = walker_threads
+        self.use_gitignore = use_gitignore
+        self._walks: dict[str, list] = {}
+        if use_index:
+            self.folder_index = FolderIndex.for_root(root_dir, use_gitignore)
+            self.subfolders = self.folder_index.refresh(max_age=index_max_age)
+            self.name_index = self.folder_index.name_index
+            self.folder_mtimes = self.folder_index.folders
+        else:
+            self.folder_index = None
+            self.subfolders = self.fast_scandir(root_dir)
+            self.name_index = None
+            self.folder_mtimes = {}
+
+    def iter_walk(self, directory: Path) -> Iterator[tuple]:
+        """
+        Streams a walk of a directory, pruning hidden, SKIP_DIRS and .gitignore'd entries.
+
+        Listings are yielded as soon as they are read and cached once the walk completes.
+        A later walk of the same directory or of any folder inside it is answered from
+        the cache, so every consumer of this scanner shares a single pass over the tree.
+
+        Args:
+            directory (Path): The directory to walk.
+
+        Yields:
+            tuple: (dirpath, dirnames, filenames), like os.walk.
+        """
+        key = str(directory)
+        for walked, entries in self._walks.items():
+            if key == walked or key.startswith(walked + os.sep):
+                prefix = key + os.sep
+                for entry in entries:
+                    if entry[0] == key or entry[0].startswith(prefix):
+                        yield entry
+                return
+
+        rules = SkipRules(use_gitignore=self.use_gitignore)
+        if self.walker_threads > 0:
+            walker = parallel_walk(directory, rules, max_workers=self.walker_threads)
+        else:
+            walker = _pruned_walk(directory, rules)
+
+        entries = []
+        for entry in walker:
+            entries.append(entry)
+            yield entry
+        self._walks[key] = entries
+
+    def walk(self, directory: Path) -> list:
+        """
+        Walks a directory once and caches the result, see iter_walk.
+
+        Args:
+            directory (Path): The directory to walk.
+
+        Returns:
+            list: (dirpath, dirnames, filenames) tuples, like os.walk.
+        """
+        return list(self.iter_walk(directory))
+
+    def scan(
+        self,
+        directory: Path,
+        extensions: tuple = SOURCE_FILE_EXTENSIONS,
+    ) -> Iterator[ScanEntry]:
+        """
+        Streams every folder and file below a directory from a single walk.
+
+        Each folder is yielded as a "folder" entry and each file as a "file" entry, or a
+        "source_file" entry if it has one of the given extensions.
+
+        Args:
+            directory (Path): The directory to scan.
+            extensions (tuple): File extensions that count as source files.
+
+        Yields:
+            ScanEntry: The folders and files, parents before children.
+        """
+        root = str(directory)
+        root_depth = root.rstrip(os.sep).count(os.sep)
+
+        for dirpath, dirnames, filenames in self.iter_walk(directory):
+            depth = dirpath.count(os.sep) - root_depth + 1
+            for dir_name in dirnames:
+                yield ScanEntry(
+                    "folder", os.path.join(dirpath, dir_name), dirpath, depth
+                )
+            for filename in filenames:
+                kind = "source_file" if filename.endswith(extensions) else "file"
+                yield ScanEntry(kind, os.path.join(dirpath, filename), dirpath, depth)
+
+    def scan_project(
+        self,
+        folder_path: Path,
+        extensions: tuple = SOURCE_FILE_EXTENSIONS,
+        max_depth: int = TREE_MAX_DEPTH,
+        max_entries: int = TREE_MAX_ENTRIES,
+        max_bytes: int = TREE_MAX_BYTES,
+        max_files_per_dir: int = TREE_MAX_FILES_PER_DIR,
+    ) -> ProjectScan:
+        """
+        Collects the source files and the tree of a project in one pass.
+
+        Args:
+            folder_path (Path): The project folder.
+            extensions (tuple): File extensions that count as source files.
+            max_depth (int): Number of folder levels to expand in the tree.
+            max_entries (int): Maximum number of file and folder lines in the tree.
+            max_bytes (int): Maximum size of the tree in bytes.
+            max_files_per_dir (int): Files listed per folder before the rest are collapsed.
+
+        Returns:
+            ProjectScan: The source file paths and the rendered tree.
+        """
+        root = str(folder_path)
+        listing = {root: ([], [])}
+        files = []
+        for entry in self.scan(folder_path, extensions):
+            name = os.path.basename(entry.path)
+            if entry.kind == "folder":
+                listing[entry.parent][0].append(name)
+                listing[entry.path] = ([], [])
+            elif entry.kind in ("file", "source_file"):
+                listing[entry.parent][1].append(name)
+                if entry.kind == "source_file":
+                    files.append(entry.path)
+
+        tree_structure = render_tree(
+            [
+                (path, dirnames, filenames)
+                for path, (dirnames, filenames) in listing.items()
+            ],
+            root,
+            max_depth=max_depth,
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            max_files_per_dir=max_files_per_dir,
+        )
+        return ProjectScan(files=files, tree_structure=tree_structure)
 
     def fast_scandir(self, directory: Path) -> list:
         subfolders = []
 
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if not d.startswith(".") and d not in SKIP_DIRS]
-
+        for root, dirs, _ in self.walk(directory):
             for dir_name in dirs:
                 subfolders.append(os.path.join(root, dir_name))
 
         return subfolders
 
+    def find_folders(self, folder_name: str, top_k: int = 5) -> list:
+        """
+        Ranks the folders whose name best matches the given name.
+
+        Candidates come from a trigram/token index over folder names, so only folders
+        sharing parts of the name are scored. Folders containing the query's words as
+        whole words rank first, e.g. "charon" finds "project-charon" before "charonx"
+        or "chiron". Among those, shallower folders win, then recently modified ones
+        and those whose whole name is closest to the query.
+
+        Args:
+            folder_name (str): The name of the folder to find.
+            top_k (int): The maximum number of folders to return.
+
+        Returns:
+            list: Tuples of (folder path, score), best match first.
+        """
+        query_tokens = tokenize(folder_name)
+        query_grams = trigrams(folder_name)
+        if not query_tokens:
+            return []
+
+        if self.name_index is None:
+            self.name_index = TrigramIndex()
+            for folder in self.subfolders:
+                self.name_index.add(folder, os.path.basename(folder))
+
+        now = time.time()
+        root_depth = str(self.root_dir).rstrip(os.sep).count(os.sep)
+        with self.folder_index.lock if self.folder_index else nullcontext():
+            candidates = self.name_index.candidates(folder_name)
+
+        ranked = []
+        for folder in candidates:
+            name = os.path.basename(folder)
+            name_grams = trigrams(name)
+            gram_overlap = len(query_grams & name_grams) / len(query_grams | name_grams)
+            score = (
+                0.8 * _token_score(query_tokens, tokenize(name))
+                + 0.05 * gram_overlap
+                + 0.05 * similarity(folder_name, name)
+            )
+
+            depth = folder.count(os.sep) - root_depth - 1
+            score -= 0.02 * depth
+
+            mtime = self.folder_mtimes.get(folder)
+            if mtime:
+                age_days = max(now - mtime, 0) / 86400
+                score += 0.05 * math.exp(-age_days / 30)
+
+            ranked.append((folder, round(score, 4)))
+
+        return heapq.nlargest(top_k, ranked, key=lambda item: item[1])
+
     def find_folder(self, folder_name: str) -> str:
         """
         Searches for a folder with the specified name within the root directory and its subdirectories.
 
         Args:
-            root_dir (Path): The root directory to start the search.
             folder_name (str): The name of the folder to find.
 
         Returns:
-            str: The path to the found folder, or an empty string if not found.
-        """
-
-        match_score = {}
-        found_folder = None
-        for folder in self.subfolders:
-            splits = folder.split("/")
-            last_folder = splits[-1]
-            name_parts = folder_name.split(" ")
-            match_score[folder] = 0
-
-            if len(name_parts) == 1:
-                if folder_name.lower() in last_folder.lower():
-                    print(f"Found folder: {folder}")
-                    found_folder = folder
-                    break
-
-            if len(name_parts) > 1:
-                if all(part.lower() in last_folder.lower() for part in name_parts):
-                    print(f"Found folder: {folder}")
-                    found_folder = folder
-                    break
-                for part in name_parts:
-                    if part.lower() in last_folder.lower():
-                        match_score[folder] += 1
-
-        if found_folder is None:
-            best_match = max(match_score, key=match_score.get)
-            print(f"Best match: {best_match} with score {match_score[best_match]}")
-            found_folder = best_match
-
-        if found_folder is not None:
-            return found_folder
-        else:
+            str: The path to the best matching folder, or an empty string if not found.
+        """
+        matches = self.find_folders(folder_name, top_k=1)
+        if not matches:
             print(f"Folder '{folder_name}' not found in {self.root_dir}")
             return ""
 
-    def find_files(self, found_folder: Path) -> list:
+        best_match, score = matches[0]
+        print(f"Best match: {best_match} with score {score}")
+        return best_match
+
+    def find_files(
+        self, found_folder: Path, extensions: tuple = (".py", ".ipynb")
+    ) -> list:
         """
-        Finds all Python files in the specified folder and its subdirectories.
+        Finds all source files in the specified folder and its subdirectories.
         Args:
-            found_folder (Path): The path to the folder to search for Python files.
+            found_folder (Path): The path to the folder to search for source files.
+            extensions (tuple): File extensions to collect.
         Returns:
-            list: A list of paths to Python files found in the folder.
+            list: A list of paths to source files found in the folder.
         """
+        return [
+            entry.path
+            for entry in self.scan(found_folder, extensions)
+            if entry.kind == "source_file"
+        ]
 
-        files = []
-        for root, _, filenames in os.walk(found_folder):
-            if any(fnmatch.fnmatch(root, f"*/{skip_dir}/*") for skip_dir in SKIP_DIRS):
-                continue
-            k = 0
-            for filename in filenames:
-                for skip_dir in SKIP_DIRS:
-                    if skip_dir in filename:
-                        k = 1
-                        break
-                if k == 0:
-                    if filename.endswith(".py") or filename.endswith(".ipynb"):
-                        files.append(str(Path(root) / filename))
-
-        return files
-
-    def generate_tree_structure(self, folder_path: Path) -> str:
+    def generate_tree_structure(
+        self,
+        folder_path: Path,
+        max_depth: int = TREE_MAX_DEPTH,
+        max_entries: int = TREE_MAX_ENTRIES,
+        max_bytes: int = TREE_MAX_BYTES,
+        max_files_per_dir: int = TREE_MAX_FILES_PER_DIR,
+    ) -> str:
         """
         Generates a tree structure representation of the directory.
 
+        The tree is rendered from the same cached walk as find_files, so hidden folders,
+        SKIP_DIRS folders and .gitignore'd entries are left out and symlinks are not
+        followed. The output is bounded by the given budgets so large projects do not
+        flood the prompt.
+
         Args:
             folder_path (Path): The path to the folder to generate the tree structure for.
+            max_depth (int): Number of folder levels to expand.
+            max_entries (int): Maximum number of file and folder lines.
+            max_bytes (int): Maximum size of the tree in bytes.
+            max_files_per_dir (int): Files listed per folder before the rest are collapsed.
 
         Returns:
             str: A string representation of the tree structure.
         """
-        result = subprocess.run(
-            ["tree", "-l", str(folder_path)],
-            capture_output=True,
-            text=True,
+        return render_tree(
+            self.walk(folder_path),
+            str(folder_path),
+            max_depth=max_depth,
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            max_files_per_dir=max_files_per_dir,
         )
-        return result.stdout
+
+
+def _token_score(query_tokens: list, tokens: list) -> float:
+    """
+    Return the fraction of query tokens a folder name contains.
+
+    A query token equal to a token of the name counts fully. Otherwise it counts at most
+    half, as a prefix of a token or by its best edit similarity, so a name with the
+    query's words always outranks names with only parts or misspellings of them.
+    """
+    if not query_tokens or not tokens:
+        return 0.0
+    matched = 0.0
+    for query_token in query_tokens:
+        if query_token in tokens:
+            matched += 1.0
+        elif any(token.startswith(query_token) for token in tokens):
+            matched += 0.5
+        else:
+            matched += 0.5 * max(similarity(query_token, token) for token in tokens)
+    return matched / len(query_tokens)
+
+
+def _pruned_walk(directory: Path, rules: SkipRules) -> Iterator[tuple]:
+    for root, dirs, files in os.walk(directory):
+        dirs[:], files = rules.filter(root, dirs, files)
+        yield root, list(dirs), files
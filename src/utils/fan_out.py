@@ -0,0 +1,100 @@
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, NamedTuple, Optional
+
+
+class FanOutResult(NamedTuple):
+    """The outcome of one call: its value, or an error message if it failed or timed out."""
+
+    value: Any
+    error: Optional[str]
+    seconds: float
+
+
+def fan_out(
+    calls: dict[str, Callable[[], Any]],
+    max_workers: int = 8,
+    timeout: float = 20.0,
+    timeouts: Optional[dict[str, Optional[float]]] = None,
+) -> dict[str, FanOutResult]:
+    """
+    Run independent calls concurrently on a bounded thread pool.
+
+    Each call gets timeout seconds from the moment a worker starts it. Calls that fail or
+    overrun are reported as errors instead of holding up the others, so the whole run
+    takes about as long as the slowest call that finishes in time. Overrunning calls
+    cannot be interrupted; their threads are left to finish in the background and their
+    results are discarded.
+
+    Args:
+        calls (dict[str, Callable[[], Any]]): Calls without arguments, by name.
+        max_workers (int): Maximum number of calls running at once.
+        timeout (float): Seconds each call may run.
+        timeouts (Optional[dict[str, Optional[float]]]): Seconds particular calls may
+            run instead, by name. None lets a call that bounds its own steps run to
+            completion; calls queued behind it still give up after the usual wait.
+
+    Returns:
+        dict[str, FanOutResult]: The outcome of every call, in the order of calls.
+    """
+    if not calls:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fan-out")
+    started: dict[str, float] = {}
+    limits = {name: (timeouts or {}).get(name, timeout) for name in calls}
+
+    def run(name: str, call: Callable[[], Any]) -> Any:
+        started[name] = time.monotonic()
+        return call()
+
+    futures = {executor.submit(run, name, call): name for name, call in calls.items()}
+    results: dict[str, FanOutResult] = {}
+    pending = set(futures)
+    # Calls queue for a free worker, so the last one may start this late.
+    deadline = time.monotonic() + timeout * math.ceil(len(calls) / max_workers)
+    try:
+        while pending:
+            now = time.monotonic()
+            running = [
+                futures[future] for future in pending if futures[future] in started
+            ]
+            wake_ups = [
+                started[name] + limits[name]
+                for name in running
+                if limits[name] is not None
+            ]
+            if len(running) < len(pending):
+                wake_ups.append(deadline)
+            done, pending = wait(
+                pending,
+                timeout=max(min(wake_ups) - now, 0.01) if wake_ups else None,
+                return_when=FIRST_COMPLETED,
+            )
+
+            now = time.monotonic()
+            for future in done:
+                name = futures[future]
+                seconds = now - started.get(name, now)
+                try:
+                    results[name] = FanOutResult(future.result(), None, seconds)
+                except Exception as e:
+                    results[name] = FanOutResult(None, str(e) or repr(e), seconds)
+
+            for future in list(pending):
+                name = futures[future]
+                start, limit = started.get(name), limits[name]
+                if start is not None:
+                    if limit is not None and now - start >= limit:
+                        results[name] = FanOutResult(
+                            None, f"timed out after {limit:g}s", now - start
+                        )
+                        pending.discard(future)
+                elif now >= deadline:
+                    results[name] = FanOutResult(
+                        None, "timed out waiting for a free worker", 0.0
+                    )
+                    pending.discard(future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return {name: results[name] for name in calls}
@@ -0,0 +1,109 @@
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.json_store import JsonStore
+
+FEED_CACHE_PATH = Path(__file__).parent.parent.parent / "data" / "feed_cache.json"
+# Items kept per source, newest first; older ones fall out of the cache.
+MAX_ITEMS_PER_SOURCE = 30
+
+
+class FeedCache:
+    """
+    Recent items of each monitored source, kept on disk between recommender queries.
+
+    Each source (a channel or newsletter URL) maps to an entry holding when it was last
+    fetched, how many items were asked for, its watermark (the date of its newest item),
+    its items as {"id", "date", "line"} dicts, newest first, and the IDs of the items
+    already offered to the agent. A source fetched less than ttl seconds ago is served
+    from the cache; a stale one is asked only for items it does not hold yet.
+    """
+
+    def __init__(
+        self, path: Path = FEED_CACHE_PATH, max_items: int = MAX_ITEMS_PER_SOURCE
+    ):
+        self.store = JsonStore.for_path(path, default={})
+        self.max_items = max_items
+
+    def entry(self, source: str) -> dict:
+        """Return a source's entry, empty if it was never fetched. Must not be modified."""
+        return self.store.read().get(source) or {}
+
+    def is_fresh(self, source: str, ttl: float, limit: int) -> bool:
+        """Whether a source was fetched less than ttl seconds ago for at least limit items."""
+        entry = self.entry(source)
+        return (
+            time.time() - entry.get("fetched_at", 0) < ttl
+            and entry.get("depth", 0) >= limit
+        )
+
+    def watermark(self, source: str) -> Optional[str]:
+        """Return the date of a source's newest cached item, or None."""
+        return self.entry(source).get("watermark")
+
+    def known_ids(self, source: str) -> set:
+        """Return the IDs of a source's cached items."""
+        return {item["id"] for item in self.entry(source).get("items", [])}
+
+    def merge(self, source: str, new_items: list, limit: int) -> list:
+        """
+        Add freshly fetched items to a source and mark it as fetched now.
+
+        Args:
+            source (str): The source URL.
+            new_items (list): {"id", "date", "line"} dicts not cached yet, in any order.
+            limit (int): Number of items the fetch asked for.
+
+        Returns:
+            list: All cached items of the source, newest first.
+        """
+        with self.store.update() as cache:
+            entry = cache.setdefault(source, {})
+            new_ids = {item["id"] for item in new_items}
+            items = list(new_items) + [
+                item for item in entry.get("items", []) if item["id"] not in new_ids
+            ]
+            items.sort(key=lambda item: item["date"], reverse=True)
+            items = items[: max(self.max_items, limit)]
+            kept = {item["id"] for item in items}
+
+            entry["items"] = items
+            entry["seen"] = [
+                item_id for item_id in entry.get("seen", []) if item_id in kept
+            ]
+            entry["fetched_at"] = time.time()
+            entry["depth"] = limit
+            if items:
+                entry["watermark"] = max(entry.get("watermark", ""), items[0]["date"])
+        return items
+
+    def sync(self, source: str, ttl: float, limit: int, fetch: Callable) -> list:
+        """
+        Return a source's recent items, fetching only the new ones if the cache is stale.
+
+        Args:
+            source (str): The source URL.
+            ttl (float): Seconds a fetch stays fresh.
+            limit (int): Number of recent items wanted.
+            fetch (Callable): Called with the set of cached IDs; returns the
+                {"id", "date", "line"} dicts of the items that are not cached yet.
+
+        Returns:
+            list: The source's cached items, newest first.
+        """
+        if self.is_fresh(source, ttl, limit):
+            return self.entry(source)["items"]
+        return self.merge(source, fetch(self.known_ids(source)), limit)
+
+    def take_unseen(self, source: str, items: list) -> list:
+        """Return the items of a source not offered before, and mark them as offered."""
+        with self.store.update() as cache:
+            entry = cache.setdefault(source, {})
+            seen = set(entry.get("seen", []))
+            unseen = [item for item in items if item["id"] not in seen]
+            if unseen:
+                entry["seen"] = entry.get("seen", []) + [item["id"] for item in unseen]
+        return unseen
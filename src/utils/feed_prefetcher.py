@@ -0,0 +1,122 @@
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+sys.path.append(str(Path(__file__).parent.parent))
+from schemas.config_schema import RecommenderAgentConfig
+from utils.fan_out import fan_out
+from utils.feed_cache import FeedCache
+from utils.feed_sources import monitored_sources, sync_newsletter, sync_youtube_channels
+
+
+class FeedPrefetcher(threading.Thread):
+    """
+    A background thread that keeps the feed cache of all monitored sources warm.
+
+    Every prefetch interval it refreshes the channels and newsletters whose cached items
+    are older than half the interval, so with an interval below the feed cache TTL the
+    recommender's digest is served from local data without waiting on the network.
+    Newsletters are refreshed concurrently, up to prefetch_max_workers at a time, and all
+    channels together in one batched job. A source that fails is retried after an
+    exponential backoff with random jitter, so failing sources neither hammer the APIs
+    nor retry in lockstep.
+    """
+
+    def __init__(
+        self, config: RecommenderAgentConfig, cache: Optional[FeedCache] = None
+    ):
+        super().__init__(name="feed-prefetcher", daemon=True)
+        self.config = config
+        self.cache = cache or FeedCache()
+        self.failures: dict[str, int] = {}
+        self.retry_at: dict[str, float] = {}
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """Stop prefetching after the current refresh."""
+        self._stop_event.set()
+
+    def run(self):
+        interval = self.config.prefetch_interval_minutes * 60
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Feed prefetch failed: {e}")
+            next_retry = min(self.retry_at.values(), default=time.time() + interval)
+            self._stop_event.wait(max(min(interval, next_retry - time.time()), 1.0))
+
+    def _backoff(self, source: str, error) -> None:
+        """Schedule a failed source's next attempt with jittered exponential backoff."""
+        failures = self.failures[source] = self.failures.get(source, 0) + 1
+        # Cap after the jitter, so no retry waits longer than prefetch_backoff_max.
+        delay = min(
+            self.config.prefetch_backoff_max,
+            self.config.prefetch_backoff_base
+            * 2 ** (failures - 1)
+            * random.uniform(0.5, 1.5),
+        )
+        self.retry_at[source] = time.time() + delay
+        logger.debug(f"Prefetching {source} failed ({error}), retrying in {delay:.0f}s")
+
+    def _succeeded(self, source: str) -> None:
+        """Forget a source's failures."""
+        self.failures.pop(source, None)
+        self.retry_at.pop(source, None)
+
+    def refresh(self) -> None:
+        """Refresh every monitored source that is due and not backing off."""
+        config = self.config
+        # Half an interval, so a source refreshed last cycle is not skipped as fresh.
+        ttl = config.prefetch_interval_minutes * 30
+        channels = [url for url, _ in monitored_sources(config.youtube_channels_file)]
+        newsletters = [
+            url for url, _ in monitored_sources(config.substack_newsletters_file)
+        ]
+        monitored = set(channels) | set(newsletters)
+        for source in set(self.retry_at) - monitored:
+            self._succeeded(source)
+
+        now = time.time()
+        channels = [url for url in channels if self.retry_at.get(url, 0) <= now]
+        newsletters = [url for url in newsletters if self.retry_at.get(url, 0) <= now]
+
+        calls = {}
+        if channels:
+            calls["youtube"] = lambda: sync_youtube_channels(
+                channels,
+                config.prefetch_items_per_source,
+                config.digest_source_timeout,
+                self.cache,
+                ttl,
+                config.prefetch_max_workers,
+            )
+        for url in newsletters:
+            calls[url] = lambda url=url: sync_newsletter(
+                url, config.prefetch_items_per_source, self.cache, ttl
+            )
+        results = fan_out(
+            calls,
+            max_workers=config.prefetch_max_workers,
+            timeout=config.digest_source_timeout,
+            timeouts={"youtube": None},
+        )
+
+        youtube = results.get("youtube")
+        for url in channels:
+            if youtube.error is not None:
+                self._backoff(url, youtube.error)
+            elif isinstance(youtube.value[url], Exception):
+                self._backoff(url, youtube.value[url])
+            else:
+                self._succeeded(url)
+        for url in newsletters:
+            if results[url].error is not None:
+                self._backoff(url, results[url].error)
+            else:
+                self._succeeded(url)
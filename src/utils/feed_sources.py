@@ -0,0 +1,177 @@
+import sys
+from pathlib import Path
+
+import isodate
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.fan_out import fan_out
+from utils.feed_cache import FeedCache
+from utils.json_store import JsonStore
+from utils.substack_api_utils import get_post_metadata, get_recent_posts
+from utils.youtube_api_utils import YouTubeMonitor
+
+
+def monitored_sources(path_url: str) -> list:
+    """Return (url, note) pairs from a monitoring list file."""
+    if not path_url or not Path(path_url).exists():
+        return []
+    entries = JsonStore.for_path(path_url, default=[]).read()
+    return [(url, note) for entry in entries for url, note in entry.items()]
+
+
+def video_line(video: dict) -> str:
+    """Return a one-line summary of a videos().list item."""
+    snippet = video["snippet"]
+    duration = video.get("contentDetails", {}).get("duration")
+    minutes = (
+        f"{int(isodate.parse_duration(duration).total_seconds() // 60)} min, "
+        if duration
+        else ""
+    )
+    views = video.get("statistics", {}).get("viewCount", "?")
+    return (
+        f"- {snippet['title']} ({snippet['publishedAt'][:10]}, {minutes}{views} views) "
+        f"https://www.youtube.com/watch?v={video['id']}"
+    )
+
+
+def resolve_channel_ids(channel_urls: list, timeout: float, max_workers: int) -> dict:
+    """
+    Return the ID of each channel URL or handle, or the exception that prevented it.
+
+    Cached IDs are returned directly. The others are looked up concurrently, each with
+    its own client and timeout, so one slow lookup only fails its own channel.
+    """
+    youtube_monitor = YouTubeMonitor(timeout=timeout)
+    results, uncached = {}, []
+    for channel_url in channel_urls:
+        channel_id = youtube_monitor.cached_channel_id(channel_url)
+        if channel_id:
+            results[channel_url] = channel_id
+        else:
+            uncached.append(channel_url)
+
+    lookups = fan_out(
+        {
+            channel_url: lambda channel_url=channel_url: YouTubeMonitor(
+                timeout=timeout
+            ).get_channel_id_from_url(channel_url)
+            for channel_url in uncached
+        },
+        max_workers=max_workers,
+        timeout=timeout,
+    )
+    for channel_url, lookup in lookups.items():
+        if lookup.error is not None:
+            results[channel_url] = RuntimeError(lookup.error)
+        elif lookup.value is None:
+            results[channel_url] = ValueError(f"Channel {channel_url} not found")
+        else:
+            results[channel_url] = lookup.value
+    return results
+
+
+def sync_youtube_channels(
+    channel_urls: list,
+    limit: int,
+    timeout: float,
+    cache: FeedCache,
+    ttl: float,
+    max_workers: int = 8,
+) -> dict:
+    """
+    Return the feed cache key and recent items of each channel, or the exception it hit.
+
+    Channels fetched within ttl seconds are served from the cache; the others are
+    fetched together, looking up only the videos the cache does not hold yet. timeout
+    bounds each handle lookup and each batch round trip rather than the whole set, so
+    a long channel list or a slow lookup only fails the channels involved.
+    """
+    youtube_monitor = YouTubeMonitor(timeout=timeout)
+    results, channel_ids = {}, {}
+    resolved = resolve_channel_ids(channel_urls, timeout, max_workers)
+    for channel_url, channel_id in resolved.items():
+        if isinstance(channel_id, Exception):
+            results[channel_url] = channel_id
+        else:
+            channel_ids[channel_url] = channel_id
+
+    # Keyed by channel ID, so different URLs of one channel share an entry.
+    keys = {
+        channel_id: f"https://www.youtube.com/channel/{channel_id}"
+        for channel_id in channel_ids.values()
+    }
+    stale = [
+        channel_id
+        for channel_id, key in keys.items()
+        if not cache.is_fresh(key, ttl, limit)
+    ]
+    videos = (
+        youtube_monitor.get_recent_videos_for_channels(
+            stale,
+            limit,
+            known_ids={
+                channel_id: cache.known_ids(keys[channel_id]) for channel_id in stale
+            },
+        )
+        if stale
+        else {}
+    )
+    items = {}
+    for channel_id, key in keys.items():
+        if channel_id not in videos:
+            items[channel_id] = cache.entry(key)["items"]
+        elif isinstance(videos[channel_id], Exception):
+            items[channel_id] = videos[channel_id]
+        else:
+            items[channel_id] = cache.merge(
+                key,
+                [
+                    {
+                        "id": video["id"],
+                        "date": video["snippet"]["publishedAt"],
+                        "line": video_line(video),
+                    }
+                    for video in videos[channel_id]
+                ],
+                limit,
+            )
+    for channel_url, channel_id in channel_ids.items():
+        channel_items = items[channel_id]
+        results[channel_url] = (
+            channel_items
+            if isinstance(channel_items, Exception)
+            else (keys[channel_id], channel_items)
+        )
+    return results
+
+
+def sync_newsletter(
+    newsletter_url: str, limit: int, cache: FeedCache, ttl: float
+) -> tuple:
+    """
+    Return the feed cache key and recent items of a newsletter.
+
+    The post list is fetched only if the cache is older than ttl seconds, and then
+    metadata is fetched only for the posts the cache does not hold yet.
+    """
+
+    def fetch(known_ids):
+        items = []
+        for post in get_recent_posts(newsletter_url, limit):
+            if post.url in known_ids:
+                continue
+            metadata = get_post_metadata(post)
+            summary = (metadata.summary or "")[:200]
+            items.append(
+                {
+                    "id": post.url,
+                    "date": metadata.post_date,
+                    "line": f"- {metadata.title} ({metadata.post_date[:10]}, "
+                    f"{metadata.word_count} words) {metadata.canonical_url}"
+                    f"{f': {summary}' if summary else ''}",
+                }
+            )
+        return items
+
+    return newsletter_url, cache.sync(newsletter_url, ttl, limit, fetch)
@@ -0,0 +1,194 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+FILE_SUMMARY_CACHE_PATH = (
+    Path(__file__).parent.parent.parent / "data" / "file_summary_cache.sqlite"
+)
+
+
+class FileSummaryCache:
+    """
+    A cache of file summaries written by the file agent, keyed by file content hash.
+
+    A summary stays valid for as long as the file content is unchanged, wherever the
+    file lives, so repeated questions about a project only need to read the files that
+    changed. Content hashes are remembered per path, mtime and size so unchanged files
+    are not re-hashed. The cache is capped at max_bytes of summaries and evicts the
+    least recently used ones first. Use for_path to get the instance shared by the
+    process, so its lock serializes every thread that uses the same database.
+    """
+
+    _caches: dict[str, "FileSummaryCache"] = {}
+    _caches_lock = threading.Lock()
+
+    def __init__(
+        self,
+        cache_path: Path = FILE_SUMMARY_CACHE_PATH,
+        max_bytes: int = 5_000_000,
+    ):
+        self.cache_path = Path(cache_path)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_path(
+        cls, cache_path: Path = FILE_SUMMARY_CACHE_PATH, max_bytes: int = 5_000_000
+    ) -> "FileSummaryCache":
+        """Return the cache shared by everything in this process that uses cache_path."""
+        key = os.path.abspath(cache_path)
+        with cls._caches_lock:
+            cache = cls._caches.get(key)
+            if cache is None:
+                cache = cls._caches[key] = cls(cache_path, max_bytes)
+            return cache
+
+    def _connect(self) -> sqlite3.Connection:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.cache_path)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            "content_hash TEXT PRIMARY KEY, summary TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS summaries_last_access ON summaries (last_access)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS file_hashes ("
+            "path TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL, "
+            "content_hash TEXT NOT NULL)"
+        )
+        return connection
+
+    def content_hash(
+        self, path: str, connection: Optional[sqlite3.Connection] = None
+    ) -> Optional[str]:
+        """
+        Return the SHA-256 of a file's content, reusing the stored hash if the file's
+        mtime and size are unchanged.
+
+        Args:
+            path (str): The file to hash.
+            connection (Optional[sqlite3.Connection]): An open cache connection to reuse.
+
+        Returns:
+            Optional[str]: The hex digest, or None if the file cannot be read.
+        """
+        own_connection = connection is None
+        connection = connection or self._connect()
+        try:
+            stat = os.stat(path)
+            row = connection.execute(
+                "SELECT mtime, size, content_hash FROM file_hashes WHERE path = ?",
+                (path,),
+            ).fetchone()
+            if row and row[0] == stat.st_mtime and row[1] == stat.st_size:
+                return row[2]
+
+            with open(path, "rb") as file:
+                digest = hashlib.file_digest(file, "sha256").hexdigest()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO file_hashes (path, mtime, size, content_hash) "
+                    "VALUES (?, ?, ?, ?)",
+                    (path, stat.st_mtime, stat.st_size, digest),
+                )
+            return digest
+        except OSError:
+            return None
+        finally:
+            if own_connection:
+                connection.close()
+
+    def lookup(self, paths: list) -> tuple:
+        """
+        Split files into those with a cached summary and those that need reading.
+
+        Args:
+            paths (list): The files to look up.
+
+        Returns:
+            tuple: (summaries, changed) where summaries maps path to its cached summary
+                and changed lists the paths without one.
+        """
+        summaries, changed, hits = {}, [], []
+        with self.lock:
+            connection = self._connect()
+            try:
+                for path in paths:
+                    digest = self.content_hash(path, connection)
+                    row = None
+                    if digest is not None:
+                        row = connection.execute(
+                            "SELECT summary FROM summaries WHERE content_hash = ?",
+                            (digest,),
+                        ).fetchone()
+                    if row is None:
+                        changed.append(path)
+                    else:
+                        summaries[path] = row[0]
+                        hits.append(digest)
+
+                with connection:
+                    connection.executemany(
+                        "UPDATE summaries SET last_access = ? WHERE content_hash = ?",
+                        [(time.time(), digest) for digest in hits],
+                    )
+            finally:
+                connection.close()
+        return summaries, changed
+
+    def store(self, path: str, summary: str) -> bool:
+        """
+        Store the summary of a file under its current content hash.
+
+        Args:
+            path (str): The summarized file.
+            summary (str): The summary to cache.
+
+        Returns:
+            bool: True if the summary was stored, False if the file cannot be read.
+        """
+        with self.lock:
+            connection = self._connect()
+            try:
+                digest = self.content_hash(path, connection)
+                if digest is None:
+                    return False
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO summaries "
+                        "(content_hash, summary, size, last_access) VALUES (?, ?, ?, ?)",
+                        (digest, summary, len(summary.encode()), time.time()),
+                    )
+                    self._evict(connection)
+                return True
+            finally:
+                connection.close()
+
+    def _evict(self, connection: sqlite3.Connection):
+        """Drop least recently used summaries until the cache fits in max_bytes."""
+        total = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM summaries"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for content_hash, size in connection.execute(
+            "SELECT content_hash, size FROM summaries ORDER BY last_access"
+        ):
+            if total <= self.max_bytes:
+                break
+            evicted.append((content_hash,))
+            total -= size
+        connection.executemany("DELETE FROM summaries WHERE content_hash = ?", evicted)
+        connection.execute(
+            "DELETE FROM file_hashes WHERE content_hash NOT IN "
+            "(SELECT content_hash FROM summaries)"
+        )
@@ -0,0 +1,321 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.fuzzy_matching import TrigramIndex
+from utils.skip_rules import SkipRules
+
+FOLDER_INDEX_PATH = Path(__file__).parent.parent.parent / "data" / "folder_index.sqlite"
+
+
+class FolderIndex:
+    """
+    A persistent index of all folders below a root directory.
+
+    Every folder is stored in SQLite together with its mtime. A folder's mtime only
+    changes when entries are created, renamed or removed directly inside it, so a
+    refresh only has to stat the known folders and re-list the ones that changed.
+    Folders are skipped by the same SkipRules as project walks, so lookups see the same
+    folders whether or not they use the index. An index built under other rules is
+    discarded and rebuilt.
+    """
+
+    _instances: dict = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        root_dir: Path,
+        index_path: Path = FOLDER_INDEX_PATH,
+        use_gitignore: bool = True,
+    ):
+        self.root_dir = str(root_dir)
+        self.index_path = Path(index_path)
+        self.use_gitignore = use_gitignore
+        self.rules_key = f"gitignore={use_gitignore}"
+        self.folders: dict[str, float] = {}
+        self.children: dict[str, list[str]] = {}
+        self.name_index = TrigramIndex()
+        self.refreshed_at = 0.0
+        self.live = False
+        self.lock = threading.RLock()
+        self._loaded = False
+
+    @classmethod
+    def for_root(cls, root_dir: Path, use_gitignore: bool = True) -> "FolderIndex":
+        """
+        Return the shared index for a root directory, so repeated lookups in the same
+        process reuse the in-memory copy instead of reloading it from disk.
+
+        Args:
+            root_dir (Path): The root directory the index covers.
+            use_gitignore (bool): Whether folders ignored by .gitignore files are skipped.
+
+        Returns:
+            FolderIndex: The shared index for the root directory.
+        """
+        key = (str(root_dir), use_gitignore)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(root_dir, use_gitignore=use_gitignore)
+            return cls._instances[key]
+
+    def _rules(self) -> SkipRules:
+        # Fresh rules per pass, so edited .gitignore files are read again.
+        return SkipRules(use_gitignore=self.use_gitignore, root=self.root_dir)
+
+    @property
+    def subfolders(self) -> list:
+        """All indexed folders except the root, in walk order."""
+        with self.lock:
+            return [folder for folder in self.folders if folder != self.root_dir]
+
+    def refresh(self, max_age: float = 0.0) -> list:
+        """
+        Bring the index up to date with the filesystem and return all subfolders.
+
+        The first refresh for a root walks the whole tree. Later refreshes only re-list
+        folders whose mtime changed, and skip validation entirely if the index was
+        refreshed less than max_age seconds ago.
+
+        Args:
+            max_age (float): Seconds for which a previous refresh is trusted as is.
+
+        Returns:
+            list: Paths of all folders below the root directory.
+        """
+        with self.lock:
+            if not self._loaded:
+                self._load()
+
+            if self.folders and (
+                self.live or time.time() - self.refreshed_at < max_age
+            ):
+                return self.subfolders
+
+            if self.folders:
+                upserts, deletes = self._refresh_changed()
+            else:
+                upserts, deletes = self._walk_all(), []
+
+            self.refreshed_at = time.time()
+            self._save(upserts, deletes)
+            return self.subfolders
+
+    def apply_changes(self, added: list, removed: list) -> list:
+        """
+        Apply folders reported as created or deleted without re-walking the tree.
+
+        Removed folders are dropped with their whole subtree, and added folders are
+        walked so folders moved in together with their contents are indexed too.
+
+        Args:
+            added (list): Paths of folders that were created or moved into the tree.
+            removed (list): Paths of folders that were deleted or moved out of the tree.
+
+        Returns:
+            list: Paths of all folders that were added to the index, including subfolders.
+        """
+        upserts, deletes = [], []
+        rules = self._rules()
+        with self.lock:
+            if not self._loaded:
+                self._load()
+
+            for path in removed:
+                parent = _parent_of(path)
+                if path in self.children.get(parent, []):
+                    self.children[parent].remove(path)
+                self._remove_subtree(path, deletes)
+
+            for path in added:
+                parent = _parent_of(path)
+                if path in self.folders or parent not in self.folders:
+                    continue
+                if not _kept_folders(rules, parent, [os.path.basename(path)]):
+                    continue
+                mtime = _mtime(path)
+                if mtime is None:
+                    continue
+                self._add(path, parent, mtime, upserts)
+                for root, dirs, files in os.walk(path):
+                    dirs[:], _ = rules.filter(root, dirs, files)
+                    for dir_name in dirs:
+                        child = os.path.join(root, dir_name)
+                        self._add(child, root, _mtime(child) or 0.0, upserts)
+
+            self._save(upserts, deletes)
+        return [row[0] for row in upserts]
+
+    def _connect(self) -> sqlite3.Connection:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.index_path)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS folders ("
+            "root TEXT NOT NULL, path TEXT NOT NULL, parent TEXT, mtime REAL NOT NULL, "
+            "PRIMARY KEY (root, path))"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS roots (root TEXT PRIMARY KEY, refreshed_at REAL NOT NULL)"
+        )
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(roots)")]
+        if "rules" not in columns:
+            connection.execute("ALTER TABLE roots ADD COLUMN rules TEXT")
+        return connection
+
+    def _load(self):
+        """Load the stored index for this root into memory."""
+        connection = self._connect()
+        try:
+            refreshed = connection.execute(
+                "SELECT refreshed_at, rules FROM roots WHERE root = ?", (self.root_dir,)
+            ).fetchone()
+            if refreshed is not None and refreshed[1] != self.rules_key:
+                # Built under other skip rules, so the next refresh walks the tree again.
+                with connection:
+                    connection.execute(
+                        "DELETE FROM folders WHERE root = ?", (self.root_dir,)
+                    )
+                    connection.execute(
+                        "DELETE FROM roots WHERE root = ?", (self.root_dir,)
+                    )
+                refreshed = None
+            rows = connection.execute(
+                "SELECT path, parent, mtime FROM folders WHERE root = ? ORDER BY rowid",
+                (self.root_dir,),
+            ).fetchall()
+        finally:
+            connection.close()
+
+        for path, parent, mtime in rows:
+            self._add(path, parent, mtime, [])
+        self.refreshed_at = refreshed[0] if refreshed else 0.0
+        self._loaded = True
+
+    def _save(self, upserts: list, deletes: list):
+        """Persist changed folders and the refresh time in a single transaction."""
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "DELETE FROM folders WHERE root = ? AND path = ?",
+                    [(self.root_dir, path) for path in deletes],
+                )
+                connection.executemany(
+                    "INSERT INTO folders (root, path, parent, mtime) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (root, path) DO UPDATE SET mtime = excluded.mtime",
+                    [(self.root_dir, *row) for row in upserts],
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO roots (root, refreshed_at, rules) "
+                    "VALUES (?, ?, ?)",
+                    (self.root_dir, self.refreshed_at, self.rules_key),
+                )
+        finally:
+            connection.close()
+
+    def _add(self, path: str, parent, mtime: float, upserts: list):
+        self.folders[path] = mtime
+        self.children.setdefault(path, [])
+        if parent is not None:
+            self.children.setdefault(parent, []).append(path)
+            self.name_index.add(path, os.path.basename(path))
+        upserts.append((path, parent, mtime))
+
+    def _remove_subtree(self, path: str, deletes: list):
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            stack.extend(self.children.pop(current, []))
+            if current in self.folders:
+                del self.folders[current]
+                self.name_index.remove(current)
+                deletes.append(current)
+
+    def _walk_all(self) -> list:
+        """Index the whole tree with the same traversal order as a plain os.walk."""
+        upserts = []
+        root_mtime = _mtime(self.root_dir)
+        if root_mtime is None:
+            return upserts
+        self._add(self.root_dir, None, root_mtime, upserts)
+
+        rules = self._rules()
+        for root, dirs, files in os.walk(self.root_dir):
+            dirs[:], _ = rules.filter(root, dirs, files)
+            for dir_name in dirs:
+                path = os.path.join(root, dir_name)
+                self._add(path, root, _mtime(path) or 0.0, upserts)
+
+        return upserts
+
+    def _refresh_changed(self) -> tuple:
+        """Re-list only the folders whose mtime changed since the last refresh."""
+        upserts, deletes = [], []
+        rules = self._rules()
+        stack = [self.root_dir]
+
+        while stack:
+            folder = stack.pop()
+            mtime = _mtime(folder)
+
+            if mtime is None:
+                parent = _parent_of(folder)
+                if parent in self.children and folder in self.children[parent]:
+                    self.children[parent].remove(folder)
+                self._remove_subtree(folder, deletes)
+                continue
+
+            if mtime != self.folders.get(folder):
+                self.folders[folder] = mtime
+                upserts.append((folder, _parent_of(folder), mtime))
+
+                # Symlinked folders are listed but never descended into, like os.walk.
+                current = (
+                    set()
+                    if os.path.islink(folder)
+                    else set(_list_folders(rules, folder))
+                )
+                known = self.children.get(folder, [])
+                for removed in [child for child in known if child not in current]:
+                    known.remove(removed)
+                    self._remove_subtree(removed, deletes)
+                for added in sorted(current.difference(known)):
+                    # Zero mtime forces the new folder to be listed when popped.
+                    self._add(added, folder, 0.0, upserts)
+
+            stack.extend(reversed(self.children.get(folder, [])))
+
+        return upserts, deletes
+
+
+def _mtime(path: str):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _parent_of(path: str):
+    return os.path.dirname(path)
+
+
+def _list_folders(rules: SkipRules, folder: str) -> list:
+    dirs, files = [], []
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                (dirs if entry.is_dir() else files).append(entry.name)
+    except OSError:
+        return []
+    return [os.path.join(folder, name) for name in rules.filter(folder, dirs, files)[0]]
+
+
+def _kept_folders(rules: SkipRules, folder: str, names: list) -> list:
+    """Return the names of the folders in folder that rules keep."""
+    has_gitignore = os.path.isfile(os.path.join(folder, ".gitignore"))
+    return rules.filter(folder, names, [".gitignore"] if has_gitignore else [])[0]
@@ -0,0 +1,202 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+
+from loguru import logger
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.folder_index import FolderIndex
+
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_ONLYDIR
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        libc.inotify_add_watch.restype = ctypes.c_int
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        libc.inotify_rm_watch.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class FolderWatcher(threading.Thread):
+    """
+    A background thread that keeps a FolderIndex live using inotify.
+
+    Folder creations, renames and deletions under the root directory are applied to
+    the in-memory index as they happen, so lookups never have to walk the tree while
+    the watcher is running. On platforms without inotify the watcher does nothing and
+    lookups fall back to the regular incremental refresh.
+    """
+
+    def __init__(self, root_dir: Path):
+        super().__init__(name="folder-watcher", daemon=True)
+        self.folder_index = FolderIndex.for_root(root_dir)
+        self.libc = _load_libc()
+        self.fd = None
+        self.watches: dict[int, str] = {}
+        self.paths: dict[str, int] = {}
+        self._stop_event = threading.Event()
+
+    @classmethod
+    def is_supported(cls) -> bool:
+        """Return True if inotify is available on this platform."""
+        return _load_libc() is not None
+
+    def stop(self):
+        """Stop watching and let lookups go back to validating the index."""
+        self._stop_event.set()
+
+    def run(self):
+        if self.libc is None:
+            logger.info("inotify is not available, folder watcher is disabled.")
+            return
+
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            logger.warning(
+                f"Could not initialise inotify: {os.strerror(ctypes.get_errno())}"
+            )
+            return
+
+        try:
+            self.folder_index.refresh()
+            if not self._watch_all():
+                return
+            # Catch folders created between the first refresh and the watches.
+            self.folder_index.refresh()
+            if not self._watch_all():
+                return
+            self.folder_index.live = True
+            logger.debug(
+                f"Watching {len(self.watches)} folders under {self.folder_index.root_dir}"
+            )
+
+            while not self._stop_event.is_set():
+                readable, _, _ = select.select([self.fd], [], [], 0.5)
+                if readable:
+                    self._handle_events(self._read_events())
+        except Exception as e:
+            logger.error(f"Folder watcher stopped: {e}")
+        finally:
+            self.folder_index.live = False
+            os.close(self.fd)
+
+    def _add_watch(self, path: str) -> bool:
+        if path in self.paths:
+            return True
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                logger.warning(
+                    "inotify watch limit reached, raise fs.inotify.max_user_watches "
+                    "to keep the folder index live."
+                )
+                return False
+            # The folder disappeared or is unreadable; the next event covers it.
+            return True
+        self.watches[wd] = path
+        self.paths[path] = wd
+        return True
+
+    def _remove_watches(self, path: str):
+        prefix = path + os.sep
+        for watched in [p for p in self.paths if p == path or p.startswith(prefix)]:
+            wd = self.paths.pop(watched)
+            self.watches.pop(wd, None)
+            self.libc.inotify_rm_watch(self.fd, wd)
+
+    def _watch_all(self) -> bool:
+        for folder in [self.folder_index.root_dir, *self.folder_index.subfolders]:
+            if not self._add_watch(folder):
+                self.stop()
+                return False
+        return True
+
+    def _read_events(self) -> list:
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = buffer[offset : offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def _handle_events(self, events: list):
+        added, removed = [], []
+
+        for wd, mask, name in events:
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("inotify queue overflowed, re-validating folder index.")
+                self.folder_index.live = False
+                self.folder_index.refresh()
+                if self._watch_all():
+                    self.folder_index.live = True
+                return
+
+            if mask & IN_IGNORED:
+                path = self.watches.pop(wd, None)
+                if path is not None:
+                    self.paths.pop(path, None)
+                continue
+
+            parent = self.watches.get(wd)
+            # apply_changes skips the folders the index's rules leave out.
+            if parent is None or not mask & IN_ISDIR:
+                continue
+
+            path = os.path.join(parent, name)
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                added.append(path)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                removed.append(path)
+                if path in added:
+                    added.remove(path)
+                self._remove_watches(path)
+
+        if added or removed:
+            for path in self.folder_index.apply_changes(added, removed):
+                if not self._add_watch(path):
+                    self.folder_index.live = False
+                    self.stop()
+                    return
@@ -0,0 +1,154 @@
+import re
+import unicodedata
+from collections import Counter
+
+_CAMEL_CASE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize text for fuzzy comparison.
+
+    Accents are folded, camelCase is split, everything is lowercased and any run of
+    punctuation, underscores or whitespace becomes a single space.
+
+    Args:
+        text (str): The text to normalize.
+
+    Returns:
+        str: The normalized text, e.g. "Café-BookList_v2" -> "cafe book list v2".
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = _CAMEL_CASE.sub(" ", text).lower()
+    return _NON_ALPHANUMERIC.sub(" ", text).strip()
+
+
+def tokenize(text: str) -> list:
+    """Split text into normalized tokens."""
+    return normalize(text).split()
+
+
+def trigrams(text: str) -> set:
+    """
+    Return the set of character trigrams of every token in the text.
+
+    Tokens are padded so short words and word boundaries still produce trigrams.
+    """
+    grams = set()
+    for token in tokenize(text):
+        padded = f"  {token} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def levenshtein(first: str, second: str) -> int:
+    """Return the edit distance between two strings."""
+    if len(first) < len(second):
+        first, second = second, first
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, start=1):
+        current = [i]
+        for j, second_char in enumerate(second, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (first_char != second_char),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def similarity(first: str, second: str) -> float:
+    """Return 1 minus the normalized edit distance of two normalized strings."""
+    first, second = normalize(first), normalize(second)
+    longest = max(len(first), len(second))
+    if longest == 0:
+        return 0.0
+    return 1.0 - levenshtein(first, second) / longest
+
+
+def token_overlap(query_tokens: list, tokens: list) -> float:
+    """
+    Return the fraction of query tokens found in tokens.
+
+    A query token that is a prefix of a token counts as half a match.
+    """
+    if not query_tokens:
+        return 0.0
+    matched = 0.0
+    for query_token in query_tokens:
+        if query_token in tokens:
+            matched += 1.0
+        elif any(token.startswith(query_token) for token in tokens):
+            matched += 0.5
+    return matched / len(query_tokens)
+
+
+class TrigramIndex:
+    """
+    An inverted index from trigrams and tokens to keys.
+
+    It only produces candidates; callers rank them with whatever score fits their data.
+    Adding and removing keys is incremental, so the index can follow a changing source.
+    """
+
+    def __init__(self):
+        self.texts: dict = {}
+        self.postings: dict[str, set] = {}
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def add(self, key, text: str):
+        """Index text under key, replacing any text previously stored for it."""
+        if key in self.texts:
+            self.remove(key)
+        self.texts[key] = text
+        for gram in self._grams(text):
+            self.postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key):
+        """Remove key from the index if present."""
+        text = self.texts.pop(key, None)
+        if text is None:
+            return
+        for gram in self._grams(text):
+            keys = self.postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.postings[gram]
+
+    def candidates(
+        self, query: str, limit: int = 200, min_overlap: float = 0.3
+    ) -> list:
+        """
+        Return keys whose text shares enough trigrams or tokens with the query.
+
+        Only the posting lists of the query's own trigrams are touched, so the cost
+        depends on how common the query's trigrams are rather than on the index size.
+
+        Args:
+            query (str): The text to look up.
+            limit (int): Maximum number of candidates, most overlapping first.
+            min_overlap (float): Minimum fraction of query grams a candidate must share.
+
+        Returns:
+            list: Candidate keys ordered by the number of shared grams.
+        """
+        grams = self._grams(query)
+        if not grams:
+            return []
+        counts = Counter()
+        for gram in grams:
+            counts.update(self.postings.get(gram, ()))
+        threshold = max(1, int(len(grams) * min_overlap))
+        return [key for key, count in counts.most_common(limit) if count >= threshold]
+
+    @staticmethod
+    def _grams(text: str) -> set:
+        return trigrams(text) | {f"#{token}" for token in tokenize(text)}
@@ -0,0 +1,254 @@
+import atexit
+import copy
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from loguru import logger
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.json_store import JsonStore, replace_file
+
+# Log size past which the log is folded back into the JSON file in the background.
+COMPACT_LOG_BYTES = 256_000
+
+
+def apply_op(data: Any, op: dict) -> Any:
+    """
+    Apply one logged operation to a JSON document.
+
+    Only the containers on the operation's path are copied, so the previous document
+    is left intact for readers still holding it, at a cost proportional to the path
+    rather than to the whole document.
+
+    Args:
+        data (Any): The document.
+        op (dict): The operation. "path" lists the keys of the container to change, and
+            "op" is one of "append" (a "value" to a list), "extend" (a list with
+            "values"), "pop" (the item at "index" from a list), "set" (a "key" of a dict,
+            or an index of a list, to a "value") or "delete" (a "key").
+
+    Returns:
+        Any: The new document.
+    """
+    kind = op["op"]
+    path = op.get("path", [])
+    root = node = copy.copy(data) if data is not None else {}
+    for depth, key in enumerate(path):
+        if isinstance(node, list) or key in node:
+            child = copy.copy(node[key])
+        else:
+            is_list = depth == len(path) - 1 and kind in ("append", "extend", "pop")
+            child = [] if is_list else {}
+        node[key] = child
+        node = child
+
+    if kind == "append":
+        node.append(op["value"])
+    elif kind == "extend":
+        node.extend(op["values"])
+    elif kind == "pop":
+        node.pop(op["index"])
+    elif kind == "set":
+        node[op["key"]] = op["value"]
+    elif kind == "delete":
+        node.pop(op["key"], None)
+    else:
+        raise ValueError(f"Unknown operation: {kind}")
+    return root
+
+
+class JsonLogStore(JsonStore):
+    """
+    A JSON data file whose changes are appended to an operation log.
+
+    Writes append one JSON line to a .log file next to the JSON file instead of
+    rewriting it, so they cost O(record) however long the history grows. Reads replay
+    the log on top of the JSON file, and only parse log lines they have not seen yet.
+
+    The log is folded back into the JSON file when it passes compact_bytes, on a
+    background thread, and when the process exits. A log left behind by a process that
+    did not exit cleanly is folded in when the next process first reads the store. So
+    the JSON file stays the source of truth between runs, and only lags behind the log
+    while a process that wrote to it is running. The log starts with the hash of the
+    JSON file it applies to, so a crash between rewriting the JSON file and starting a
+    new log never replays an operation twice, and a log left over from before a hand
+    edit of the JSON file is ignored.
+    """
+
+    _stores: dict[str, "JsonLogStore"] = {}
+
+    def __init__(
+        self,
+        path: Path,
+        default: Any = None,
+        indent: Optional[int] = None,
+        compact_bytes: int = COMPACT_LOG_BYTES,
+    ):
+        super().__init__(path, default, indent)
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.compact_bytes = compact_bytes
+        self._base = None
+        self._log_id = None
+        self._log_offset = 0
+        self._log_valid = False
+        self._log_pending = False
+        self._opened = False
+        self._compacting = False
+        atexit.register(self.close)
+
+    def _log_identity(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def _load(self) -> Any:
+        """Return the JSON file with the log replayed on top, parsing only what changed."""
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stamp = ()
+        log_id = self._log_identity()
+
+        if stamp != self._stamp or log_id != self._log_id:
+            if stamp:
+                raw = self.path.read_bytes()
+                self._data = json.loads(raw)
+            else:
+                raw = b""
+                self._data = copy.deepcopy(self.default)
+            self._base = hashlib.sha256(raw).hexdigest()
+            self._stamp, self._log_id = stamp, log_id
+            self._log_offset, self._log_valid = 0, False
+            self._log_pending = False
+
+        if log_id is not None:
+            self._replay()
+        if not self._opened:
+            self._opened = True
+            if self._log_pending:
+                self._compact_quietly()
+        return self._data
+
+    def version(self) -> Any:
+        """Return a value that changes whenever the JSON file or the log changes."""
+        with self.lock:
+            self._load()
+            return self._stamp, self._log_id, self._log_offset
+
+    def _replay(self):
+        """Apply the complete log lines written since the last replay."""
+        with open(self.log_path, "rb") as log:
+            log.seek(self._log_offset)
+            chunk = log.read()
+        end = chunk.rfind(b"\n") + 1
+        if not end:
+            return
+
+        data = self._data
+        for line in chunk[:end].splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable line in {self.log_path}")
+                continue
+            if "base" in entry:
+                self._log_valid = entry["base"] == self._base
+            elif self._log_valid:
+                for op in entry["ops"]:
+                    data = apply_op(data, op)
+                self._log_pending = True
+        self._data = data
+        self._log_offset += end
+
+    def apply(self, ops: list) -> Any:
+        """
+        Apply operations and append them to the log as a single entry.
+
+        Args:
+            ops (list): Operations as accepted by apply_op. They are applied together:
+                a crash either records all of them or none.
+
+        Returns:
+            Any: The document after the operations.
+        """
+        with self.locked():
+            data = self._load()
+            for op in ops:
+                data = apply_op(data, op)
+
+            if self._log_id is None or not self._log_valid:
+                self._start_log()
+            elif os.path.getsize(self.log_path) > self._log_offset:
+                # Drop a torn last line left by a writer that crashed mid-append.
+                os.truncate(self.log_path, self._log_offset)
+
+            line = (json.dumps({"ops": ops}) + "\n").encode()
+            with open(self.log_path, "ab") as log:
+                log.write(line)
+                log.flush()
+                os.fsync(log.fileno())
+            self._log_offset += len(line)
+            self._log_pending = True
+            self._data = data
+            needs_compaction = self._log_offset > self.compact_bytes
+
+        if needs_compaction:
+            self.compact_in_background()
+        return data
+
+    def compact(self):
+        """Fold the log into the JSON file and start a new, empty log."""
+        with self.locked():
+            self._write(self._load())
+
+    def close(self):
+        """Fold the log into the JSON file if it holds changes. Runs at exit."""
+        with self.lock:
+            if self._log_pending and self._log_identity() == self._log_id:
+                self._compact_quietly()
+
+    def _compact_quietly(self):
+        try:
+            self.compact()
+        except Exception as e:
+            logger.error(f"Compacting {self.path} failed: {e}")
+
+    def compact_in_background(self):
+        """Start compact on a daemon thread unless a compaction is already running."""
+        with self.lock:
+            if self._compacting:
+                return
+            self._compacting = True
+
+        def run():
+            try:
+                self._compact_quietly()
+            finally:
+                self._compacting = False
+
+        threading.Thread(target=run, name="json-log-compaction", daemon=True).start()
+
+    def _write(self, data: Any):
+        text = json.dumps(data, indent=self.indent)
+        replace_file(self.path, text)
+        stat = os.stat(self.path)
+        self._data, self._stamp = data, (stat.st_mtime_ns, stat.st_size)
+        self._base = hashlib.sha256(text.encode()).hexdigest()
+        self._start_log()
+
+    def _start_log(self):
+        """Replace the log with an empty one that applies to the current JSON file."""
+        header = json.dumps({"base": self._base}) + "\n"
+        replace_file(self.log_path, header)
+        self._log_id = self._log_identity()
+        self._log_offset = len(header.encode())
+        self._log_valid = True
+        self._log_pending = False
@@ -0,0 +1,153 @@
+import copy
+import fcntl
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+
+class JsonStore:
+    """
+    A JSON data file that several agents can read and update safely.
+
+    Updates hold an exclusive fcntl lock on a sidecar .lock file for the whole
+    read-modify-write, so concurrent agents and processes never lose each other's
+    changes. The new content is written to a temporary file in the same folder and
+    swapped in with os.replace, so a crash mid-write leaves the previous version in
+    place and readers never see a truncated file. Reads are served from memory for as
+    long as the file's mtime and size are unchanged.
+    """
+
+    _stores: dict[str, "JsonStore"] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, path: Path, default: Any = None, indent: Optional[int] = None):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.default = default
+        self.indent = indent
+        self.lock = threading.RLock()
+        self._file_locked = False
+        self._data = None
+        self._stamp = None
+
+    @classmethod
+    def for_path(
+        cls, path: Path, default: Any = None, indent: Optional[int] = None
+    ) -> "JsonStore":
+        """Return the store shared by everything in this process that uses path."""
+        key = os.path.abspath(path)
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None:
+                store = cls._stores[key] = cls(path, default, indent)
+            return store
+
+    def _load(self) -> Any:
+        """Return the file content, re-parsing it only if its mtime or size changed."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._data, self._stamp = None, None
+            return copy.deepcopy(self.default)
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp:
+            with open(self.path) as file:
+                self._data = json.load(file)
+            self._stamp = stamp
+        return self._data
+
+    def read(self) -> Any:
+        """
+        Read the file.
+
+        Returns:
+            Any: The parsed content, or the default if the file does not exist. The
+                result is shared with other readers and must not be modified; use
+                update to change the file.
+        """
+        with self.lock:
+            return self._load()
+
+    def version(self) -> Any:
+        """Return a value that changes whenever the content does, for derived caches."""
+        with self.lock:
+            self._load()
+            return self._stamp
+
+    @contextmanager
+    def update(self) -> Iterator[Any]:
+        """
+        Lock the file and yield its content for modification.
+
+        The modified content is written back atomically when the block exits, unless it
+        is unchanged or the block raised.
+
+        Yields:
+            Any: A private copy of the content that can be modified in place.
+        """
+        with self.locked():
+            current = self._load()
+            data = copy.deepcopy(current)
+            yield data
+            if data != current:
+                self._write(data)
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold the store's thread lock and its exclusive file lock. Re-entrant."""
+        with self.lock:
+            if self._file_locked:
+                yield
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._file_locked = True
+                try:
+                    yield
+                finally:
+                    self._file_locked = False
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write(self, data: Any):
+        replace_file(self.path, json.dumps(data, indent=self.indent))
+        stat = os.stat(self.path)
+        self._data, self._stamp = data, (stat.st_mtime_ns, stat.st_size)
+
+
+def replace_file(path: Path, text: Union[str, bytes]):
+    """
+    Replace a file's content atomically.
+
+    The text is written and fsync-ed to a temporary file in the same folder, which is
+    then renamed over path, so readers see either the old or the new content.
+
+    Args:
+        path (Path): The file to replace.
+        text (Union[str, bytes]): The new content, written in binary mode if bytes.
+    """
+    path = Path(path)
+    descriptor, temp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        try:
+            os.chmod(temp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(temp_path, 0o644)
+        with os.fdopen(descriptor, "wb" if isinstance(text, bytes) else "w") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
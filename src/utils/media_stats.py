@@ -0,0 +1,188 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.json_store import JsonStore
+
+STATS_VERSION = 1
+
+
+def _group_names(value) -> list:
+    """Split a field like "Fantasy, Adventure" into the groups it counts towards."""
+    if not value:
+        return []
+    return [name.strip() for name in str(value).split(",") if name.strip()]
+
+
+def _bump(counts: dict, key: str, sign: int):
+    counts[key] = counts.get(key, 0) + sign
+    if not counts[key]:
+        del counts[key]
+
+
+class MediaStats:
+    """
+    Aggregate stats of a media store, kept next to it and updated on every change.
+
+    Counts per status, rating totals of finished records (read books, watched movies),
+    the same per group field value (genre, author, director) and a monthly histogram
+    of added and finished records. Each add or move only applies the difference of the
+    records it touched. If the stats file is missing or its total no longer matches
+    the store, e.g. after a hand edit, it is rebuilt from the store in one pass.
+    """
+
+    def __init__(
+        self, path: Path, statuses: tuple, group_fields: tuple, date_fields: dict
+    ):
+        self.store = JsonStore.for_path(path, default={})
+        self.statuses = statuses
+        self.finished_status = statuses[-1]
+        self.group_fields = group_fields
+        self.date_fields = date_fields
+
+    def _empty(self) -> dict:
+        return {
+            "version": STATS_VERSION,
+            "total": 0,
+            "statuses": {},
+            "rated": 0,
+            "rating_sum": 0.0,
+            "groups": {field: {} for field in self.group_fields},
+            "monthly": {},
+        }
+
+    def _apply(self, stats: dict, status: str, record: dict, sign: int):
+        """Add (sign 1) or remove (sign -1) one record's contribution to stats."""
+        stats["total"] += sign
+        _bump(stats["statuses"], status, sign)
+
+        rating = record.get("rating")
+        rated = status == self.finished_status and isinstance(rating, (int, float))
+        if rated:
+            stats["rated"] += sign
+            stats["rating_sum"] += sign * rating
+
+        for field in self.group_fields:
+            groups = stats["groups"].setdefault(field, {})
+            for name in _group_names(record.get(field)):
+                group = groups.setdefault(
+                    name, {"statuses": {}, "rated": 0, "rating_sum": 0.0}
+                )
+                _bump(group["statuses"], status, sign)
+                if rated:
+                    group["rated"] += sign
+                    group["rating_sum"] += sign * rating
+                if not group["statuses"]:
+                    del groups[name]
+
+        added = record.get("added_date")
+        if added:
+            month = stats["monthly"].setdefault(str(added)[:7], {})
+            _bump(month, "added", sign)
+        finished = record.get(self.date_fields[self.finished_status])
+        if status == self.finished_status and finished:
+            month = stats["monthly"].setdefault(str(finished)[:7], {})
+            _bump(month, "finished", sign)
+        stats["monthly"] = {
+            key: value for key, value in stats["monthly"].items() if value
+        }
+
+    def _build(self, data: dict) -> dict:
+        stats = self._empty()
+        for status in self.statuses:
+            for record in data.get(status, []):
+                self._apply(stats, status, record, 1)
+        return stats
+
+    def record_changes(self, media_store, changes: list):
+        """
+        Apply the changes a media store just made.
+
+        Args:
+            media_store (MediaStore): The store that changed, used to check the stats
+                are in sync and to rebuild them if not.
+            changes (list): (status, record, sign) tuples; sign is 1 for a record that
+                now has the status and -1 for one that no longer has it.
+        """
+        with self.store.update() as stats:
+            delta = sum(sign for _, _, sign in changes)
+            in_sync = (
+                stats.get("version") == STATS_VERSION
+                and stats["total"] + delta == media_store.count()
+            )
+            if in_sync:
+                for status, record, sign in changes:
+                    self._apply(stats, status, record, sign)
+            else:
+                stats.clear()
+                stats.update(self._build(media_store.load()))
+
+    def read(self, media_store) -> dict:
+        """
+        Return the stats, rebuilding them first if they are out of sync with the store.
+
+        Args:
+            media_store (MediaStore): The store the stats describe.
+
+        Returns:
+            dict: The stats.
+        """
+        stats = self.store.read()
+        if (
+            stats.get("version") == STATS_VERSION
+            and stats["total"] == media_store.count()
+        ):
+            return stats
+        with self.store.update() as stats:
+            stats.clear()
+            stats.update(self._build(media_store.load()))
+        return self.store.read()
+
+
+def _mean(rated: int, rating_sum: float) -> str:
+    return f"{rating_sum / rated:.1f}/10 over {rated} rated" if rated else "no ratings"
+
+
+def format_stats(stats: dict, top: int = 10, months: int = 12) -> str:
+    """
+    Render stats compactly for an agent.
+
+    Args:
+        stats (dict): Stats from MediaStats.read.
+        top (int): Number of entries to list per group field.
+        months (int): Number of most recent months in the histogram.
+
+    Returns:
+        str: Totals, the top entries per group field and the monthly histogram.
+    """
+    statuses = ", ".join(
+        f"{status}: {count}" for status, count in stats["statuses"].items()
+    )
+    lines = [
+        f"Total: {stats['total']} ({statuses}), mean rating {_mean(stats['rated'], stats['rating_sum'])}"
+    ]
+
+    for field, groups in stats["groups"].items():
+        ranked = sorted(
+            groups.items(),
+            key=lambda item: (
+                -sum(item[1]["statuses"].values()),
+                -(item[1]["rating_sum"] / item[1]["rated"] if item[1]["rated"] else 0),
+            ),
+        )
+        lines.append(f"By {field} (top {min(top, len(ranked))} of {len(ranked)}):")
+        for name, group in ranked[:top]:
+            counts = ", ".join(
+                f"{status} {count}" for status, count in group["statuses"].items()
+            )
+            lines.append(
+                f"  {name}: {counts}; mean {_mean(group['rated'], group['rating_sum'])}"
+            )
+
+    lines.append(f"Monthly added / finished (last {months} months with activity):")
+    for month in sorted(stats["monthly"])[-months:]:
+        counts = stats["monthly"][month]
+        lines.append(
+            f"  {month}: added {counts.get('added', 0)}, finished {counts.get('finished', 0)}"
+        )
+    return "\n".join(lines)
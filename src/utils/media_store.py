@@ -0,0 +1,686 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.config_loader import load_config
+from utils.fuzzy_matching import normalize
+from utils.json_log_store import JsonLogStore
+from utils.media_stats import MediaStats
+from utils.similarity_index import SimilarityIndex
+from utils.title_index import TitleIndex
+
+BOOK_STATUSES = ("to_read", "read")
+BOOK_KEY_FIELDS = ("title", "author")
+BOOK_DATE_FIELDS = {"to_read": "added_date", "read": "read_date"}
+BOOK_GROUP_FIELDS = ("genre", "author")
+BOOK_TEXT_FIELDS = {"title": 2.0, "author": 1.5, "genre": 2.0, "notes": 1.0}
+MOVIE_STATUSES = ("to_watch", "watched")
+MOVIE_KEY_FIELDS = ("title",)
+MOVIE_DATE_FIELDS = {"to_watch": "added_date", "watched": "watched_date"}
+MOVIE_GROUP_FIELDS = ("genre", "director")
+MOVIE_TEXT_FIELDS = {"title": 2.0, "director": 1.5, "genre": 2.0, "notes": 1.0}
+
+
+class QueryFilter(NamedTuple):
+    """Which records a MediaStore query returns. Unset fields do not filter."""
+
+    status: Optional[str] = None
+    genre: Optional[str] = None
+    min_rating: Optional[float] = None
+    max_rating: Optional[float] = None
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+
+
+class QueryPage(NamedTuple):
+    """One page of query results."""
+
+    records: list
+    total: int
+    next_cursor: Optional[str]
+
+
+def _offset_from_cursor(cursor: Optional[str]) -> int:
+    try:
+        return max(int(cursor), 0) if cursor else 0
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def _next_cursor(offset: int, limit: int, total: int) -> Optional[str]:
+    return str(offset + limit) if offset + limit < total else None
+
+
+def format_query_page(page: QueryPage, fields: list) -> str:
+    """
+    Render a query page compactly, one JSON object per line.
+
+    Args:
+        page (QueryPage): The page to render.
+        fields (list): The record fields to include, in order. "status" and "date"
+            refer to the record's status and the date it reached that status.
+
+    Returns:
+        str: A summary line followed by one line per record.
+    """
+    shown = len(page.records)
+    header = f"{shown} of {page.total} matching records"
+    if page.next_cursor is not None:
+        header += f" (next_cursor: {page.next_cursor})"
+    lines = [header]
+    for record in page.records:
+        projected = {
+            field: record[field] for field in fields if record.get(field) is not None
+        }
+        lines.append(json.dumps(projected, ensure_ascii=False, separators=(",", ":")))
+    return "\n".join(lines)
+
+
+class MediaStore(ABC):
+    """
+    Storage for a list of media records (books, movies and shows) split by status.
+
+    Records are plain dicts. They are identified by their key fields (title, and author
+    for books), compared after normalization so case, accents and punctuation do not
+    matter.
+    """
+
+    def __init__(self, statuses: tuple, key_fields: tuple, date_fields: dict):
+        self.statuses = statuses
+        self.key_fields = key_fields
+        self.date_fields = date_fields
+        self.stats: Optional[MediaStats] = None
+        self.similarity: Optional[SimilarityIndex] = None
+        self.title_index: Optional[TitleIndex] = None
+
+    def record_key(self, values: dict) -> tuple:
+        """Return the normalized key of a record or of a dict of key field values."""
+        return tuple(
+            normalize(str(values.get(field) or "")) for field in self.key_fields
+        )
+
+    @abstractmethod
+    def load(self) -> dict:
+        """
+        Return every record.
+
+        Returns:
+            dict: Status to the list of records with that status, oldest first.
+        """
+
+    @abstractmethod
+    def find(self, status: str, key: dict) -> Optional[dict]:
+        """
+        Find a record by its key fields.
+
+        Args:
+            status (str): The status to look in, e.g. "to_read".
+            key (dict): Values of the key fields, e.g. {"title": ..., "author": ...}.
+
+        Returns:
+            Optional[dict]: The record, or None if there is none with that key.
+        """
+
+    def count(self) -> int:
+        """Return the number of records across all statuses."""
+        return sum(len(records) for records in self.load().values())
+
+    def add(self, status: str, record: dict) -> bool:
+        """
+        Add a record unless one with the same key already has that status.
+
+        Args:
+            status (str): The status to add the record under.
+            record (dict): The record to add.
+
+        Returns:
+            bool: True if the record was added, False if it already existed.
+        """
+        added = self._add(status, record)
+        if added:
+            self._notify([(status, record, 1)])
+        return added
+
+    def move(
+        self, key: dict, from_status: str, to_status: str, updates: dict
+    ) -> Optional[dict]:
+        """
+        Move a record to another status, e.g. from "to_read" to "read".
+
+        Args:
+            key (dict): Values of the key fields of the record.
+            from_status (str): The status the record has now.
+            to_status (str): The status to move it to.
+            updates (dict): Fields to set on the record while moving it.
+
+        Returns:
+            Optional[dict]: The moved record, or None if no record matched.
+        """
+        moved = self._move(key, from_status, to_status, updates)
+        if moved is None:
+            return None
+        previous, record = moved
+        self._notify([(from_status, previous, -1), (to_status, record, 1)])
+        return record
+
+    def _notify(self, changes: list):
+        """Pass (status, record, sign) changes on to the derived stats and indexes."""
+        for derived in (self.stats, self.similarity, self.title_index):
+            if derived is not None:
+                derived.record_changes(self, changes)
+
+    @abstractmethod
+    def _add(self, status: str, record: dict) -> bool:
+        """Add a record, returning False if its key already has that status."""
+
+    @abstractmethod
+    def _move(
+        self, key: dict, from_status: str, to_status: str, updates: dict
+    ) -> Optional[tuple]:
+        """Move a record, returning (record before, record after) or None."""
+
+    def query(
+        self,
+        query_filter: QueryFilter,
+        sort_by: str = "date",
+        descending: bool = True,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> QueryPage:
+        """
+        Return one page of the records matching a filter.
+
+        Args:
+            query_filter (QueryFilter): Which records to return. Genre matches as a
+                case-insensitive substring; the date window applies to the date the
+                record reached its status (e.g. read_date for read books).
+            sort_by (str): A record field, or "date" for the status date. Records
+                without the field come last.
+            descending (bool): Sort from highest to lowest.
+            limit (int): Maximum number of records on the page.
+            cursor (Optional[str]): The next_cursor of the previous page.
+
+        Returns:
+            QueryPage: The records, each with its "status" and "date" added, the number
+                of matching records and the cursor of the next page.
+        """
+        offset = _offset_from_cursor(cursor)
+        rows = [
+            {**record, "status": status, "date": record.get(self.date_fields[status])}
+            for status, records in self.load().items()
+            if status in self.statuses
+            for record in records
+        ]
+        rows = [row for row in rows if self._matches(row, query_filter)]
+
+        present = [row for row in rows if row.get(sort_by) is not None]
+        missing = [row for row in rows if row.get(sort_by) is None]
+        present.sort(key=lambda row: _sort_value(row[sort_by]), reverse=descending)
+        rows = present + missing
+
+        return QueryPage(
+            records=rows[offset : offset + limit],
+            total=len(rows),
+            next_cursor=_next_cursor(offset, limit, len(rows)),
+        )
+
+    @staticmethod
+    def _matches(row: dict, query_filter: QueryFilter) -> bool:
+        if query_filter.status and row["status"] != query_filter.status:
+            return False
+        if (
+            query_filter.genre
+            and query_filter.genre.lower() not in str(row.get("genre") or "").lower()
+        ):
+            return False
+        rating = row.get("rating")
+        if query_filter.min_rating is not None and (
+            rating is None or rating < query_filter.min_rating
+        ):
+            return False
+        if query_filter.max_rating is not None and (
+            rating is None or rating > query_filter.max_rating
+        ):
+            return False
+        date = row.get("date")
+        if query_filter.date_from and (not date or date < query_filter.date_from):
+            return False
+        if query_filter.date_to and (not date or date > query_filter.date_to):
+            return False
+        return True
+
+
+def _sort_value(value):
+    return value.lower() if isinstance(value, str) else value
+
+
+class JsonMediaStore(MediaStore):
+    """
+    A media store kept in a JSON file. Changes are appended to the file's operation
+    log rather than rewriting it, see JsonLogStore.
+    """
+
+    def __init__(
+        self, path: Path, statuses: tuple, key_fields: tuple, date_fields: dict
+    ):
+        super().__init__(statuses, key_fields, date_fields)
+        self.path = Path(path)
+        self.store = JsonLogStore.for_path(self.path, default={}, indent=2)
+
+    def load(self) -> dict:
+        data = dict(self.store.read())
+        for status in self.statuses:
+            data.setdefault(status, [])
+        return data
+
+    def _index_of(self, status: str, key: dict) -> Optional[int]:
+        wanted = self.record_key(key)
+        return next(
+            (
+                index
+                for index, record in enumerate(self.load()[status])
+                if self.record_key(record) == wanted
+            ),
+            None,
+        )
+
+    def find(self, status: str, key: dict) -> Optional[dict]:
+        index = self._index_of(status, key)
+        return None if index is None else self.load()[status][index]
+
+    def _add(self, status: str, record: dict) -> bool:
+        with self.store.locked():
+            if self._index_of(status, record) is not None:
+                return False
+            self.store.apply([{"op": "append", "path": [status], "value": record}])
+        return True
+
+    def _move(
+        self, key: dict, from_status: str, to_status: str, updates: dict
+    ) -> Optional[tuple]:
+        with self.store.locked():
+            index = self._index_of(from_status, key)
+            if index is None:
+                return None
+            previous = self.load()[from_status][index]
+            record = {**previous, **updates}
+            self.store.apply(
+                [
+                    {"op": "pop", "path": [from_status], "index": index},
+                    {"op": "append", "path": [to_status], "value": record},
+                ]
+            )
+        return previous, record
+
+
+class SqliteMediaStore(MediaStore):
+    """
+    A media store in SQLite, indexed on status and normalized key fields.
+
+    Lookups, adds and moves touch only the affected rows instead of reading and
+    rewriting the whole list. The first time a database is opened it imports the
+    records of the JSON file it replaces, once; the JSON file is left untouched and
+    later changes to it are not picked up. A status holds each key at most once, which
+    the database enforces, so concurrent writers in other threads or processes cannot
+    add duplicates.
+    """
+
+    _stores: dict[str, "SqliteMediaStore"] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(
+        self,
+        path: Path,
+        statuses: tuple,
+        key_fields: tuple,
+        date_fields: dict,
+        migrate_from: Optional[Path] = None,
+    ):
+        super().__init__(statuses, key_fields, date_fields)
+        self.path = Path(path)
+        self.migrate_from = Path(migrate_from) if migrate_from else None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_path(
+        cls,
+        path: Path,
+        statuses: tuple,
+        key_fields: tuple,
+        date_fields: dict,
+        migrate_from: Optional[Path] = None,
+    ) -> "SqliteMediaStore":
+        """Return the store shared by everything in this process that uses path."""
+        key = os.path.abspath(path)
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None:
+                store = cls._stores[key] = cls(
+                    path, statuses, key_fields, date_fields, migrate_from
+                )
+            return store
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Transactions are managed explicitly, so BEGIN IMMEDIATE can take the write
+        # lock before reading what a write depends on.
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, status TEXT NOT NULL,
+                record_key TEXT NOT NULL, data TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """
+        )
+        unique = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'records_status_key_unique'"
+        ).fetchone()
+        if unique is None:
+            with _immediate(connection):
+                # Databases from before the unique index may hold duplicates; keep the
+                # oldest row of each.
+                connection.execute(
+                    "DELETE FROM records WHERE id NOT IN "
+                    "(SELECT MIN(id) FROM records GROUP BY status, record_key)"
+                )
+                connection.execute("DROP INDEX IF EXISTS records_status_key")
+                connection.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS records_status_key_unique "
+                    "ON records (status, record_key)"
+                )
+        if not self._migrated(connection):
+            self._migrate(connection)
+        return connection
+
+    @staticmethod
+    def _migrated(connection: sqlite3.Connection) -> bool:
+        migrated = connection.execute(
+            "SELECT value FROM meta WHERE key = 'migrated_from'"
+        ).fetchone()
+        return migrated is not None
+
+    def _migrate(self, connection: sqlite3.Connection):
+        """Import the JSON file this store replaces, in one transaction."""
+        records = []
+        if self.migrate_from and self.migrate_from.exists():
+            data = JsonLogStore.for_path(self.migrate_from, default={}, indent=2).read()
+            records = [
+                (status, self._key_column(record), json.dumps(record))
+                for status in self.statuses
+                for record in data.get(status, [])
+            ]
+        with _immediate(connection):
+            # Another process may have migrated while this one waited for the lock.
+            if self._migrated(connection):
+                return
+            connection.executemany(
+                "INSERT OR IGNORE INTO records (status, record_key, data) "
+                "VALUES (?, ?, ?)",
+                records,
+            )
+            connection.execute(
+                "INSERT INTO meta (key, value) VALUES ('migrated_from', ?)",
+                (str(self.migrate_from or ""),),
+            )
+
+    def _key_column(self, values: dict) -> str:
+        return "\x1f".join(self.record_key(values))
+
+    def load(self) -> dict:
+        data = {status: [] for status in self.statuses}
+        with self.lock:
+            connection = self._connect()
+            try:
+                for status, record in connection.execute(
+                    "SELECT status, data FROM records ORDER BY id"
+                ):
+                    data.setdefault(status, []).append(json.loads(record))
+            finally:
+                connection.close()
+        return data
+
+    def find(self, status: str, key: dict) -> Optional[dict]:
+        with self.lock:
+            connection = self._connect()
+            try:
+                row = connection.execute(
+                    "SELECT data FROM records WHERE status = ? AND record_key = ?",
+                    (status, self._key_column(key)),
+                ).fetchone()
+            finally:
+                connection.close()
+        return json.loads(row[0]) if row else None
+
+    def count(self) -> int:
+        with self.lock:
+            connection = self._connect()
+            try:
+                return connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+            finally:
+                connection.close()
+
+    def _add(self, status: str, record: dict) -> bool:
+        key = self._key_column(record)
+        with self.lock:
+            connection = self._connect()
+            try:
+                with _immediate(connection):
+                    cursor = connection.execute(
+                        "INSERT OR IGNORE INTO records (status, record_key, data) "
+                        "VALUES (?, ?, ?)",
+                        (status, key, json.dumps(record)),
+                    )
+                return cursor.rowcount == 1
+            finally:
+                connection.close()
+
+    def _move(
+        self, key: dict, from_status: str, to_status: str, updates: dict
+    ) -> Optional[tuple]:
+        with self.lock:
+            connection = self._connect()
+            try:
+                with _immediate(connection):
+                    row = connection.execute(
+                        "SELECT id, record_key, data FROM records "
+                        "WHERE status = ? AND record_key = ? ORDER BY id LIMIT 1",
+                        (from_status, self._key_column(key)),
+                    ).fetchone()
+                    if row is None:
+                        return None
+                    record_id, record_key, data = row
+                    previous = json.loads(data)
+                    record = {**previous, **updates}
+                    connection.execute("DELETE FROM records WHERE id = ?", (record_id,))
+                    # A key already under to_status (e.g. a book read again) is
+                    # replaced by the moved record rather than duplicated.
+                    connection.execute(
+                        "INSERT OR REPLACE INTO records (status, record_key, data) "
+                        "VALUES (?, ?, ?)",
+                        (to_status, record_key, json.dumps(record)),
+                    )
+                return previous, record
+            finally:
+                connection.close()
+
+    def query(
+        self,
+        query_filter: QueryFilter,
+        sort_by: str = "date",
+        descending: bool = True,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> QueryPage:
+        offset = _offset_from_cursor(cursor)
+        date_cases = " ".join(
+            "WHEN ? THEN json_extract(data, ?)" for _ in self.date_fields
+        )
+        date_parameters = [
+            value
+            for status, field in self.date_fields.items()
+            for value in (status, f"$.{field}")
+        ]
+        date_sql = f"(CASE status {date_cases} END)"
+
+        conditions, parameters = [], []
+        if query_filter.status:
+            conditions.append("status = ?")
+            parameters.append(query_filter.status)
+        if query_filter.genre:
+            conditions.append("LOWER(json_extract(data, '$.genre')) LIKE ?")
+            parameters.append(f"%{query_filter.genre.lower()}%")
+        if query_filter.min_rating is not None:
+            conditions.append("json_extract(data, '$.rating') >= ?")
+            parameters.append(query_filter.min_rating)
+        if query_filter.max_rating is not None:
+            conditions.append("json_extract(data, '$.rating') <= ?")
+            parameters.append(query_filter.max_rating)
+        if query_filter.date_from:
+            conditions.append(f"{date_sql} >= ?")
+            parameters.extend([*date_parameters, query_filter.date_from])
+        if query_filter.date_to:
+            conditions.append(f"{date_sql} <= ?")
+            parameters.extend([*date_parameters, query_filter.date_to])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        if sort_by == "date":
+            sort_sql, sort_parameters = date_sql, date_parameters
+        else:
+            sort_sql, sort_parameters = "json_extract(data, ?)", [f'$."{sort_by}"']
+        sort_sql = (
+            f"LOWER({sort_sql})"
+            if sort_by in ("title", "author", "director", "genre")
+            else sort_sql
+        )
+        direction = "DESC" if descending else "ASC"
+
+        with self.lock:
+            connection = self._connect()
+            try:
+                total = connection.execute(
+                    f"SELECT COUNT(*) FROM records {where}", parameters
+                ).fetchone()[0]
+                rows = connection.execute(
+                    f"SELECT status, data, {date_sql} AS date, "
+                    f"{sort_sql} AS sort_value FROM records {where} "
+                    f"ORDER BY sort_value IS NULL, sort_value {direction}, id "
+                    "LIMIT ? OFFSET ?",
+                    [*date_parameters, *sort_parameters, *parameters, limit, offset],
+                ).fetchall()
+            finally:
+                connection.close()
+
+        records = [
+            {**json.loads(data), "status": status, "date": date}
+            for status, data, date, _ in rows
+        ]
+        return QueryPage(
+            records=records,
+            total=total,
+            next_cursor=_next_cursor(offset, limit, total),
+        )
+
+
+@contextmanager
+def _immediate(connection: sqlite3.Connection):
+    """
+    Run a block in a transaction that takes SQLite's write lock when it begins.
+
+    For connections opened with isolation_level=None. Commits if the block succeeds
+    and rolls back if it raises.
+    """
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def open_media_store(
+    json_path: str,
+    statuses: tuple,
+    key_fields: tuple,
+    date_fields: dict,
+    backend: str = "json",
+    group_fields: tuple = (),
+    text_fields: Optional[dict] = None,
+) -> MediaStore:
+    """
+    Open the media store configured for a list file.
+
+    Args:
+        json_path (str): The JSON list file from the config, e.g. "data/book_list.json".
+            The SQLite backend keeps its database next to it, with a .sqlite suffix,
+            imports the JSON file into it once and does not update the JSON file.
+        statuses (tuple): The statuses records can have.
+        key_fields (tuple): The fields that identify a record.
+        date_fields (dict): Status to the field holding the date a record got it.
+        backend (str): "json", the default, or "sqlite".
+        group_fields (tuple): Fields to keep aggregate stats for, in a .stats.json file
+            next to the list file. No stats are kept if empty.
+        text_fields (Optional[dict]): Fields to index for similarity search, with their
+            weights. No similarity index is kept if None.
+
+    Returns:
+        MediaStore: The store.
+    """
+    json_path = Path(json_path)
+    if backend == "json":
+        store = JsonMediaStore(json_path, statuses, key_fields, date_fields)
+    elif backend == "sqlite":
+        store = SqliteMediaStore.for_path(
+            json_path.with_suffix(".sqlite"),
+            statuses,
+            key_fields,
+            date_fields,
+            migrate_from=json_path,
+        )
+    else:
+        raise ValueError(f"Unsupported storage backend: {backend}")
+
+    if group_fields:
+        store.stats = MediaStats(
+            json_path.with_suffix(".stats.json"), statuses, group_fields, date_fields
+        )
+    if text_fields:
+        store.similarity = SimilarityIndex.for_path(json_path, text_fields)
+    store.title_index = TitleIndex.for_path(json_path)
+    return store
+
+
+def open_book_store() -> MediaStore:
+    """Open the book list store configured for the books agent."""
+    config = load_config().books_agent
+    return open_media_store(
+        config.book_list_file,
+        BOOK_STATUSES,
+        BOOK_KEY_FIELDS,
+        BOOK_DATE_FIELDS,
+        config.storage_backend,
+        BOOK_GROUP_FIELDS,
+        BOOK_TEXT_FIELDS,
+    )
+
+
+def open_movie_store() -> MediaStore:
+    """Open the movie and show list store configured for the movies agent."""
+    config = load_config().movies_agent
+    return open_media_store(
+        config.movie_list_file,
+        MOVIE_STATUSES,
+        MOVIE_KEY_FIELDS,
+        MOVIE_DATE_FIELDS,
+        config.storage_backend,
+        MOVIE_GROUP_FIELDS,
+        MOVIE_TEXT_FIELDS,
+    )
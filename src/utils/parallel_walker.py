@@ -0,0 +1,101 @@
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.skip_rules import SkipRules
+
+
+def parallel_walk(
+    top: Path, rules: Optional[SkipRules] = None, max_workers: int = 8
+) -> Iterator[tuple]:
+    """
+    Walk a directory tree like os.walk, listing directories on a thread pool.
+
+    Every directory is listed with os.scandir as its own task. Subdirectories are
+    queued as soon as their parent is listed, and any idle worker picks up the next
+    one, so a slow or huge subtree never holds up the rest of the walk. This pays off
+    on network mounts and cold caches, where each listing waits on I/O.
+
+    Entries rejected by the skip rules are pruned and never listed. Like os.walk,
+    directories that cannot be listed are skipped, and symlinked directories are
+    reported but not descended into. Results arrive in completion order rather than
+    walk order.
+
+    Args:
+        top (Path): The directory to walk.
+        rules (Optional[SkipRules]): Decides which folders and files to skip.
+        max_workers (int): Maximum number of directories listed at the same time.
+
+    Yields:
+        tuple: (dirpath, dirnames, filenames) for every directory that was listed.
+
+    Raises:
+        Exception: Whatever the skip rules raised while filtering a directory.
+    """
+    rules = rules or SkipRules()
+    results = queue.SimpleQueue()
+    stopped = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scandir")
+
+    def scan(path: str):
+        try:
+            dirnames, filenames, symlinks = [], [], set()
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if is_dir:
+                            dirnames.append(entry.name)
+                            if entry.is_symlink():
+                                symlinks.add(entry.name)
+                        else:
+                            filenames.append(entry.name)
+            except OSError:
+                # Unreadable, or gone since its parent was listed; os.walk skips it too.
+                results.put(None)
+                return
+
+            dirnames, filenames = rules.filter(path, dirnames, filenames)
+            descend = [
+                os.path.join(path, name) for name in dirnames if name not in symlinks
+            ]
+        except Exception as e:
+            # Hand the error to the consumer, which would otherwise wait forever.
+            results.put(e)
+            return
+
+        # The parent's result must be queued before any of its children can finish,
+        # otherwise the consumer could see the outstanding count drop to zero early.
+        results.put((path, dirnames, filenames, len(descend)))
+        for child in descend:
+            if stopped.is_set():
+                return
+            try:
+                executor.submit(scan, child)
+            except RuntimeError:
+                return
+
+    executor.submit(scan, str(top))
+    outstanding = 1
+    try:
+        while outstanding:
+            result = results.get()
+            if isinstance(result, Exception):
+                raise result
+            if result is None:
+                outstanding -= 1
+                continue
+            path, dirnames, filenames, children = result
+            outstanding += children - 1
+            yield path, dirnames, filenames
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
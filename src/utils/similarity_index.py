@@ -0,0 +1,281 @@
+import json
+import math
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.fuzzy_matching import normalize, tokenize
+
+# Columns allocated up front; the matrix doubles its width when the vocabulary outgrows it.
+INITIAL_COLUMNS = 1024
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have i in is it its my of on or so that the "
+    "this to was with".split()
+)
+
+
+class SimilarityIndex:
+    """
+    A TF-IDF index over the records of a media store, for "something like X" queries.
+
+    Every record is a row of log-scaled term counts of its text fields, weighted per
+    field, in a NumPy matrix with one column per word of the vocabulary. A query is one
+    matrix-vector product giving the cosine similarity to every record, with IDF weights
+    applied on the fly, so adding a record only writes its own row, plus a column for
+    each word never seen before. Rated records get a small boost proportional to their
+    rating. The index lives in memory, is built on first use and is kept in step with
+    the store through record_changes.
+    """
+
+    _indexes: dict[str, "SimilarityIndex"] = {}
+    _indexes_lock = threading.Lock()
+
+    def __init__(self, text_fields: dict):
+        self.text_fields = text_fields
+        self.lock = threading.Lock()
+        self.built = False
+        self._reset(0)
+
+    @classmethod
+    def for_path(cls, path: Path, text_fields: dict) -> "SimilarityIndex":
+        """Return the index shared by everything in this process that uses path."""
+        key = os.path.abspath(path)
+        with cls._indexes_lock:
+            index = cls._indexes.get(key)
+            if index is None:
+                index = cls._indexes[key] = cls(text_fields)
+            return index
+
+    def _reset(self, capacity: int):
+        self.counts = np.zeros((capacity, INITIAL_COLUMNS), dtype=np.float32)
+        self.ratings = np.full(capacity, np.nan, dtype=np.float32)
+        self.status_ids = np.full(capacity, -1, dtype=np.int16)
+        self.df = np.zeros(INITIAL_COLUMNS, dtype=np.float32)
+        self.vocabulary: dict[str, int] = {}
+        self.records: list = []
+        self.rows: dict[tuple, int] = {}
+        self.titles: dict[str, list] = {}
+        self.free: list = []
+        self.live = 0
+        self._norms = None
+
+    def _vector(self, record: dict, learn: bool = False) -> np.ndarray:
+        """
+        Return a record's log-scaled term counts over the vocabulary.
+
+        With learn, words not in the vocabulary get a new column; otherwise they are
+        left out, since no record contains them.
+        """
+        weights: dict[int, float] = {}
+        for field, weight in self.text_fields.items():
+            for token in tokenize(str(record.get(field) or "")):
+                if len(token) < 2 or token in STOPWORDS:
+                    continue
+                column = self.vocabulary.get(token)
+                if column is None:
+                    if not learn:
+                        continue
+                    column = self.vocabulary[token] = len(self.vocabulary)
+                weights[column] = weights.get(column, 0.0) + weight
+
+        if len(self.vocabulary) > self.counts.shape[1]:
+            self._widen()
+        vector = np.zeros(self.counts.shape[1], dtype=np.float32)
+        if weights:
+            columns = np.fromiter(weights, dtype=np.int64, count=len(weights))
+            values = np.fromiter(weights.values(), dtype=np.float32, count=len(weights))
+            vector[columns] = 1 + np.log(values)
+        return vector
+
+    def _widen(self):
+        width = self.counts.shape[1]
+        while width < len(self.vocabulary):
+            width *= 2
+        counts = np.zeros((len(self.counts), width), dtype=np.float32)
+        counts[:, : self.counts.shape[1]] = self.counts
+        df = np.zeros(width, dtype=np.float32)
+        df[: len(self.df)] = self.df
+        self.counts, self.df = counts, df
+
+    def _grow(self):
+        capacity = max(2 * len(self.counts), 64)
+        counts = np.zeros((capacity, self.counts.shape[1]), dtype=np.float32)
+        ratings = np.full(capacity, np.nan, dtype=np.float32)
+        status_ids = np.full(capacity, -1, dtype=np.int16)
+        size = len(self.records)
+        counts[:size], ratings[:size], status_ids[:size] = (
+            self.counts[:size],
+            self.ratings[:size],
+            self.status_ids[:size],
+        )
+        self.counts, self.ratings, self.status_ids = counts, ratings, status_ids
+
+    def _add(self, media_store, status: str, record: dict):
+        key = (status, media_store.record_key(record))
+        if key in self.rows:
+            self._remove(media_store, status, record)
+
+        if self.free:
+            row = self.free.pop()
+            self.records[row] = record
+        else:
+            row = len(self.records)
+            if row == len(self.counts):
+                self._grow()
+            self.records.append(record)
+
+        vector = self._vector(record, learn=True)
+        rating = record.get("rating")
+        self.counts[row] = vector
+        self.ratings[row] = rating if isinstance(rating, (int, float)) else np.nan
+        self.status_ids[row] = media_store.statuses.index(status)
+        self.df += vector > 0
+        self.rows[key] = row
+        self.titles.setdefault(normalize(str(record.get("title") or "")), []).append(
+            row
+        )
+        self.live += 1
+        self._norms = None
+
+    def _remove(self, media_store, status: str, record: dict):
+        row = self.rows.pop((status, media_store.record_key(record)), None)
+        if row is None:
+            return
+        title_rows = self.titles.get(
+            normalize(str(self.records[row].get("title") or "")), []
+        )
+        if row in title_rows:
+            title_rows.remove(row)
+        self.df -= self.counts[row] > 0
+        self.counts[row] = 0
+        self.ratings[row] = np.nan
+        self.status_ids[row] = -1
+        self.records[row] = None
+        self.free.append(row)
+        self.live -= 1
+        self._norms = None
+
+    def _build(self, media_store):
+        data = media_store.load()
+        total = sum(len(data.get(status, [])) for status in media_store.statuses)
+        self._reset(max(total, 64))
+        for status in media_store.statuses:
+            for record in data.get(status, []):
+                self._add(media_store, status, record)
+        self.built = True
+
+    def _ensure_built(self, media_store):
+        if not self.built or self.live != media_store.count():
+            self._build(media_store)
+
+    def record_changes(self, media_store, changes: list):
+        """
+        Apply the changes a media store just made, if the index has been built.
+
+        Args:
+            media_store (MediaStore): The store that changed.
+            changes (list): (status, record, sign) tuples, as for MediaStats.
+        """
+        with self.lock:
+            if not self.built:
+                return
+            for status, record, sign in changes:
+                if sign > 0:
+                    self._add(media_store, status, record)
+                else:
+                    self._remove(media_store, status, record)
+
+    def search(
+        self, media_store, query: str, status: Optional[str] = None, top_k: int = 5
+    ) -> list:
+        """
+        Find the records most similar to a record or to a free-text description.
+
+        Args:
+            media_store (MediaStore): The store to search.
+            query (str): The title of a record in the store, whose text is used as the
+                query, or any description like "slow-burn space opera".
+            status (Optional[str]): Only return records with this status.
+            top_k (int): Number of records to return.
+
+        Returns:
+            list: The best matches as records with "status" and "score" added, best first.
+        """
+        with self.lock:
+            self._ensure_built(media_store)
+            size = len(self.records)
+            if not size:
+                return []
+
+            query_rows = self.titles.get(normalize(query), [])
+            if query_rows:
+                query_vector = self.counts[query_rows].max(axis=0)
+            else:
+                query_vector = self._vector(
+                    {field: query for field in self.text_fields}
+                )
+
+            idf = np.log((1 + self.live) / (1 + self.df)).astype(np.float32) + 1
+            if self._norms is None:
+                counts = self.counts[:size]
+                self._norms = np.sqrt((counts * counts) @ (idf * idf))
+            weighted_query = query_vector * idf
+            query_norm = math.sqrt(float(weighted_query @ weighted_query))
+            if query_norm == 0:
+                return []
+
+            scores = (self.counts[:size] @ (weighted_query * idf)) / (
+                self._norms * query_norm + 1e-9
+            )
+            ratings = self.ratings[:size]
+            scores *= np.where(np.isnan(ratings), 1.0, 0.85 + 0.03 * ratings)
+
+            candidates = self.status_ids[:size] >= 0
+            if status is not None:
+                candidates &= self.status_ids[:size] == media_store.statuses.index(
+                    status
+                )
+            candidates[query_rows] = False
+            candidates &= scores > 0
+            scores = np.where(candidates, scores, -np.inf)
+
+            count = min(top_k, int(candidates.sum()))
+            if count == 0:
+                return []
+            best = np.argpartition(-scores, count - 1)[:count]
+            best = best[np.argsort(-scores[best])]
+            return [
+                {
+                    **self.records[row],
+                    "status": media_store.statuses[self.status_ids[row]],
+                    "score": round(float(scores[row]), 3),
+                }
+                for row in best
+            ]
+
+
+def format_matches(matches: list, query: str, fields: list) -> str:
+    """
+    Render similarity search results compactly, one JSON object per line.
+
+    Args:
+        matches (list): Results of SimilarityIndex.search.
+        query (str): The query, for the summary line.
+        fields (list): The record fields to include, in order.
+
+    Returns:
+        str: A summary line followed by one line per match, best first.
+    """
+    lines = [f"{len(matches)} records similar to '{query}'"]
+    for match in matches:
+        projected = {
+            field: match[field] for field in fields if match.get(field) is not None
+        }
+        lines.append(json.dumps(projected, ensure_ascii=False, separators=(",", ":")))
+    return "\n".join(lines)
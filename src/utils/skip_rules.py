@@ -0,0 +1,263 @@
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+from constants.directories import SKIP_DIRS
+
+
+def translate_pattern(pattern: str) -> Optional[tuple]:
+    """
+    Translate one gitignore line into a regular expression.
+
+    Args:
+        pattern (str): A line from a .gitignore file.
+
+    Returns:
+        Optional[tuple]: (regex, negated, directory_only), or None for blank lines,
+            comments and invalid patterns, which git skips as well.
+    """
+    pattern = pattern.rstrip("\n")
+    if not pattern.strip() or pattern.startswith("#"):
+        return None
+    if not pattern.endswith("\\ "):
+        pattern = pattern.rstrip()
+
+    negated = pattern.startswith("!")
+    if negated:
+        pattern = pattern[1:]
+    elif pattern.startswith("\\!") or pattern.startswith("\\#"):
+        pattern = pattern[1:]
+
+    directory_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    if not pattern:
+        return None
+
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    regex = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            regex.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and i + 2 == len(pattern) and i > 0:
+            regex.append(".*")
+            i += 2
+        elif char == "*":
+            regex.append("[^/]*")
+            i += 1
+        elif char == "?":
+            regex.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                regex.append(re.escape(char))
+                i += 1
+                continue
+            body = pattern[i + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            body = body.replace("\\", "\\\\")
+            regex.append(f"[{body}]")
+            i = end + 1
+        elif char == "\\" and i + 1 < len(pattern):
+            regex.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            regex.append(re.escape(char))
+            i += 1
+
+    prefix = "" if anchored else "(?:.*/)?"
+    regex = prefix + "".join(regex)
+    try:
+        re.compile(regex)
+    except re.error:
+        # E.g. a reversed range like [z-a] or an empty class like [!].
+        return None
+    return regex, negated, directory_only
+
+
+class GitignoreMatcher:
+    """
+    The compiled patterns of one .gitignore file.
+
+    All patterns are folded into a single regular expression per entry type, with the
+    alternatives in reverse order so the first alternative that matches is the last
+    matching line of the file, which is the one git uses.
+    """
+
+    def __init__(self, patterns: list, base: str):
+        self.base = base
+        compiled = [p for p in map(translate_pattern, patterns) if p is not None]
+        self.dir_regex, self.dir_negated = self._combine(compiled)
+        self.file_regex, self.file_negated = self._combine(
+            [p for p in compiled if not p[2]]
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> Optional["GitignoreMatcher"]:
+        """Load a .gitignore file, returning None if it cannot be read or is empty."""
+        try:
+            with open(path, encoding="utf-8", errors="replace") as file:
+                matcher = cls(file.readlines(), os.path.dirname(path))
+        except OSError:
+            return None
+        return matcher if matcher.dir_regex is not None else None
+
+    @staticmethod
+    def _combine(compiled: list) -> tuple:
+        if not compiled:
+            return None, []
+        ordered = list(reversed(compiled))
+        regex = re.compile("|".join(f"({pattern})" for pattern, _, _ in ordered))
+        return regex, [negated for _, negated, _ in ordered]
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Decide whether a path is ignored by this file.
+
+        Args:
+            path (str): An absolute path below the directory holding the .gitignore.
+            is_dir (bool): Whether the path is a directory.
+
+        Returns:
+            Optional[bool]: True if ignored, False if re-included, None if no line matches.
+        """
+        regex, negated = (
+            (self.dir_regex, self.dir_negated)
+            if is_dir
+            else (self.file_regex, self.file_negated)
+        )
+        if regex is None:
+            return None
+        match = regex.fullmatch(path[len(self.base) + 1 :])
+        if match is None:
+            return None
+        return not negated[match.lastindex - 1]
+
+
+class SkipRules:
+    """
+    Decides which folders and files a project walk skips.
+
+    Folders named in SKIP_DIRS and hidden folders are rejected with set lookups, and
+    every .gitignore met during the walk is compiled and applied to its own subtree,
+    with deeper files taking precedence like in git. When a walk starts inside a git
+    repository, or below root if given, the .gitignore files between the repository
+    root (or root) and the start folder apply too; this needs an absolute start path.
+    Walkers call filter on each listing before descending, so skipped folders are
+    never listed at all.
+    """
+
+    def __init__(
+        self,
+        skip_dirs: set = SKIP_DIRS,
+        skip_hidden: bool = True,
+        use_gitignore: bool = True,
+        root: Optional[str] = None,
+    ):
+        self.skip_dirs = frozenset(skip_dirs)
+        self.skip_hidden = skip_hidden
+        self.use_gitignore = use_gitignore
+        self.root = str(root).rstrip(os.sep) if root else None
+        self._chains: dict[str, tuple] = {}
+
+    def filter(self, dirpath: str, dirnames: list, filenames: list) -> tuple:
+        """
+        Remove skipped entries from one directory listing.
+
+        Args:
+            dirpath (str): The directory that was listed.
+            dirnames (list): Names of the folders in it.
+            filenames (list): Names of the files in it.
+
+        Returns:
+            tuple: The (dirnames, filenames) to keep.
+        """
+        dirnames = [
+            name
+            for name in dirnames
+            if name not in self.skip_dirs
+            and not (self.skip_hidden and name.startswith("."))
+        ]
+        if not self.use_gitignore:
+            return dirnames, filenames
+
+        chain = self._chain(dirpath, ".gitignore" in filenames)
+        if not chain:
+            return dirnames, filenames
+
+        dirnames = [
+            name
+            for name in dirnames
+            if not self._ignored(chain, os.path.join(dirpath, name), True)
+        ]
+        filenames = [
+            name
+            for name in filenames
+            if not self._ignored(chain, os.path.join(dirpath, name), False)
+        ]
+        return dirnames, filenames
+
+    def _chain(self, dirpath: str, has_gitignore: bool) -> tuple:
+        """Return the .gitignore matchers that apply inside dirpath, deepest first."""
+        chain = self._chains.get(dirpath)
+        if chain is not None:
+            return chain
+
+        chain = self._chains.get(os.path.dirname(dirpath))
+        if chain is None:
+            chain = self._enclosing_chain(os.path.dirname(dirpath))
+        if has_gitignore:
+            matcher = GitignoreMatcher.from_file(os.path.join(dirpath, ".gitignore"))
+            if matcher is not None:
+                chain = (matcher, *chain)
+        self._chains[dirpath] = chain
+        return chain
+
+    def _enclosing_chain(self, dirpath: str) -> tuple:
+        """
+        Return the matchers of the .gitignore files that apply inside dirpath from above.
+
+        They are the .gitignore files of the enclosing git repository, or from root if
+        that comes first, down to dirpath, deepest first. Outside a repository and root
+        there are none.
+        """
+        if not os.path.isabs(dirpath):
+            return ()
+        ancestors = []
+        path = dirpath
+        while path != self.root and not os.path.exists(os.path.join(path, ".git")):
+            ancestors.append(path)
+            parent = os.path.dirname(path)
+            if parent == path:
+                return ()
+            path = parent
+        ancestors.append(path)
+
+        chain = ()
+        for path in reversed(ancestors):
+            cached = self._chains.get(path)
+            if cached is None:
+                matcher = GitignoreMatcher.from_file(os.path.join(path, ".gitignore"))
+                if matcher is not None:
+                    chain = (matcher, *chain)
+                self._chains[path] = chain
+            else:
+                chain = cached
+        return chain
+
+    @staticmethod
+    def _ignored(chain: tuple, path: str, is_dir: bool) -> bool:
+        for matcher in chain:
+            decision = matcher.match(path, is_dir)
+            if decision is not None:
+                return decision
+        return False
@@ -0,0 +1,387 @@
+import io
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import numpy as np
+from loguru import logger
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.json_store import JsonStore, replace_file
+
+# Sleep quality words mapped to a 1-4 scale; 0 means unknown.
+QUALITY_SCORES = {
+    "terrible": 1,
+    "bad": 1,
+    "poor": 1,
+    "fair": 2,
+    "average": 2,
+    "ok": 2,
+    "okay": 2,
+    "restless": 2,
+    "good": 3,
+    "great": 4,
+    "excellent": 4,
+}
+QUALITY_LABELS = ("unknown", "poor", "fair", "good", "excellent")
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def session_minutes(session: dict) -> Optional[float]:
+    """Return a session's sleep duration, whichever field name it was logged under."""
+    value = session.get("total_sleep_time", session.get("duration"))
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def session_quality(session: dict) -> int:
+    """Return a session's quality on the 1-4 scale, or 0 if it is missing or unknown."""
+    value = session.get("sleep_quality", session.get("quality"))
+    return QUALITY_SCORES.get(str(value or "").strip().lower(), 0)
+
+
+class SleepColumns(NamedTuple):
+    """Sleep sessions as one entry per night, sorted by date."""
+
+    days: np.ndarray  # datetime64[D]
+    minutes: np.ndarray  # float32, NaN if unknown
+    quality: np.ndarray  # int8, 0 if unknown
+
+    def last_days(self, days: Optional[int]) -> "SleepColumns":
+        """Return the nights in the last days calendar days up to the latest night."""
+        if not days or not len(self.days):
+            return self
+        start = np.searchsorted(
+            self.days, self.days[-1] - np.timedelta64(days - 1, "D")
+        )
+        return SleepColumns(
+            self.days[start:], self.minutes[start:], self.quality[start:]
+        )
+
+
+def _to_columns(sessions: list) -> tuple:
+    """Convert sessions to unsorted (days, minutes, quality) arrays, skipping bad dates."""
+    days = np.empty(len(sessions), dtype="datetime64[D]")
+    minutes = np.empty(len(sessions), dtype=np.float32)
+    quality = np.empty(len(sessions), dtype=np.int8)
+    valid = np.ones(len(sessions), dtype=bool)
+    for row, session in enumerate(sessions):
+        try:
+            days[row] = np.datetime64(str(session.get("date"))[:10], "D")
+        except ValueError:
+            valid[row] = False
+            continue
+        value = session_minutes(session)
+        minutes[row] = np.nan if value is None else value
+        quality[row] = session_quality(session)
+    return days[valid], minutes[valid], quality[valid]
+
+
+def _nightly(
+    days: np.ndarray, minutes: np.ndarray, quality: np.ndarray
+) -> SleepColumns:
+    """Sort by date, keeping the last logged session of each night."""
+    reversed_days = days[::-1]
+    unique_days, first = np.unique(reversed_days, return_index=True)
+    last = len(days) - 1 - first
+    return SleepColumns(unique_days, minutes[last], quality[last])
+
+
+def columns_from_sessions(sessions: list) -> SleepColumns:
+    """Convert sleep sessions to columns, one entry per night."""
+    return _nightly(*_to_columns(sessions))
+
+
+class SleepColumnStore:
+    """
+    A columnar copy of the sleep sessions in a JSON store, for vectorized analytics.
+
+    The sessions are held as NumPy arrays in memory and in an .npz file next to the
+    JSON file, tagged with the JSON store's version. When the sessions only grew since
+    the arrays were built, only the new sessions are converted; otherwise the arrays are
+    rebuilt. Reading the columns of an unchanged store costs two stat calls.
+    """
+
+    _stores: dict[str, "SleepColumnStore"] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, json_store: JsonStore):
+        self.json_store = json_store
+        self.path = json_store.path.with_suffix(".npz")
+        self.lock = threading.Lock()
+        self._version = None
+        self._raw = None
+        self._count = 0
+        self._last = None
+        self._columns = None
+
+    @classmethod
+    def for_store(cls, json_store: JsonStore) -> "SleepColumnStore":
+        """Return the column store shared by everything in this process for json_store."""
+        key = str(json_store.path.resolve())
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None or store.json_store is not json_store:
+                store = cls._stores[key] = cls(json_store)
+            return store
+
+    def _load_file(self):
+        """Load the raw columns saved by a previous process, if any."""
+        try:
+            with np.load(self.path) as saved:
+                self._raw = (saved["days"], saved["minutes"], saved["quality"])
+                self._count = int(saved["count"])
+                self._last = str(saved["last"])
+                self._version = str(saved["version"])
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable sleep columns {self.path}: {e}")
+
+    def _save_file(self):
+        buffer = io.BytesIO()
+        days, minutes, quality = self._raw
+        np.savez(
+            buffer,
+            days=days,
+            minutes=minutes,
+            quality=quality,
+            count=self._count,
+            last=self._last or "",
+            version=self._version,
+        )
+        try:
+            replace_file(self.path, buffer.getvalue())
+        except OSError as e:
+            logger.warning(f"Could not save sleep columns to {self.path}: {e}")
+
+    def columns(self) -> SleepColumns:
+        """
+        Return the sleep sessions as columns, one entry per night.
+
+        Returns:
+            SleepColumns: The nights, sorted by date.
+        """
+        with self.lock:
+            version = json.dumps(self.json_store.version())
+            if version == self._version and self._columns is not None:
+                return self._columns
+            if self._raw is None:
+                self._load_file()
+
+            if version != self._version:
+                sessions = (self.json_store.read() or {}).get("sleep_sessions", [])
+                appended = (
+                    self._raw is not None
+                    and 0 < self._count <= len(sessions)
+                    and json.dumps(sessions[self._count - 1], sort_keys=True)
+                    == self._last
+                )
+                new = _to_columns(sessions[self._count :] if appended else sessions)
+                if appended:
+                    new = tuple(np.concatenate(pair) for pair in zip(self._raw, new))
+                self._raw = new
+                self._count = len(sessions)
+                self._last = (
+                    json.dumps(sessions[-1], sort_keys=True) if sessions else None
+                )
+                self._version = version
+                self._save_file()
+
+            self._columns = _nightly(*self._raw)
+            return self._columns
+
+
+def _daily(columns: SleepColumns) -> tuple:
+    """Spread nights over every calendar day from the first to the last night."""
+    offsets = (columns.days - columns.days[0]).astype(np.int64)
+    span = int(offsets[-1]) + 1
+    minutes = np.full(span, np.nan, dtype=np.float32)
+    quality = np.zeros(span, dtype=np.int8)
+    minutes[offsets] = columns.minutes
+    quality[offsets] = columns.quality
+    return minutes, quality
+
+
+def _window_means(values: np.ndarray, valid: np.ndarray, window: int) -> np.ndarray:
+    """Trailing means over window days, counting only valid days; NaN if there are none."""
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    end = np.arange(1, len(values) + 1)
+    start = np.maximum(end - window, 0)
+    window_counts = counts[end] - counts[start]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(
+            window_counts > 0, (sums[end] - sums[start]) / window_counts, np.nan
+        )
+
+
+def rolling_averages(columns: SleepColumns, window: int = 7) -> tuple:
+    """
+    Compute trailing averages of duration and quality for every calendar day.
+
+    Args:
+        columns (SleepColumns): The nights.
+        window (int): Window length in days. Days without a record are skipped, not
+            counted as zero.
+
+    Returns:
+        tuple: (days, mean minutes, mean quality) arrays, NaN where a window is empty.
+    """
+    minutes, quality = _daily(columns)
+    days = columns.days[0] + np.arange(len(minutes))
+    return (
+        days,
+        _window_means(minutes, ~np.isnan(minutes), window),
+        _window_means(quality.astype(np.float64), quality > 0, window),
+    )
+
+
+def weekday_pattern(columns: SleepColumns) -> tuple:
+    """
+    Compute mean duration and quality per weekday.
+
+    Returns:
+        tuple: (nights, mean minutes, mean quality) arrays indexed Monday to Sunday.
+    """
+    weekdays = (columns.days.astype(np.int64) + 3) % 7
+    has_minutes = ~np.isnan(columns.minutes)
+    has_quality = columns.quality > 0
+    nights = np.bincount(weekdays, minlength=7)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        minutes = np.bincount(
+            weekdays[has_minutes], weights=columns.minutes[has_minutes], minlength=7
+        ) / np.bincount(weekdays[has_minutes], minlength=7)
+        quality = np.bincount(
+            weekdays[has_quality], weights=columns.quality[has_quality], minlength=7
+        ) / np.bincount(weekdays[has_quality], minlength=7)
+    return nights, minutes, quality
+
+
+def quality_distribution(columns: SleepColumns) -> tuple:
+    """
+    Count nights per quality level, with their mean duration.
+
+    Returns:
+        tuple: (nights, mean minutes) arrays indexed by quality score, 0 being unknown.
+    """
+    levels = len(QUALITY_LABELS)
+    nights = np.bincount(columns.quality, minlength=levels)
+    has_minutes = ~np.isnan(columns.minutes)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        minutes = np.bincount(
+            columns.quality[has_minutes],
+            weights=columns.minutes[has_minutes],
+            minlength=levels,
+        ) / np.bincount(columns.quality[has_minutes], minlength=levels)
+    return nights, minutes
+
+
+def _runs(flags: np.ndarray) -> tuple:
+    """Return the longest run of True and the run ending at the last element."""
+    padded = np.concatenate(([0], flags.astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    starts, ends = edges[::2], edges[1::2]
+    if not len(starts):
+        return 0, 0
+    longest = int((ends - starts).max())
+    current = int(ends[-1] - starts[-1]) if ends[-1] == len(flags) else 0
+    return longest, current
+
+
+def streaks(columns: SleepColumns, target_minutes: float = 420) -> dict:
+    """
+    Find runs of consecutive calendar days.
+
+    Args:
+        columns (SleepColumns): The nights.
+        target_minutes (float): Minimum duration for a night to count towards the
+            target streaks.
+
+    Returns:
+        dict: Longest and current (ending at the latest night) streaks of logged nights,
+            of nights meeting the target and of nights rated good or better.
+    """
+    minutes, quality = _daily(columns)
+    result = {}
+    for name, flags in (
+        ("logged", ~np.isnan(minutes) | (quality > 0)),
+        ("target", minutes >= target_minutes),
+        ("good", quality >= QUALITY_SCORES["good"]),
+    ):
+        result[name] = _runs(flags)
+    return result
+
+
+def _hours(minutes: float) -> str:
+    return "n/a" if np.isnan(minutes) else f"{minutes / 60:.1f}h"
+
+
+def _score(quality: float) -> str:
+    return "n/a" if np.isnan(quality) else f"{quality:.1f}/4"
+
+
+def format_rolling_averages(
+    columns: SleepColumns, window: int = 7, days: int = 14
+) -> str:
+    """Render the trailing averages of the last days days, one line per day."""
+    if not len(columns.days):
+        return "No sleep data."
+    dates, minutes, quality = rolling_averages(columns, window)
+    lines = [
+        f"{window}-day trailing averages (quality 1 poor - 4 excellent), "
+        f"{len(columns.days)} nights from {columns.days[0]} to {columns.days[-1]}:"
+    ]
+    for date, mean_minutes, mean_quality in zip(
+        dates[-days:], minutes[-days:], quality[-days:]
+    ):
+        lines.append(
+            f"  {date}: {_hours(mean_minutes)}, quality {_score(mean_quality)}"
+        )
+    return "\n".join(lines)
+
+
+def format_weekday_pattern(columns: SleepColumns) -> str:
+    """Render mean duration and quality per weekday."""
+    if not len(columns.days):
+        return "No sleep data."
+    nights, minutes, quality = weekday_pattern(columns)
+    lines = [f"By weekday of the night's date ({len(columns.days)} nights):"]
+    for day in range(7):
+        lines.append(
+            f"  {WEEKDAYS[day]}: {nights[day]} nights, {_hours(minutes[day])}, "
+            f"quality {_score(quality[day])}"
+        )
+    return "\n".join(lines)
+
+
+def format_quality_distribution(columns: SleepColumns) -> str:
+    """Render the number of nights and mean duration per quality level."""
+    if not len(columns.days):
+        return "No sleep data."
+    nights, minutes = quality_distribution(columns)
+    lines = [f"Quality distribution ({len(columns.days)} nights):"]
+    for level in range(len(QUALITY_LABELS) - 1, -1, -1):
+        share = nights[level] / len(columns.days)
+        lines.append(
+            f"  {QUALITY_LABELS[level]}: {nights[level]} nights ({share:.0%}), "
+            f"mean {_hours(minutes[level])}"
+        )
+    return "\n".join(lines)
+
+
+def format_streaks(columns: SleepColumns, target_minutes: float = 420) -> str:
+    """Render the longest and current streaks."""
+    if not len(columns.days):
+        return "No sleep data."
+    found = streaks(columns, target_minutes)
+    descriptions = {
+        "logged": "Nights logged",
+        "target": f"Nights of at least {_hours(target_minutes)}",
+        "good": "Nights rated good or better",
+    }
+    lines = [f"Streaks of consecutive nights up to {columns.days[-1]}:"]
+    for name, (longest, current) in found.items():
+        lines.append(f"  {descriptions[name]}: current {current}, longest {longest}")
+    return "\n".join(lines)
@@ -0,0 +1,235 @@
+import csv
+import json
+import re
+import sys
+from datetime import date as Date
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from pydantic import TypeAdapter, ValidationError
+
+sys.path.append(str(Path(__file__).parent.parent))
+from schemas.sleep_data_schema import SleepDataSchema
+from utils.json_log_store import JsonLogStore, apply_op
+from utils.sleep_analytics import columns_from_sessions
+from utils.sleep_rollups import rollup_ops
+
+IMPORT_BATCH_SIZE = 1000
+
+# Column names used by common exports, for each SleepDataSchema field.
+FIELD_ALIASES = {
+    "date": (
+        "date",
+        "day",
+        "night",
+        "sleep_date",
+        "calendar_date",
+        "start_date",
+        "start_time",
+    ),
+    "total_sleep_time": (
+        "total_sleep_time",
+        "duration",
+        "sleep_duration",
+        "minutes_asleep",
+        "asleep_minutes",
+        "sleep_minutes",
+        "total_sleep_minutes",
+    ),
+    "sleep_quality": ("sleep_quality", "quality", "sleep_rating"),
+    "notes": ("notes", "note", "comment", "comments"),
+}
+HOUR_FIELDS = ("hours_asleep", "sleep_hours", "total_sleep_hours")
+
+_sessions_adapter = TypeAdapter(list[SleepDataSchema])
+
+
+class ImportResult(NamedTuple):
+    """Counts of an import, and (row number, error) pairs of the rows that were skipped."""
+
+    rows: int
+    added: int
+    replaced: int
+    duplicates: int
+    invalid: list
+
+
+def iter_export_rows(path: Path) -> Iterator[dict]:
+    """
+    Yield the rows of a sleep export.
+
+    CSV (with a header row) and JSON Lines files are streamed. JSON files may hold a list
+    of rows or an object with the list under "sleep_sessions", "sleep" or "data".
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    with open(path, newline="" if suffix == ".csv" else None) as file:
+        if suffix == ".csv":
+            yield from csv.DictReader(file)
+        elif suffix in (".jsonl", ".ndjson"):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            data = json.load(file)
+            if isinstance(data, dict):
+                data = next(
+                    (
+                        data[key]
+                        for key in ("sleep_sessions", "sleep", "data")
+                        if key in data
+                    ),
+                    [],
+                )
+            yield from data
+
+
+def _normalize_row(row: dict) -> dict:
+    """
+    Map an export row's columns to SleepDataSchema fields, without validating them.
+
+    Column names are matched case-insensitively, with spaces, dashes and other
+    punctuation read as underscores, so "Minutes Asleep" matches minutes_asleep.
+
+    Raises:
+        ValueError: If the row has neither a sleep duration nor a sleep quality.
+    """
+    fields = {_column_key(key): value for key, value in row.items() if key}
+    session = {}
+    for field, aliases in FIELD_ALIASES.items():
+        for alias in aliases:
+            if fields.get(alias) not in (None, ""):
+                session[field] = fields[alias]
+                break
+    if "total_sleep_time" not in session:
+        for field in HOUR_FIELDS:
+            if fields.get(field) not in (None, ""):
+                session["total_sleep_time"] = float(fields[field]) * 60
+                break
+
+    if "total_sleep_time" not in session and "sleep_quality" not in session:
+        raise ValueError("no sleep duration or quality")
+
+    if "date" in session:
+        # Exports often use timestamps; the night is the date part.
+        session["date"] = Date.fromisoformat(
+            str(session["date"]).strip()[:10]
+        ).isoformat()
+    if isinstance(session.get("total_sleep_time"), str):
+        session["total_sleep_time"] = float(session["total_sleep_time"])
+    if isinstance(session.get("total_sleep_time"), float):
+        session["total_sleep_time"] = round(session["total_sleep_time"])
+    return session
+
+
+def _column_key(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", name.strip().lower()).strip("_")
+
+
+def _validate_batch(batch: list, invalid: list) -> list:
+    """Validate (row number, session) pairs together, recording the ones that fail."""
+    sessions = [session for _, session in batch]
+    try:
+        validated = _sessions_adapter.validate_python(sessions)
+    except ValidationError as e:
+        failed = {}
+        for error in e.errors():
+            failed.setdefault(error["loc"][0], f"{error['loc'][-1]}: {error['msg']}")
+        for index, message in failed.items():
+            invalid.append((batch[index][0], message))
+        batch = [item for index, item in enumerate(batch) if index not in failed]
+        validated = _sessions_adapter.validate_python([session for _, session in batch])
+    return [model.model_dump(exclude_none=True) for model in validated]
+
+
+def import_sleep_export(
+    store: JsonLogStore,
+    path: Path,
+    replace: bool = False,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportResult:
+    """
+    Import a bulk sleep export, such as a year of wearable data, in one transaction.
+
+    Rows are read as a stream and validated against SleepDataSchema in batches. Only
+    the last row of each date is kept. All new sessions, and the weekly and monthly
+    rollups they affect, are written as a single log entry: a crash either imports
+    everything or nothing.
+
+    Args:
+        store (JsonLogStore): The sleep tracking store.
+        path (Path): A CSV, JSON or JSON Lines export.
+        replace (bool): Overwrite sessions already logged for a date instead of
+            keeping them.
+        batch_size (int): Rows validated at a time.
+
+    Returns:
+        ImportResult: What was imported and what was skipped.
+    """
+    invalid = []
+    by_date = {}
+    rows = 0
+    numbered = enumerate(iter_export_rows(path), start=1)
+    while chunk := list(islice(numbered, batch_size)):
+        rows += len(chunk)
+        batch = []
+        for number, row in chunk:
+            try:
+                batch.append((number, _normalize_row(row)))
+            except (ValueError, TypeError, AttributeError) as e:
+                invalid.append((number, str(e)))
+        if batch:
+            for session in _validate_batch(batch, invalid):
+                by_date[session["date"]] = session
+    duplicates = rows - len(invalid) - len(by_date)
+
+    with store.locked():
+        data = store.read() or {}
+        existing = {
+            session.get("date"): index
+            for index, session in enumerate(data.get("sleep_sessions", []))
+        }
+        ops = []
+        new_sessions = [
+            by_date[date] for date in sorted(by_date) if date not in existing
+        ]
+        if new_sessions:
+            ops.append(
+                {"op": "extend", "path": ["sleep_sessions"], "values": new_sessions}
+            )
+        added, replaced = len(new_sessions), 0
+        for date in sorted(by_date):
+            if date in existing and replace:
+                ops.append(
+                    {
+                        "op": "set",
+                        "path": ["sleep_sessions"],
+                        "key": existing[date],
+                        "value": by_date[date],
+                    }
+                )
+                replaced += 1
+        duplicates += len(by_date) - added - replaced
+
+        if ops:
+            imported = data
+            for op in ops:
+                imported = apply_op(imported, op)
+            columns = columns_from_sessions(imported["sleep_sessions"])
+            store.apply(ops + rollup_ops(columns, imported, sorted(by_date)))
+
+    return ImportResult(rows, added, replaced, duplicates, invalid)
+
+
+def format_import_result(result: ImportResult, max_errors: int = 10) -> str:
+    """Summarize an import, listing the first few invalid rows."""
+    lines = [
+        f"Read {result.rows} rows: {result.added} nights added, {result.replaced} replaced, "
+        f"{result.duplicates} duplicate dates skipped, {len(result.invalid)} invalid rows skipped."
+    ]
+    for number, error in result.invalid[:max_errors]:
+        lines.append(f"  Row {number}: {error}")
+    if len(result.invalid) > max_errors:
+        lines.append(f"  ... and {len(result.invalid) - max_errors} more invalid rows")
+    return "\n".join(lines)
@@ -0,0 +1,140 @@
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.sleep_analytics import QUALITY_LABELS, SleepColumns
+
+# Keys of the sleep tracking file holding the rollups, by bucket start.
+ROLLUP_KEYS = {"week": "weekly_rollups", "month": "monthly_rollups"}
+
+
+def bucket_starts(days: np.ndarray, period: str) -> np.ndarray:
+    """Return the first day of the week (from Monday) or month containing each day."""
+    if period == "week":
+        return days - (days.astype(np.int64) + 3) % 7
+    return days.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def bucket_of(date: str, period: str) -> str:
+    """Return the key of the week or month bucket containing a YYYY-MM-DD date."""
+    start = bucket_starts(np.datetime64(str(date)[:10], "D"), period)
+    return _bucket_key(start, period)
+
+
+def _bucket_end(start: np.datetime64, period: str) -> np.datetime64:
+    if period == "week":
+        return start + np.timedelta64(7, "D")
+    return (start.astype("datetime64[M]") + np.timedelta64(1, "M")).astype(
+        "datetime64[D]"
+    )
+
+
+def _bucket_key(start: np.datetime64, period: str) -> str:
+    return str(start) if period == "week" else str(start)[:7]
+
+
+def rollup(columns: SleepColumns, start: np.datetime64, period: str) -> Optional[dict]:
+    """
+    Summarize the nights of one week or month.
+
+    Args:
+        columns (SleepColumns): All nights.
+        start (np.datetime64): First day of the bucket.
+        period (str): "week" or "month".
+
+    Returns:
+        Optional[dict]: Night count, mean, min and max duration in minutes and mean
+            quality as a label and a 1-4 score, or None if no night falls in the bucket.
+    """
+    end = _bucket_end(start, period)
+    low, high = np.searchsorted(columns.days, [start, end])
+    if low == high:
+        return None
+    minutes = columns.minutes[low:high]
+    minutes = minutes[~np.isnan(minutes)]
+    quality = columns.quality[low:high]
+    quality = quality[quality > 0]
+
+    summary = {
+        "start": str(start),
+        "end": str(end - np.timedelta64(1, "D")),
+        "nights": int(high - low),
+        "average_duration": round(float(minutes.mean())) if len(minutes) else None,
+        "min_duration": round(float(minutes.min())) if len(minutes) else None,
+        "max_duration": round(float(minutes.max())) if len(minutes) else None,
+        "average_quality": None,
+        "quality_score": None,
+    }
+    if len(quality):
+        score = float(quality.mean())
+        summary["average_quality"] = QUALITY_LABELS[int(round(score))]
+        summary["quality_score"] = round(score, 2)
+    return summary
+
+
+def rollup_ops(columns: SleepColumns, data: dict, changed_dates: list = ()) -> list:
+    """
+    Return the operations that bring the stored rollups in line with the nights.
+
+    The weeks and months containing changed_dates are always recomputed. Any other
+    bucket is recomputed only if it is missing or its stored night count is off, which
+    backfills missing weeks in one pass while an up-to-date file costs one vectorized
+    count per period.
+
+    Args:
+        columns (SleepColumns): All nights, including the changes.
+        data (dict): The sleep tracking data with the currently stored rollups.
+        changed_dates (list): YYYY-MM-DD dates of the nights just added or changed.
+
+    Returns:
+        list: "set" and "delete" operations for JsonLogStore.apply.
+    """
+    ops = []
+    changed = np.array(
+        [str(date)[:10] for date in changed_dates], dtype="datetime64[D]"
+    )
+    for period, key in ROLLUP_KEYS.items():
+        stored = data.get(key) or {}
+        starts, nights = np.unique(
+            bucket_starts(columns.days, period), return_counts=True
+        )
+        stale = {
+            start
+            for start, count in zip(starts, nights)
+            if (stored.get(_bucket_key(start, period)) or {}).get("nights") != count
+        }
+        stale.update(bucket_starts(changed, period))
+
+        for start in sorted(stale):
+            summary = rollup(columns, start, period)
+            bucket = _bucket_key(start, period)
+            if summary is not None:
+                ops.append(
+                    {"op": "set", "path": [key], "key": bucket, "value": summary}
+                )
+            elif bucket in stored:
+                ops.append({"op": "delete", "path": [key], "key": bucket})
+    return ops
+
+
+def format_rollups(data: dict, period: str = "week", count: int = 8) -> str:
+    """Render the most recent rollups of a period, one line each."""
+    rollups = (data or {}).get(ROLLUP_KEYS[period]) or {}
+    if not rollups:
+        return f"No {period}ly sleep summaries yet."
+    lines = [
+        f"Last {min(count, len(rollups))} of {len(rollups)} {period}ly sleep summaries:"
+    ]
+    for bucket in sorted(rollups)[-count:]:
+        summary = rollups[bucket]
+        duration = summary["average_duration"]
+        lines.append(
+            f"  {summary['start']} to {summary['end']}: {summary['nights']} nights, "
+            f"average {'n/a' if duration is None else f'{duration / 60:.1f}h'} "
+            f"(min {summary['min_duration']}, max {summary['max_duration']} min), "
+            f"quality {summary['average_quality'] or 'n/a'}"
+        )
+    return "\n".join(lines)
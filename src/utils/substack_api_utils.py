@@ -19,7 +19,7 @@ def get_recent_posts(newsletter_url: str, limit: int = 5) -> list:
         List of recent posts.
     """
 
-    newsletter = Newsletter("https://www.noahpinion.blog/")
+    newsletter = Newsletter(newsletter_url)
     return newsletter.get_posts(limit=limit)
 
 
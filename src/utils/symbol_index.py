@@ -0,0 +1,277 @@
+import ast
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+SYMBOL_INDEX_PATH = Path(__file__).parent.parent.parent / "data" / "symbol_index.sqlite"
+
+# Below this many changed files, parsing inline is faster than starting a process pool.
+PROCESS_POOL_THRESHOLD = 32
+
+
+def parse_python_file(path: str) -> dict:
+    """
+    Extract definitions, imports and call sites from a Python file.
+
+    Args:
+        path (str): The file to parse.
+
+    Returns:
+        dict: Lists of "definitions" (name, qualname, kind, start_line, end_line),
+            "imports" (module, name, line) and "calls" (name, caller, line). Files that
+            cannot be read or parsed give empty lists.
+    """
+    result = {"definitions": [], "imports": [], "calls": []}
+    try:
+        with open(path, "rb") as file:
+            tree = ast.parse(file.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return result
+
+    def visit(node, scope: list):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                kind = "class" if isinstance(child, ast.ClassDef) else "function"
+                if kind == "function" and scope and scope[-1][1] == "class":
+                    kind = "method"
+                qualname = ".".join([name for name, _ in scope] + [child.name])
+                result["definitions"].append(
+                    (child.name, qualname, kind, child.lineno, child.end_lineno)
+                )
+                visit(child, scope + [(child.name, kind)])
+                continue
+
+            if isinstance(child, ast.Import):
+                for alias in child.names:
+                    result["imports"].append((alias.name, None, child.lineno))
+            elif isinstance(child, ast.ImportFrom):
+                module = "." * child.level + (child.module or "")
+                for alias in child.names:
+                    result["imports"].append((module, alias.name, child.lineno))
+            elif isinstance(child, ast.Call):
+                name = _call_name(child.func)
+                if name:
+                    caller = ".".join(name for name, _ in scope) or "<module>"
+                    result["calls"].append((name, caller, child.lineno))
+            visit(child, scope)
+
+    visit(tree, [])
+    return result
+
+
+def _call_name(func: ast.expr) -> str:
+    parts = []
+    while isinstance(func, ast.Attribute):
+        parts.append(func.attr)
+        func = func.value
+    if isinstance(func, ast.Name):
+        parts.append(func.id)
+    elif not parts:
+        return ""
+    return ".".join(reversed(parts))
+
+
+class SymbolIndex:
+    """
+    An incremental index of the symbols in a project's Python files.
+
+    Files are re-parsed only when their mtime or size changed, in a process pool when
+    many changed at once. Definitions, imports and call sites are stored in SQLite so
+    structural questions can be answered without reading the files themselves. Use
+    for_path to get the instance shared by the process, so its lock serializes every
+    thread that updates the same database.
+    """
+
+    _indexes: dict[str, "SymbolIndex"] = {}
+    _indexes_lock = threading.Lock()
+
+    def __init__(
+        self, index_path: Path = SYMBOL_INDEX_PATH, max_workers: Optional[int] = None
+    ):
+        self.index_path = Path(index_path)
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_path(
+        cls, index_path: Path = SYMBOL_INDEX_PATH, max_workers: Optional[int] = None
+    ) -> "SymbolIndex":
+        """Return the index shared by everything in this process that uses index_path."""
+        key = os.path.abspath(index_path)
+        with cls._indexes_lock:
+            index = cls._indexes.get(key)
+            if index is None:
+                index = cls._indexes[key] = cls(index_path, max_workers)
+            return index
+
+    def _connect(self) -> sqlite3.Connection:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.index_path)
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS definitions (
+                path TEXT NOT NULL, name TEXT NOT NULL, qualname TEXT NOT NULL,
+                kind TEXT NOT NULL, start_line INTEGER, end_line INTEGER);
+            CREATE TABLE IF NOT EXISTS imports (
+                path TEXT NOT NULL, module TEXT NOT NULL, name TEXT, line INTEGER);
+            CREATE TABLE IF NOT EXISTS calls (
+                path TEXT NOT NULL, name TEXT NOT NULL, caller TEXT, line INTEGER);
+            CREATE INDEX IF NOT EXISTS definitions_name ON definitions (name);
+            CREATE INDEX IF NOT EXISTS definitions_path ON definitions (path);
+            CREATE INDEX IF NOT EXISTS imports_module ON imports (module);
+            CREATE INDEX IF NOT EXISTS imports_path ON imports (path);
+            CREATE INDEX IF NOT EXISTS calls_name ON calls (name);
+            CREATE INDEX IF NOT EXISTS calls_path ON calls (path);
+            """
+        )
+        return connection
+
+    def update(self, project_folder: str, paths: list) -> int:
+        """
+        Bring the index for a project up to date.
+
+        Args:
+            project_folder (str): The project folder, used to forget files that were deleted.
+            paths (list): All Python files currently in the project.
+
+        Returns:
+            int: The number of files that were (re-)parsed.
+        """
+        with self.lock:
+            connection = self._connect()
+            try:
+                known = dict(
+                    (path, (mtime, size))
+                    for path, mtime, size in connection.execute(
+                        "SELECT path, mtime, size FROM files WHERE path LIKE ? ESCAPE '\\'",
+                        (_like_prefix(project_folder),),
+                    )
+                )
+
+                changed = {}
+                for path in paths:
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    if known.get(path) != (stat.st_mtime, stat.st_size):
+                        changed[path] = (stat.st_mtime, stat.st_size)
+
+                removed = set(known).difference(paths)
+                parsed = self._parse(list(changed))
+
+                with connection:
+                    for path in removed.union(changed):
+                        for table in ("files", "definitions", "imports", "calls"):
+                            connection.execute(
+                                f"DELETE FROM {table} WHERE path = ?", (path,)
+                            )
+                    for path, symbols in parsed.items():
+                        connection.execute(
+                            "INSERT INTO files (path, mtime, size) VALUES (?, ?, ?)",
+                            (path, *changed[path]),
+                        )
+                        connection.executemany(
+                            "INSERT INTO definitions VALUES (?, ?, ?, ?, ?, ?)",
+                            [(path, *row) for row in symbols["definitions"]],
+                        )
+                        connection.executemany(
+                            "INSERT INTO imports VALUES (?, ?, ?, ?)",
+                            [(path, *row) for row in symbols["imports"]],
+                        )
+                        connection.executemany(
+                            "INSERT INTO calls VALUES (?, ?, ?, ?)",
+                            [(path, *row) for row in symbols["calls"]],
+                        )
+                return len(parsed)
+            finally:
+                connection.close()
+
+    def _parse(self, paths: list) -> dict:
+        if len(paths) < PROCESS_POOL_THRESHOLD:
+            return {path: parse_python_file(path) for path in paths}
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(
+                zip(paths, executor.map(parse_python_file, paths, chunksize=16))
+            )
+
+    def find_symbol(self, project_folder: str, name: str) -> list:
+        """
+        Find definitions of a function, method or class by name or qualified name.
+
+        Args:
+            project_folder (str): The project folder to search in.
+            name (str): A plain name like "query" or a qualified one like "AgentAbstract.query".
+
+        Returns:
+            list: Tuples of (path, qualname, kind, start_line, end_line).
+        """
+        column = "qualname" if "." in name else "name"
+        return self._query(
+            f"SELECT path, qualname, kind, start_line, end_line FROM definitions "
+            f"WHERE {column} = ? AND path LIKE ? ESCAPE '\\' ORDER BY path, start_line",
+            (name, _like_prefix(project_folder)),
+        )
+
+    def who_imports(self, project_folder: str, module: str) -> list:
+        """
+        Find the files that import a module or a name from it.
+
+        Args:
+            project_folder (str): The project folder to search in.
+            module (str): A module like "utils.config_loader" or a name like "load_config".
+
+        Returns:
+            list: Tuples of (path, module, name, line).
+        """
+        return self._query(
+            "SELECT path, module, name, line FROM imports "
+            "WHERE (module = ? OR module LIKE ? ESCAPE '\\' OR module LIKE ? ESCAPE '\\' "
+            "OR name = ?) AND path LIKE ? ESCAPE '\\' ORDER BY path, line",
+            (
+                module,
+                f"%.{_like_escape(module)}",
+                f"{_like_escape(module)}.%",
+                module,
+                _like_prefix(project_folder),
+            ),
+        )
+
+    def find_callers(self, project_folder: str, name: str) -> list:
+        """
+        Find the call sites of a function or method.
+
+        Args:
+            project_folder (str): The project folder to search in.
+            name (str): The called name, e.g. "load_config" or "scanner.find_files".
+
+        Returns:
+            list: Tuples of (path, called name, caller, line).
+        """
+        return self._query(
+            "SELECT path, name, caller, line FROM calls "
+            "WHERE (name = ? OR name LIKE ? ESCAPE '\\') AND path LIKE ? ESCAPE '\\' "
+            "ORDER BY path, line",
+            (name, f"%.{_like_escape(name)}", _like_prefix(project_folder)),
+        )
+
+    def _query(self, sql: str, parameters: tuple) -> list:
+        connection = self._connect()
+        try:
+            return connection.execute(sql, parameters).fetchall()
+        finally:
+            connection.close()
+
+
+def _like_escape(text: str) -> str:
+    """Quote LIKE wildcards, for use with ESCAPE '\\'."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _like_prefix(folder: str) -> str:
+    return _like_escape(str(folder).rstrip(os.sep)) + os.sep + "%"
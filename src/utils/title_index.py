@@ -0,0 +1,184 @@
+import heapq
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.fuzzy_matching import (
+    TrigramIndex,
+    normalize,
+    similarity,
+    token_overlap,
+    tokenize,
+    trigrams,
+)
+
+# A best match scoring at least this, and ahead of the runner-up by at least the margin,
+# is taken as the record the user meant.
+RESOLVE_SCORE = 0.7
+RESOLVE_MARGIN = 0.1
+# The only candidate for a title is taken from this lower score.
+SOLE_MATCH_SCORE = 0.6
+# Weaker matches down to this score are offered as candidates.
+CANDIDATE_SCORE = 0.4
+
+
+def _token_score(query_tokens: list, tokens: list) -> float:
+    """Like token_overlap, but a misspelled query token counts by its best edit similarity."""
+    if not query_tokens or not tokens:
+        return 0.0
+    exact = token_overlap(query_tokens, tokens)
+    fuzzy = sum(
+        max(similarity(query_token, token) for token in tokens)
+        for query_token in query_tokens
+    ) / len(query_tokens)
+    return max(exact, fuzzy)
+
+
+def _text_score(query: str, text: str) -> float:
+    """Score how well text matches a query, from token, trigram and edit-distance overlap."""
+    query_grams, text_grams = trigrams(query), trigrams(text)
+    if not query_grams or not text_grams:
+        return 0.0
+    gram_overlap = len(query_grams & text_grams) / len(query_grams | text_grams)
+    return (
+        0.45 * _token_score(tokenize(query), tokenize(text))
+        + 0.3 * gram_overlap
+        + 0.25 * similarity(query, text)
+    )
+
+
+class Resolution(NamedTuple):
+    """The record a title resolved to, if any, and the ranked (score, record) candidates."""
+
+    record: Optional[dict]
+    candidates: list
+
+
+class TitleIndex:
+    """
+    An in-memory index of the titles in a media store, to find records by approximate title.
+
+    Titles are indexed by trigrams and tokens after accent and punctuation folding, so a
+    lookup only scores records that share part of the query, and ranks them by token,
+    trigram and edit-distance overlap of the title and, for books, the author. Like the
+    similarity index it is built on first use and follows the store's changes.
+    """
+
+    _indexes: dict[str, "TitleIndex"] = {}
+    _indexes_lock = threading.Lock()
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.built = False
+        self.titles = TrigramIndex()
+        self.records: dict[tuple, dict] = {}
+
+    @classmethod
+    def for_path(cls, path: Path) -> "TitleIndex":
+        """Return the index shared by everything in this process that uses path."""
+        key = os.path.abspath(path)
+        with cls._indexes_lock:
+            index = cls._indexes.get(key)
+            if index is None:
+                index = cls._indexes[key] = cls()
+            return index
+
+    def _add(self, media_store, status: str, record: dict):
+        key = (status, media_store.record_key(record))
+        self.records[key] = record
+        self.titles.add(key, str(record.get("title") or ""))
+
+    def _remove(self, media_store, status: str, record: dict):
+        key = (status, media_store.record_key(record))
+        self.records.pop(key, None)
+        self.titles.remove(key)
+
+    def _ensure_built(self, media_store):
+        if self.built and len(self.records) == media_store.count():
+            return
+        self.titles = TrigramIndex()
+        self.records = {}
+        data = media_store.load()
+        for status in media_store.statuses:
+            for record in data.get(status, []):
+                self._add(media_store, status, record)
+        self.built = True
+
+    def record_changes(self, media_store, changes: list):
+        """
+        Apply the changes a media store just made, if the index has been built.
+
+        Args:
+            media_store (MediaStore): The store that changed.
+            changes (list): (status, record, sign) tuples, as for MediaStats.
+        """
+        with self.lock:
+            if not self.built:
+                return
+            for status, record, sign in changes:
+                if sign > 0:
+                    self._add(media_store, status, record)
+                else:
+                    self._remove(media_store, status, record)
+
+    def resolve(
+        self,
+        media_store,
+        status: str,
+        title: str,
+        author: Optional[str] = None,
+        limit: int = 5,
+    ) -> Resolution:
+        """
+        Find the record with a status that a possibly misspelled title refers to.
+
+        Args:
+            media_store (MediaStore): The store to search.
+            status (str): The status the record has, e.g. "to_read".
+            title (str): The title as the user wrote it.
+            author (Optional[str]): The author as the user wrote it, used to rank and
+                disambiguate books. Ignored if empty or if records have no author.
+            limit (int): Maximum number of candidates.
+
+        Returns:
+            Resolution: The record, if exactly one title matches after normalization or
+                one match is clearly best, and the best candidates either way.
+        """
+        with self.lock:
+            self._ensure_built(media_store)
+            keys = [key for key in self.titles.candidates(title) if key[0] == status]
+            records = [self.records[key] for key in keys]
+
+        scored = []
+        for record in records:
+            score = _text_score(title, str(record.get("title") or ""))
+            if author and record.get("author"):
+                score = 0.8 * score + 0.2 * _text_score(author, str(record["author"]))
+            if score >= CANDIDATE_SCORE:
+                scored.append((round(score, 3), record))
+        candidates = heapq.nlargest(limit, scored, key=lambda item: item[0])
+
+        exact = [
+            record
+            for record in records
+            if normalize(str(record.get("title") or "")) == normalize(title)
+            and (
+                not author
+                or not record.get("author")
+                or _text_score(author, str(record["author"])) >= RESOLVE_SCORE
+            )
+        ]
+        if len(exact) == 1:
+            return Resolution(exact[0], candidates)
+        if exact:
+            return Resolution(None, candidates)
+
+        if len(candidates) == 1 and candidates[0][0] >= SOLE_MATCH_SCORE:
+            return Resolution(candidates[0][1], candidates)
+        if len(candidates) > 1 and candidates[0][0] >= RESOLVE_SCORE:
+            if candidates[0][0] - candidates[1][0] >= RESOLVE_MARGIN:
+                return Resolution(candidates[0][1], candidates)
+        return Resolution(None, candidates)
@@ -0,0 +1,101 @@
+import os
+from typing import Iterator
+
+
+def render_tree(
+    walk_entries: list,
+    root: str,
+    max_depth: int = 6,
+    max_entries: int = 400,
+    max_bytes: int = 16_000,
+    max_files_per_dir: int = 25,
+) -> str:
+    """
+    Render an already-walked directory listing as a `tree`-style string.
+
+    The output is bounded so it can go straight into an LLM prompt: folders deeper
+    than max_depth are not expanded, folders with more than max_files_per_dir files
+    are collapsed to "… N more files", and rendering stops once max_entries lines or
+    max_bytes characters have been produced.
+
+    Args:
+        walk_entries (list): (dirpath, dirnames, filenames) tuples, like os.walk. Folders
+            pruned during the walk are not listed.
+        root (str): The directory to render.
+        max_depth (int): Number of folder levels to expand below the root.
+        max_entries (int): Maximum number of file and folder lines.
+        max_bytes (int): Maximum size of the rendered tree in bytes.
+        max_files_per_dir (int): Files listed per folder before the rest are collapsed.
+
+    Returns:
+        str: The rendered tree followed by a folder and file count summary.
+    """
+    root = str(root)
+    listing = {
+        path: (dirnames, [name for name in filenames if not name.startswith(".")])
+        for path, dirnames, filenames in walk_entries
+        if path == root or path.startswith(root + os.sep)
+    }
+    folders = sum(len(dirnames) for dirnames, _ in listing.values())
+    files = sum(len(filenames) for _, filenames in listing.values())
+
+    lines = [root]
+    size = len(root.encode()) + 1
+    lines_iter = _tree_lines(listing, root, "", 1, max_depth, max_files_per_dir)
+    for line in lines_iter:
+        line_size = len(line.encode()) + 1
+        if len(lines) - 1 >= max_entries or size + line_size > max_bytes:
+            remaining = 1 + sum(1 for _ in lines_iter)
+            lines.append(f"… output truncated, {remaining} more lines not shown")
+            break
+        lines.append(line)
+        size += line_size
+
+    lines.append("")
+    lines.append(f"{folders} directories, {files} files")
+    return "\n".join(lines)
+
+
+def _tree_lines(
+    listing: dict,
+    path: str,
+    prefix: str,
+    depth: int,
+    max_depth: int,
+    max_files_per_dir: int,
+) -> Iterator[str]:
+    dirnames, filenames = listing.get(path, ([], []))
+    shown_files = sorted(filenames)[:max_files_per_dir]
+    collapsed = len(filenames) - len(shown_files)
+
+    children = sorted(
+        [(name, True) for name in dirnames] + [(name, False) for name in shown_files],
+        key=lambda child: child[0].lower(),
+    )
+
+    for index, (name, is_dir) in enumerate(children):
+        last = index == len(children) - 1 and not collapsed
+        child_path = os.path.join(path, name)
+        expand = is_dir and depth < max_depth
+        suffix = (
+            "/ …" if is_dir and not expand and _has_entries(listing, child_path) else ""
+        )
+
+        yield f"{prefix}{'└── ' if last else '├── '}{name}{suffix}"
+        if expand:
+            yield from _tree_lines(
+                listing,
+                child_path,
+                prefix + ("    " if last else "│   "),
+                depth + 1,
+                max_depth,
+                max_files_per_dir,
+            )
+
+    if collapsed:
+        yield f"{prefix}└── … {collapsed} more files"
+
+
+def _has_entries(listing: dict, path: str) -> bool:
+    dirnames, filenames = listing.get(path, ([], []))
+    return bool(dirnames or filenames)
@@ -1,33 +1,103 @@
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from pathlib import Path
+from typing import Optional
+import httplib2
 import os
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.json_store import JsonStore
+
+CHANNEL_CACHE_PATH = (
+    Path(__file__).parent.parent.parent / "data" / "youtube_channel_cache.json"
+)
+# Limits of the YouTube Data API: IDs per channels/videos list call, and the number of
+# calls it recommends per batch HTTP request.
+MAX_IDS_PER_CALL = 50
+MAX_CALLS_PER_BATCH = 50
 
 
 class YouTubeMonitor:
-    def __init__(self):
-        """Initialize the YouTube API client with the API key."""
+    def __init__(
+        self, timeout: Optional[float] = None, cache_path: Path = CHANNEL_CACHE_PATH
+    ):
+        """
+        Initialize the YouTube API client with the API key.
+
+        The client is not thread-safe; use one YouTubeMonitor per thread. timeout bounds
+        each HTTP request, in seconds. Channel IDs and uploads playlists, which almost
+        never change, are cached in cache_path and shared by all monitors.
+        """
         api_key = os.getenv("YOUTUBE_API_KEY")
-        self.youtube = build("youtube", "v3", developerKey=api_key)
+        http = httplib2.Http(timeout=timeout) if timeout else None
+        self.youtube = build("youtube", "v3", developerKey=api_key, http=http)
+        self.cache = JsonStore.for_path(cache_path, default={})
+
+    def _cache_channel(
+        self, channel: dict, channel_url_or_handle: Optional[str] = None
+    ):
+        """Remember a channels().list item's ID, uploads playlist and the URL used to find it."""
+        uploads_playlist = channel["contentDetails"]["relatedPlaylists"]["uploads"]
+        with self.cache.update() as cache:
+            cache.setdefault("uploads_playlists", {})[channel["id"]] = uploads_playlist
+            if channel_url_or_handle:
+                cache.setdefault("channel_ids", {})[channel_url_or_handle] = channel[
+                    "id"
+                ]
+
+    def get_uploads_playlist(self, channel_id: str) -> str:
+        """Return the ID of the playlist holding a channel's uploads."""
+        cached = self.cache.read().get("uploads_playlists", {}).get(channel_id)
+        if cached:
+            return cached
 
-    def get_recent_videos(self, channel_id: str, limit: int = 10):
-        """Fetch recent videos from a YouTube channel"""
         channel_response = (
             self.youtube.channels().list(part="contentDetails", id=channel_id).execute()
         )
+        if not channel_response.get("items"):
+            raise ValueError(f"Channel {channel_id} not found")
+        self._cache_channel(channel_response["items"][0])
+        return channel_response["items"][0]["contentDetails"]["relatedPlaylists"][
+            "uploads"
+        ]
 
-        uploads_playlist = channel_response["items"][0]["contentDetails"][
-            "relatedPlaylists"
-        ]["uploads"]
+    def forget_channel(self, channel_id: str):
+        """Drop a channel's cached uploads playlist, e.g. after it stopped resolving."""
+        with self.cache.update() as cache:
+            cache.get("uploads_playlists", {}).pop(channel_id, None)
 
-        playlist_response = (
-            self.youtube.playlistItems()
-            .list(part="snippet", playlistId=uploads_playlist, maxResults=limit)
-            .execute()
-        )
+    def get_recent_videos(self, channel_id: str, limit: int = 10):
+        """Fetch recent videos from a YouTube channel"""
+        uploads_playlist = self.get_uploads_playlist(channel_id)
+
+        try:
+            playlist_response = (
+                self.youtube.playlistItems()
+                .list(part="snippet", playlistId=uploads_playlist, maxResults=limit)
+                .execute()
+            )
+        except HttpError as e:
+            if e.resp.status != 404:
+                raise
+            # The cached playlist is gone; look it up again once.
+            self.forget_channel(channel_id)
+            playlist_response = (
+                self.youtube.playlistItems()
+                .list(
+                    part="snippet",
+                    playlistId=self.get_uploads_playlist(channel_id),
+                    maxResults=limit,
+                )
+                .execute()
+            )
 
         video_ids = [
             item["snippet"]["resourceId"]["videoId"]
             for item in playlist_response["items"]
         ]
+        if not video_ids:
+            return []
 
         videos_response = (
             self.youtube.videos()
@@ -37,24 +107,205 @@ class YouTubeMonitor:
 
         return videos_response["items"]
 
+    def _execute_batch(self, requests: dict) -> dict:
+        """
+        Send API calls as batch HTTP requests.
+
+        Each batch is one round trip, bounded by the client's timeout. A round trip that
+        fails only fails the calls it carried.
+
+        Args:
+            requests (dict): Unexecuted API calls by key.
+
+        Returns:
+            dict: Each key's response, or the exception its call or round trip raised.
+        """
+        results = {}
+
+        def callback(key):
+            return lambda request_id, response, exception: results.__setitem__(
+                key, exception if exception is not None else response
+            )
+
+        items = list(requests.items())
+        for start in range(0, len(items), MAX_CALLS_PER_BATCH):
+            chunk = items[start : start + MAX_CALLS_PER_BATCH]
+            batch = self.youtube.new_batch_http_request()
+            for key, request in chunk:
+                batch.add(request, callback=callback(key))
+            try:
+                batch.execute()
+            except Exception as e:
+                for key, _ in chunk:
+                    results.setdefault(key, e)
+        return results
+
+    def get_uploads_playlists(self, channel_ids: list) -> dict:
+        """
+        Return the uploads playlist of each channel, looking up uncached ones in one batch.
+
+        Returns:
+            dict: For each channel ID, its uploads playlist ID, or the exception that
+                prevented finding it.
+        """
+        cached = self.cache.read().get("uploads_playlists", {})
+        playlists = {
+            channel_id: cached[channel_id]
+            for channel_id in channel_ids
+            if channel_id in cached
+        }
+        missing = [channel_id for channel_id in channel_ids if channel_id not in cached]
+        chunks = [
+            missing[start : start + MAX_IDS_PER_CALL]
+            for start in range(0, len(missing), MAX_IDS_PER_CALL)
+        ]
+        responses = self._execute_batch(
+            {
+                index: self.youtube.channels().list(
+                    part="contentDetails", id=",".join(chunk)
+                )
+                for index, chunk in enumerate(chunks)
+            }
+        )
+        for index, chunk in enumerate(chunks):
+            response = responses.get(index)
+            if isinstance(response, Exception):
+                playlists.update((channel_id, response) for channel_id in chunk)
+                continue
+            for channel in response.get("items", []):
+                self._cache_channel(channel)
+                playlists[channel["id"]] = channel["contentDetails"][
+                    "relatedPlaylists"
+                ]["uploads"]
+            for channel_id in chunk:
+                playlists.setdefault(
+                    channel_id, ValueError(f"Channel {channel_id} not found")
+                )
+        return playlists
+
+    def get_recent_videos_for_channels(
+        self, channel_ids: list, limit: int = 10, known_ids: Optional[dict] = None
+    ) -> dict:
+        """
+        Fetch the recent videos of many channels with as few round trips as possible.
+
+        The playlistItems calls of all channels go out in batch HTTP requests, and the
+        video IDs of all channels are then looked up 50 per videos().list call, also
+        batched. For a few dozen channels that is about three round trips and one videos
+        quota unit per 50 videos, instead of a videos call per channel. Each round trip
+        is bounded by the client's timeout, and one that fails or times out only fails
+        the channels it carried.
+
+        Args:
+            channel_ids (list): Channel IDs.
+            limit (int): Number of recent videos per channel.
+            known_ids (dict): For each channel ID, IDs of videos the caller already has;
+                they are not looked up or returned.
+
+        Returns:
+            dict: For each channel ID, its videos, newest first, or the exception that
+                prevented fetching them.
+        """
+        known_ids = known_ids or {}
+        playlists = self.get_uploads_playlists(channel_ids)
+        playlist_responses = self._execute_batch(
+            {
+                channel_id: self.youtube.playlistItems().list(
+                    part="snippet", playlistId=playlist, maxResults=limit
+                )
+                for channel_id, playlist in playlists.items()
+                if not isinstance(playlist, Exception)
+            }
+        )
+
+        results = {}
+        video_ids = {}
+        for channel_id in channel_ids:
+            response = playlist_responses.get(channel_id)
+            if isinstance(playlists[channel_id], Exception):
+                results[channel_id] = playlists[channel_id]
+            elif isinstance(response, Exception):
+                if isinstance(response, HttpError) and response.resp.status == 404:
+                    self.forget_channel(channel_id)
+                results[channel_id] = response
+            else:
+                known = known_ids.get(channel_id, ())
+                video_ids[channel_id] = [
+                    item["snippet"]["resourceId"]["videoId"]
+                    for item in response["items"]
+                    if item["snippet"]["resourceId"]["videoId"] not in known
+                ]
+
+        all_ids = [video_id for ids in video_ids.values() for video_id in ids]
+        chunks = [
+            all_ids[start : start + MAX_IDS_PER_CALL]
+            for start in range(0, len(all_ids), MAX_IDS_PER_CALL)
+        ]
+        video_responses = self._execute_batch(
+            {
+                index: self.youtube.videos().list(
+                    part="snippet,contentDetails,statistics",
+                    id=",".join(chunk),
+                )
+                for index, chunk in enumerate(chunks)
+            }
+        )
+
+        videos, failures = {}, {}
+        for index, chunk in enumerate(chunks):
+            response = video_responses.get(index)
+            for video_id in chunk:
+                if isinstance(response, Exception):
+                    failures[video_id] = response
+            if not isinstance(response, Exception):
+                videos.update((video["id"], video) for video in response["items"])
+
+        for channel_id, ids in video_ids.items():
+            failure = next((failures[i] for i in ids if i in failures), None)
+            results[channel_id] = (
+                failure if failure else [videos[i] for i in ids if i in videos]
+            )
+        return results
+
+    def cached_channel_id(self, channel_url_or_handle: str) -> Optional[str]:
+        """Return a channel's ID if it can be known without an API call, otherwise None."""
+        channel_url_or_handle = channel_url_or_handle.strip().rstrip("/")
+        if "/channel/" in channel_url_or_handle:
+            return channel_url_or_handle.split("/channel/")[-1]
+        return self.cache.read().get("channel_ids", {}).get(channel_url_or_handle)
+
     def get_channel_id_from_url(self, channel_url_or_handle):
         """Convert any YouTube channel URL/handle to channel ID"""
+        cached = self.cached_channel_id(channel_url_or_handle)
+        if cached:
+            return cached
+        channel_url_or_handle = channel_url_or_handle.strip().rstrip("/")
 
+        # Ask for contentDetails too, so the uploads playlist is cached in the same call.
         if "@" in channel_url_or_handle:
             handle = channel_url_or_handle.split("@")[-1]
             response = (
-                self.youtube.channels().list(part="id", forHandle=handle).execute()
+                self.youtube.channels()
+                .list(part="id,contentDetails", forHandle=handle)
+                .execute()
             )
 
         elif "/c/" in channel_url_or_handle:
             custom_name = channel_url_or_handle.split("/c/")[-1]
             response = (
                 self.youtube.channels()
-                .list(part="id", forUsername=custom_name)
+                .list(part="id,contentDetails", forUsername=custom_name)
                 .execute()
             )
 
-        elif "/channel/" in channel_url_or_handle:
-            return channel_url_or_handle.split("/channel/")[-1]
+        else:
+            response = (
+                self.youtube.channels()
+                .list(part="id,contentDetails", forHandle=channel_url_or_handle)
+                .execute()
+            )
 
-        return response["items"][0]["id"] if response["items"] else None
+        if not response.get("items"):
+            return None
+        self._cache_channel(response["items"][0], channel_url_or_handle)
+        return response["items"][0]["id"]
@@ -0,0 +1,39 @@
+import os
+
+from utils.directory_scanning import DirectoryScanner
+
+
+def _scanner(tmp_path, folders) -> DirectoryScanner:
+    for folder in folders:
+        (tmp_path / folder).mkdir(parents=True)
+    return DirectoryScanner(tmp_path, use_index=False)
+
+
+def _names(matches):
+    return [os.path.basename(folder) for folder, _ in matches]
+
+
+def test_a_project_named_after_the_query_is_found_first(tmp_path):
+    scanner = _scanner(
+        tmp_path,
+        [
+            "project-charon",
+            "archive/charon-old",
+            "notes/charon_notes",
+            "a/b/c/d/charon",
+        ],
+    )
+
+    assert _names(scanner.find_folders("charon", top_k=1)) == ["project-charon"]
+
+
+def test_whole_words_outrank_partial_and_misspelled_names(tmp_path):
+    scanner = _scanner(tmp_path, ["charonx", "chiron", "x/y/old-charon"])
+
+    assert _names(scanner.find_folders("charon")) == ["old-charon", "charonx", "chiron"]
+
+
+def test_an_exact_name_wins_at_the_same_depth(tmp_path):
+    scanner = _scanner(tmp_path, ["project-charon", "charon"])
+
+    assert _names(scanner.find_folders("charon")) == ["charon", "project-charon"]
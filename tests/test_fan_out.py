@@ -0,0 +1,90 @@
+import threading
+import time
+
+from utils.fan_out import fan_out
+
+
+def _sleep(seconds, value=None):
+    def call():
+        time.sleep(seconds)
+        return value
+
+    return call
+
+
+def test_results_keep_the_order_of_the_calls():
+    results = fan_out({"b": lambda: 2, "a": lambda: 1}, max_workers=2, timeout=1)
+
+    assert list(results) == ["b", "a"]
+    assert [result.value for result in results.values()] == [2, 1]
+    assert all(result.error is None for result in results.values())
+
+
+def test_a_failing_call_does_not_fail_the_others():
+    def fail():
+        raise ValueError("boom")
+
+    results = fan_out({"ok": lambda: "fine", "bad": fail}, max_workers=2, timeout=1)
+
+    assert results["ok"].value == "fine"
+    assert results["bad"].value is None
+    assert results["bad"].error == "boom"
+
+
+def test_a_slow_call_times_out_without_holding_up_the_others():
+    release = threading.Event()
+    try:
+        started = time.monotonic()
+        results = fan_out(
+            {"hung": release.wait, "quick": _sleep(0.05, "done")},
+            max_workers=2,
+            timeout=0.3,
+        )
+        elapsed = time.monotonic() - started
+    finally:
+        release.set()
+
+    assert results["quick"].value == "done"
+    assert results["hung"].error == "timed out after 0.3s"
+    assert elapsed < 1.0
+
+
+def test_queued_calls_get_their_own_timeout():
+    # With one worker the second call starts after the first, beyond the first
+    # call's timeout, but still has the full timeout of its own.
+    results = fan_out(
+        {"first": _sleep(0.2, 1), "second": _sleep(0.2, 2)},
+        max_workers=1,
+        timeout=0.3,
+    )
+
+    assert [result.value for result in results.values()] == [1, 2]
+    assert all(result.error is None for result in results.values())
+    assert results["second"].seconds < 0.3
+
+
+def test_calls_queued_behind_a_hung_call_give_up_waiting_for_a_worker():
+    release = threading.Event()
+    try:
+        results = fan_out(
+            {"hung": release.wait, "queued": lambda: "never"},
+            max_workers=1,
+            timeout=0.2,
+        )
+    finally:
+        release.set()
+
+    assert results["hung"].error == "timed out after 0.2s"
+    assert results["queued"].error == "timed out waiting for a free worker"
+
+
+def test_per_call_timeouts_override_the_default():
+    results = fan_out(
+        {"unbounded": _sleep(0.3, "done"), "bounded": _sleep(0.3, "late")},
+        max_workers=2,
+        timeout=0.1,
+        timeouts={"unbounded": None},
+    )
+
+    assert results["unbounded"].value == "done"
+    assert results["bounded"].error == "timed out after 0.1s"
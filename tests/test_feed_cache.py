@@ -0,0 +1,74 @@
+from utils.feed_cache import FeedCache
+
+
+def _item(item_id, date):
+    return {"id": item_id, "date": date, "line": f"- {item_id}"}
+
+
+class _Fetch:
+    """Records what it was asked for and returns the given items."""
+
+    def __init__(self, items):
+        self.items = items
+        self.known_ids = []
+
+    def __call__(self, known_ids):
+        self.known_ids.append(known_ids)
+        return self.items
+
+
+def test_a_fresh_source_is_served_from_the_cache(tmp_path):
+    cache = FeedCache(tmp_path / "feed_cache.json")
+    cache.merge("feed", [_item("a", "2026-01-01")], limit=1)
+    fetch = _Fetch([_item("b", "2026-01-02")])
+
+    assert cache.sync("feed", ttl=60, limit=1, fetch=fetch) == [
+        _item("a", "2026-01-01")
+    ]
+    assert fetch.known_ids == []
+
+
+def test_a_stale_source_fetches_only_the_new_items(tmp_path):
+    cache = FeedCache(tmp_path / "feed_cache.json")
+    cache.merge("feed", [_item("a", "2026-01-01")], limit=1)
+    fetch = _Fetch([_item("b", "2026-01-02")])
+
+    items = cache.sync("feed", ttl=0, limit=1, fetch=fetch)
+
+    assert fetch.known_ids == [{"a"}]
+    assert [item["id"] for item in items] == ["b", "a"]
+    assert cache.watermark("feed") == "2026-01-02"
+
+
+def test_asking_for_more_items_than_were_fetched_refetches(tmp_path):
+    cache = FeedCache(tmp_path / "feed_cache.json")
+    cache.merge("feed", [_item("a", "2026-01-02")], limit=1)
+
+    assert cache.is_fresh("feed", ttl=60, limit=1)
+    assert not cache.is_fresh("feed", ttl=60, limit=3)
+
+    fetch = _Fetch([_item("b", "2026-01-01")])
+    cache.sync("feed", ttl=60, limit=3, fetch=fetch)
+
+    assert fetch.known_ids == [{"a"}]
+    assert cache.is_fresh("feed", ttl=60, limit=3)
+
+
+def test_items_beyond_the_cap_are_dropped_with_their_seen_ids(tmp_path):
+    cache = FeedCache(tmp_path / "feed_cache.json", max_items=2)
+    cache.merge("feed", [_item("a", "2026-01-01"), _item("b", "2026-01-02")], limit=2)
+    cache.take_unseen("feed", [_item("a", "2026-01-01"), _item("b", "2026-01-02")])
+
+    items = cache.merge("feed", [_item("c", "2026-01-03")], limit=2)
+
+    assert [item["id"] for item in items] == ["c", "b"]
+    assert cache.entry("feed")["seen"] == ["b"]
+
+
+def test_take_unseen_offers_each_item_once(tmp_path):
+    cache = FeedCache(tmp_path / "feed_cache.json")
+    items = [_item("a", "2026-01-01"), _item("b", "2026-01-02")]
+
+    assert cache.take_unseen("feed", items[:1]) == items[:1]
+    assert cache.take_unseen("feed", items) == items[1:]
+    assert cache.take_unseen("feed", items) == []
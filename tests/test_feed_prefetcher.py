@@ -0,0 +1,46 @@
+import random
+
+from schemas.config_schema import RecommenderAgentConfig
+from utils.feed_cache import FeedCache
+from utils.feed_prefetcher import FeedPrefetcher
+
+
+def _prefetcher(tmp_path) -> FeedPrefetcher:
+    config = RecommenderAgentConfig.model_construct(
+        prefetch_backoff_base=60, prefetch_backoff_max=3600
+    )
+    return FeedPrefetcher(config, FeedCache(tmp_path / "feed_cache.json"))
+
+
+def test_backoff_doubles_with_each_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(random, "uniform", lambda low, high: 1.0)
+    monkeypatch.setattr("time.time", lambda: 0.0)
+    prefetcher = _prefetcher(tmp_path)
+
+    delays = []
+    for _ in range(3):
+        prefetcher._backoff("feed", "boom")
+        delays.append(prefetcher.retry_at["feed"])
+
+    assert delays == [60, 120, 240]
+
+
+def test_jittered_backoff_never_exceeds_the_maximum(tmp_path, monkeypatch):
+    monkeypatch.setattr(random, "uniform", lambda low, high: high)
+    monkeypatch.setattr("time.time", lambda: 0.0)
+    prefetcher = _prefetcher(tmp_path)
+
+    for _ in range(10):
+        prefetcher._backoff("feed", "boom")
+
+    assert prefetcher.retry_at["feed"] == 3600
+
+
+def test_success_forgets_the_failures(tmp_path):
+    prefetcher = _prefetcher(tmp_path)
+    prefetcher._backoff("feed", "boom")
+
+    prefetcher._succeeded("feed")
+
+    assert "feed" not in prefetcher.failures
+    assert "feed" not in prefetcher.retry_at
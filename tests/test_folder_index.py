@@ -0,0 +1,57 @@
+import os
+import time
+
+from utils.directory_scanning import DirectoryScanner
+from utils.folder_index import FolderIndex
+
+
+def _tree(tmp_path):
+    root = tmp_path / "root"
+    for folder in ("src/app", "generated/out", "node_modules/pkg", ".cache", "docs"):
+        (root / folder).mkdir(parents=True)
+    (root / ".gitignore").write_text("generated/\n")
+    return root
+
+
+def _index(tmp_path, root, use_gitignore=True) -> FolderIndex:
+    return FolderIndex(root, tmp_path / "folder_index.sqlite", use_gitignore)
+
+
+def _touch_later(path):
+    later = time.time() + 5
+    os.utime(path, (later, later))
+
+
+def test_the_index_skips_the_same_folders_as_a_walk(tmp_path):
+    root = _tree(tmp_path)
+
+    indexed = _index(tmp_path, root).refresh()
+    walked = DirectoryScanner(root, use_index=False).subfolders
+
+    assert sorted(indexed) == sorted(walked)
+    assert str(root / "generated") not in indexed
+
+
+def test_refreshes_and_reported_changes_apply_the_gitignore(tmp_path):
+    root = _tree(tmp_path)
+    index = _index(tmp_path, root)
+    index.refresh()
+
+    (root / "docs" / "generated").mkdir()
+    (root / "docs" / "api").mkdir()
+    _touch_later(root / "docs")
+    refreshed = index.refresh()
+    (root / "src" / "generated").mkdir()
+    added = index.apply_changes([str(root / "src" / "generated")], [])
+
+    assert str(root / "docs" / "api") in refreshed
+    assert str(root / "docs" / "generated") not in refreshed
+    assert added == []
+
+
+def test_an_index_built_under_other_rules_is_rebuilt(tmp_path):
+    root = _tree(tmp_path)
+    unfiltered = _index(tmp_path, root, use_gitignore=False)
+    assert str(root / "generated") in unfiltered.refresh()
+
+    assert str(root / "generated") not in _index(tmp_path, root).refresh()
@@ -0,0 +1,48 @@
+import json
+import time
+
+from utils.json_log_store import JsonLogStore
+
+NIGHT = {"date": "2026-01-01", "sleep_duration": 480}
+
+
+def test_writes_go_to_the_log_until_the_store_is_closed(tmp_path):
+    path = tmp_path / "sleep.json"
+    path.write_text(json.dumps({"sleep_data": []}))
+    store = JsonLogStore(path)
+
+    store.apply([{"op": "append", "path": ["sleep_data"], "value": NIGHT}])
+
+    assert json.loads(path.read_text()) == {"sleep_data": []}
+    store.close()
+    assert json.loads(path.read_text()) == {"sleep_data": [NIGHT]}
+
+
+def test_a_log_left_by_another_process_is_folded_in_on_first_read(tmp_path):
+    path = tmp_path / "sleep.json"
+    path.write_text(json.dumps({"sleep_data": []}))
+    JsonLogStore(path).apply([{"op": "append", "path": ["sleep_data"], "value": NIGHT}])
+
+    assert JsonLogStore(path).read() == {"sleep_data": [NIGHT]}
+    assert json.loads(path.read_text()) == {"sleep_data": [NIGHT]}
+
+
+def test_a_large_log_is_compacted_in_the_background(tmp_path):
+    path = tmp_path / "sleep.json"
+    store = JsonLogStore(path, default={}, compact_bytes=0)
+
+    store.apply([{"op": "append", "path": ["sleep_data"], "value": NIGHT}])
+
+    deadline = time.monotonic() + 5
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert json.loads(path.read_text()) == {"sleep_data": [NIGHT]}
+
+
+def test_a_log_from_before_a_hand_edit_is_ignored(tmp_path):
+    path = tmp_path / "sleep.json"
+    path.write_text(json.dumps({"sleep_data": []}))
+    JsonLogStore(path).apply([{"op": "append", "path": ["sleep_data"], "value": NIGHT}])
+    path.write_text(json.dumps({"sleep_data": [], "edited": True}))
+
+    assert JsonLogStore(path).read() == {"sleep_data": [], "edited": True}
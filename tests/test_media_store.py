@@ -0,0 +1,110 @@
+import json
+import sqlite3
+import threading
+
+from utils.media_store import (
+    BOOK_DATE_FIELDS,
+    BOOK_KEY_FIELDS,
+    BOOK_STATUSES,
+    JsonMediaStore,
+    SqliteMediaStore,
+    open_media_store,
+)
+
+DUNE = {"title": "Dune", "author": "Frank Herbert"}
+
+
+def _sqlite_store(tmp_path, migrate_from=None) -> SqliteMediaStore:
+    return SqliteMediaStore(
+        tmp_path / "book_list.sqlite",
+        BOOK_STATUSES,
+        BOOK_KEY_FIELDS,
+        BOOK_DATE_FIELDS,
+        migrate_from,
+    )
+
+
+def test_json_is_the_default_backend(tmp_path):
+    store = open_media_store(
+        tmp_path / "book_list.json", BOOK_STATUSES, BOOK_KEY_FIELDS, BOOK_DATE_FIELDS
+    )
+
+    assert isinstance(store, JsonMediaStore)
+
+
+def test_sqlite_stores_are_shared_per_path(tmp_path):
+    def open_store():
+        return open_media_store(
+            tmp_path / "book_list.json",
+            BOOK_STATUSES,
+            BOOK_KEY_FIELDS,
+            BOOK_DATE_FIELDS,
+            backend="sqlite",
+        )
+
+    assert open_store() is open_store()
+
+
+def test_concurrent_writers_add_a_record_once(tmp_path):
+    # Separate instances, like separate processes, share only the database.
+    stores = [_sqlite_store(tmp_path) for _ in range(8)]
+    added = []
+    threads = [
+        threading.Thread(
+            target=lambda store=store: added.append(store.add("read", DUNE))
+        )
+        for store in stores
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert added.count(True) == 1
+    assert stores[0].count() == 1
+
+
+def test_the_json_file_is_imported_once(tmp_path):
+    json_path = tmp_path / "book_list.json"
+    json_path.write_text(json.dumps({"read": [DUNE, DUNE]}))
+    store = _sqlite_store(tmp_path, json_path)
+
+    assert store.load()["read"] == [DUNE]
+
+    json_path.write_text(json.dumps({"read": [DUNE, {"title": "Emma"}]}))
+    assert _sqlite_store(tmp_path, json_path).count() == 1
+
+
+def test_moving_onto_an_existing_key_replaces_it(tmp_path):
+    store = _sqlite_store(tmp_path)
+    store.add("read", {**DUNE, "rating": 3})
+    store.add("to_read", DUNE)
+
+    store.move(DUNE, "to_read", "read", {"rating": 5})
+
+    assert store.load() == {"to_read": [], "read": [{**DUNE, "rating": 5}]}
+
+
+def test_duplicates_from_before_the_unique_index_are_dropped(tmp_path):
+    connection = sqlite3.connect(tmp_path / "book_list.sqlite")
+    connection.executescript(
+        """
+        CREATE TABLE records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, status TEXT NOT NULL,
+            record_key TEXT NOT NULL, data TEXT NOT NULL);
+        CREATE INDEX records_status_key ON records (status, record_key);
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        INSERT INTO meta VALUES ('migrated_from', '');
+        """
+    )
+    store = _sqlite_store(tmp_path)
+    row = ("read", store._key_column(DUNE), json.dumps(DUNE))
+    with connection:
+        connection.executemany(
+            "INSERT INTO records (status, record_key, data) VALUES (?, ?, ?)",
+            [row, row],
+        )
+    connection.close()
+
+    assert store.count() == 1
+    assert store.add("read", DUNE) is False
@@ -0,0 +1,87 @@
+import os
+import threading
+
+from utils.parallel_walker import parallel_walk
+from utils.skip_rules import SkipRules
+
+
+class FailingRules(SkipRules):
+    def filter(self, path, dirnames, filenames):
+        raise ValueError("bad rules")
+
+
+def _walk_in_thread(top, rules):
+    """Run parallel_walk on a thread, so a hang fails the test instead of blocking."""
+    outcome = {}
+
+    def walk():
+        try:
+            outcome["result"] = list(parallel_walk(top, rules))
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=walk, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "parallel_walk hung"
+    return outcome
+
+
+def test_walks_every_directory(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "file.txt").write_text("x")
+    (tmp_path / "c").mkdir()
+
+    outcome = _walk_in_thread(tmp_path, SkipRules())
+
+    walked = {path: (set(dirs), set(files)) for path, dirs, files in outcome["result"]}
+    assert walked == {
+        str(tmp_path): ({"a", "c"}, set()),
+        str(tmp_path / "a"): ({"b"}, set()),
+        str(tmp_path / "a" / "b"): (set(), {"file.txt"}),
+        str(tmp_path / "c"): (set(), set()),
+    }
+
+
+def test_rule_errors_reach_the_caller(tmp_path):
+    (tmp_path / "a").mkdir()
+
+    outcome = _walk_in_thread(tmp_path, FailingRules())
+
+    assert isinstance(outcome.get("error"), ValueError)
+
+
+def test_rule_errors_in_subdirectories_reach_the_caller(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+
+    class FailBelowTop(SkipRules):
+        def filter(self, path, dirnames, filenames):
+            if path != str(tmp_path):
+                raise ValueError("bad rules")
+            return dirnames, filenames
+
+    outcome = _walk_in_thread(tmp_path, FailBelowTop())
+
+    assert isinstance(outcome.get("error"), ValueError)
+
+
+def test_unreadable_directories_are_skipped_like_os_walk(tmp_path, monkeypatch):
+    (tmp_path / "locked" / "inner").mkdir(parents=True)
+    (tmp_path / "open").mkdir()
+    (tmp_path / "open" / "file.txt").write_text("x")
+    scandir = os.scandir
+
+    def failing_scandir(path):
+        if str(path) == str(tmp_path / "locked"):
+            raise PermissionError(13, "Permission denied", str(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", failing_scandir)
+    outcome = _walk_in_thread(tmp_path, SkipRules())
+
+    walked = {path: (set(dirs), set(files)) for path, dirs, files in outcome["result"]}
+    expected = {
+        path: (set(dirs), set(files)) for path, dirs, files in os.walk(tmp_path)
+    }
+    assert walked == expected
+    assert str(tmp_path / "locked") not in walked
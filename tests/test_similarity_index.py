@@ -0,0 +1,105 @@
+import json
+
+import utils.similarity_index as similarity_index
+from utils.media_store import (
+    BOOK_DATE_FIELDS,
+    BOOK_KEY_FIELDS,
+    BOOK_STATUSES,
+    BOOK_TEXT_FIELDS,
+    open_media_store,
+)
+
+BOOKS = {
+    "to_read": [
+        {"title": "Atomic Habits", "author": "James Clear", "genre": "Self-help"},
+        {
+            "title": "Leviathan Wakes",
+            "author": "James Corey",
+            "genre": "Science Fiction",
+        },
+        {"title": "Hyperion", "author": "Dan Simmons", "genre": "Science Fiction"},
+        {"title": "The Body", "author": "Bill Bryson", "genre": "Science"},
+    ],
+    "read": [
+        {"title": "Dune", "author": "Frank Herbert", "genre": "Science Fiction"},
+    ],
+}
+
+
+def _store(tmp_path, books=BOOKS):
+    path = tmp_path / "book_list.json"
+    path.write_text(json.dumps(books))
+    return open_media_store(
+        path,
+        BOOK_STATUSES,
+        BOOK_KEY_FIELDS,
+        BOOK_DATE_FIELDS,
+        backend="json",
+        text_fields=BOOK_TEXT_FIELDS,
+    )
+
+
+def _titles(matches):
+    return [match["title"] for match in matches]
+
+
+def test_a_shared_rare_word_outweighs_a_shared_common_one(tmp_path):
+    fiction = [
+        {"title": title, "author": author, "genre": "Fiction"}
+        for title, author in [
+            ("Middlemarch", "George Eliot"),
+            ("Emma", "Jane Austen"),
+            ("Beloved", "Toni Morrison"),
+            ("Ulysses", "James Joyce"),
+        ]
+    ]
+    labyrinths = [
+        {"title": "The Labyrinth", "author": "Saul Steinberg", "genre": "Art"},
+        {"title": "Labyrinth Road", "author": "Ann Lee", "genre": "Travel"},
+    ]
+    store = _store(tmp_path, {"to_read": fiction + labyrinths, "read": []})
+
+    matches = store.similarity.search(store, "labyrinth fiction", top_k=6)
+
+    assert set(_titles(matches)[:2]) == {"The Labyrinth", "Labyrinth Road"}
+
+
+def test_unrelated_records_do_not_match(tmp_path):
+    store = _store(tmp_path)
+
+    matches = store.similarity.search(store, "space science fiction", top_k=10)
+
+    assert "Atomic Habits" not in _titles(matches)
+    assert set(_titles(matches)[:3]) == {"Leviathan Wakes", "Hyperion", "Dune"}
+
+
+def test_status_filter_and_query_by_title(tmp_path):
+    store = _store(tmp_path)
+
+    matches = store.similarity.search(store, "Dune", status="to_read")
+
+    assert "Dune" not in _titles(matches)
+    assert set(_titles(matches)[:2]) == {"Leviathan Wakes", "Hyperion"}
+
+
+def test_index_widens_when_the_vocabulary_outgrows_it(tmp_path, monkeypatch):
+    monkeypatch.setattr(similarity_index, "INITIAL_COLUMNS", 4)
+    store = _store(tmp_path)
+
+    matches = store.similarity.search(store, "herbert")
+
+    assert store.similarity.counts.shape[1] >= len(store.similarity.vocabulary) > 4
+    assert _titles(matches) == ["Dune"]
+
+
+def test_records_added_after_the_build_bring_new_words(tmp_path, monkeypatch):
+    monkeypatch.setattr(similarity_index, "INITIAL_COLUMNS", 4)
+    store = _store(tmp_path)
+    store.similarity.search(store, "dune")
+
+    store.add(
+        "to_read",
+        {"title": "Piranesi", "author": "Susanna Clarke", "genre": "Fantasy"},
+    )
+
+    assert _titles(store.similarity.search(store, "fantasy labyrinth")) == ["Piranesi"]
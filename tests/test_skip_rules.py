@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+from utils.skip_rules import GitignoreMatcher, SkipRules, translate_pattern
+
+
+def _matcher(text: str, base: str = "/repo") -> GitignoreMatcher:
+    return GitignoreMatcher(text.splitlines(keepends=True), base)
+
+
+@pytest.mark.parametrize("pattern", ["[z-a]\n", "[!]\n"])
+def test_invalid_patterns_are_skipped(pattern):
+    assert translate_pattern(pattern) is None
+
+
+def test_invalid_lines_do_not_hide_the_valid_ones():
+    matcher = _matcher("[z-a]\n*.log\n[!]\n")
+
+    assert matcher.match("/repo/debug.log", False) is True
+    assert matcher.match("/repo/main.py", False) is None
+
+
+def test_blank_lines_and_comments_are_skipped():
+    assert translate_pattern("\n") is None
+    assert translate_pattern("# comment\n") is None
+    assert translate_pattern("\\#file\n") is not None
+
+
+def test_negation_re_includes_and_last_line_wins():
+    matcher = _matcher("*.log\n!keep.log\n")
+
+    assert matcher.match("/repo/debug.log", False) is True
+    assert matcher.match("/repo/keep.log", False) is False
+    assert _matcher("!keep.log\n*.log\n").match("/repo/keep.log", False) is True
+
+
+def test_unanchored_patterns_match_at_any_depth():
+    matcher = _matcher("build\n")
+
+    assert matcher.match("/repo/build", True) is True
+    assert matcher.match("/repo/src/build", True) is True
+
+
+def test_patterns_with_a_slash_are_anchored():
+    matcher = _matcher("/build\ndocs/out\n")
+
+    assert matcher.match("/repo/build", True) is True
+    assert matcher.match("/repo/src/build", True) is None
+    assert matcher.match("/repo/docs/out", True) is True
+    assert matcher.match("/repo/src/docs/out", True) is None
+
+
+def test_trailing_slash_only_matches_directories():
+    matcher = _matcher("cache/\n")
+
+    assert matcher.match("/repo/cache", True) is True
+    assert matcher.match("/repo/cache", False) is None
+
+
+def test_double_star_matches_any_number_of_folders():
+    matcher = _matcher("**/generated\nlogs/**\n")
+
+    assert matcher.match("/repo/a/b/generated", True) is True
+    assert matcher.match("/repo/logs/a/b.txt", False) is True
+
+
+def test_filter_applies_nested_gitignores(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / ".gitignore").write_text("!keep.log\n")
+    rules = SkipRules()
+
+    root = str(tmp_path)
+    assert rules.filter(root, ["sub", ".hidden"], [".gitignore", "a.log", "a.py"]) == (
+        ["sub"],
+        [".gitignore", "a.py"],
+    )
+    sub = os.path.join(root, "sub")
+    assert rules.filter(sub, [], [".gitignore", "b.log", "keep.log"]) == (
+        [],
+        [".gitignore", "keep.log"],
+    )
+
+
+def test_filter_survives_invalid_patterns(tmp_path):
+    (tmp_path / ".gitignore").write_text("[z-a]\n*.log\n")
+
+    assert SkipRules().filter(str(tmp_path), [], [".gitignore", "a.log", "a.py"]) == (
+        [],
+        [".gitignore", "a.py"],
+    )
+
+
+def test_walk_inside_a_repository_applies_the_parent_gitignores(tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("*.log\ndist/\n")
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / ".gitignore").write_text("*.tmp\n")
+
+    sub = str(tmp_path / "pkg" / "sub")
+    assert SkipRules().filter(sub, ["dist", "src"], ["a.log", "b.tmp", "c.py"]) == (
+        ["src"],
+        ["c.py"],
+    )
+
+
+def test_parent_gitignores_outside_the_repository_are_not_applied(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / "repo" / ".git").mkdir(parents=True)
+
+    repo = str(tmp_path / "repo")
+    assert SkipRules().filter(repo, [], ["a.log"]) == ([], ["a.log"])
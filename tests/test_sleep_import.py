@@ -0,0 +1,39 @@
+from pathlib import Path
+
+import pytest
+
+from utils.json_log_store import JsonLogStore
+from utils.sleep_import import _normalize_row, import_sleep_export
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.mark.parametrize(
+    "header", ["Minutes Asleep", "minutes-asleep", " MINUTES_ASLEEP ", "Minutes.Asleep"]
+)
+def test_header_spelling_does_not_matter(header):
+    assert _normalize_row({"Date": "2026-01-01", header: "420"}) == {
+        "date": "2026-01-01",
+        "total_sleep_time": 420,
+    }
+
+
+def test_rows_without_duration_or_quality_are_invalid():
+    with pytest.raises(ValueError):
+        _normalize_row({"Date": "2026-01-01", "Minutes Awake": "30"})
+
+
+def test_fitbit_export(tmp_path):
+    store = JsonLogStore(tmp_path / "sleep.json", default={})
+
+    result = import_sleep_export(store, FIXTURES / "fitbit_sleep_export.csv")
+
+    assert (result.rows, result.added, result.duplicates) == (6, 3, 1)
+    assert [number for number, _ in result.invalid] == [3, 5]
+    sessions = store.read()["sleep_sessions"]
+    assert [(s["date"], s["total_sleep_time"]) for s in sessions] == [
+        ("2026-01-01", 421),
+        ("2026-01-02", 398),
+        ("2026-01-04", 455),
+    ]
+    assert store.read()["weekly_rollups"]["2025-12-29"]["nights"] == 3
@@ -0,0 +1,51 @@
+from utils.symbol_index import SymbolIndex
+
+
+def _index(tmp_path, sources: dict) -> SymbolIndex:
+    project = tmp_path / "project"
+    project.mkdir()
+    paths = []
+    for name, source in sources.items():
+        (project / name).write_text(source)
+        paths.append(str(project / name))
+    index = SymbolIndex(tmp_path / "symbols.sqlite")
+    index.update(str(project), paths)
+    return index
+
+
+def test_underscores_in_module_names_are_not_wildcards(tmp_path):
+    index = _index(
+        tmp_path,
+        {
+            "a.py": "import utils.json_store\n",
+            "b.py": "import utils.jsonXstore\n",
+            "c.py": "from pkg.json_store.sub import x\n",
+        },
+    )
+
+    importers = index.who_imports(str(tmp_path / "project"), "json_store")
+
+    assert sorted(path.rsplit("/", 1)[-1] for path, *_ in importers) == ["a.py"]
+
+
+def test_underscores_in_called_names_are_not_wildcards(tmp_path):
+    index = _index(
+        tmp_path,
+        {"a.py": "config.load_config()\nconfig.loadXconfig()\nload_config()\n"},
+    )
+
+    callers = index.find_callers(str(tmp_path / "project"), "load_config")
+
+    assert sorted(name for _, name, _, _ in callers) == [
+        "config.load_config",
+        "load_config",
+    ]
+
+
+def test_indexes_are_shared_per_path(tmp_path):
+    assert SymbolIndex.for_path(tmp_path / "a.sqlite") is SymbolIndex.for_path(
+        tmp_path / "a.sqlite"
+    )
+    assert SymbolIndex.for_path(tmp_path / "a.sqlite") is not SymbolIndex.for_path(
+        tmp_path / "b.sqlite"
+    )